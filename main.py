@@ -1,5 +1,4 @@
 from kivy.app import App
-from kivy.uix.screenmanager import ScreenManager
 from kivy.storage.jsonstore import JsonStore
 from kivy import platform
 from kivy.logger import Logger
@@ -7,25 +6,14 @@ import os
 # from telemetry import setup_telemetry, KivyInstrumentor
 # from opentelemetry import trace
 
-# Import all screens
-from screens.upload_screen import UploadScreen
-from screens.admin_hub_screen import AdminHubScreen
-from screens.allergy_screen import AllergyScreen
-from screens.results_screen import ResultsScreen
-from screens.admin_menu import AdminMenuScreen
-from screens.landing_screen import LandingScreen
-from screens.login_screen import LoginScreen
+# Screen modules are imported when their screen is first built
+from screens.screen_registry import LazyScreenManager
 from utils.feature_flags import OCR_ENABLED
 from models.menu_database import MenuDatabase
+from models.async_menu_database import AsyncMenuDatabase
+from models.menu_maintenance import MaintenanceScheduler
 from version import __version__, get_version
 
-# Conditional import to avoid pulling in OCR dependencies when the feature is
-# disabled.
-if OCR_ENABLED:
-    from screens.admin_settings_screen import AdminSettingsScreen
-
-import csv
-
 if platform == 'android':
     from android.permissions import request_permissions, Permission
 
@@ -44,46 +32,49 @@ class AllergyApp(App):
         self.title = f"IngrediGuard {self.version}"
 
         Logger.info("[AllergyApp] Initializing ScreenManager")
-        sm = ScreenManager()
+        sm = LazyScreenManager()
 
         # Initialize database and attach it to ScreenManager
         Logger.info("[AllergyApp] Initializing MenuDatabase")
         sm.db = MenuDatabase()
+        # Worker thread for slow database operations, off the UI thread
+        sm.async_db = AsyncMenuDatabase(sm.db)
 
         # Shared app data
         sm.filtered_df = None
         sm.is_admin = False
 
-        # Load menu from disk if available
-        Logger.info("[AllergyApp] Loading menu data from CSV if available")
+        # The database is the source of truth. A menu.csv left by older
+        # versions is imported once; later launches skip it unless it changes.
         os.makedirs("app_data", exist_ok=True)
         menu_path = "app_data/menu.csv"
-        if os.path.exists(menu_path):
-            Logger.info(f"[AllergyApp] Menu file found at {menu_path}, loading data")
-            with open(menu_path, newline='', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                menu_data = [row for row in reader]
-                sm.menu_data = menu_data
-                
-                # Insert the menu data into the database
-                Logger.info(f"[AllergyApp] Inserting {len(menu_data)} items into database")
-                sm.db.clear_menu()  # Clear existing data
-                sm.db.insert_menu(menu_data)
-        else:
-            Logger.info(f"[AllergyApp] No menu file found at {menu_path}, initializing empty data")
-            sm.menu_data = []
-
-        # Register all screens
+        changes = sm.db.import_legacy_csv(menu_path)
+        if changes:
+            Logger.info(
+                f"[AllergyApp] Imported legacy menu file {menu_path}: "
+                f"{len(changes['inserted'])} added, {len(changes['updated'])} updated, "
+                f"{len(changes['deleted'])} removed"
+            )
+        Logger.info(f"[AllergyApp] {sm.db.count()} menu items in database")
+
+        # Periodic ANALYZE/vacuum/integrity check on its own thread
+        sm.maintenance = MaintenanceScheduler(sm.db.db_path, on_complete=self.on_maintenance_complete)
+        sm.maintenance.start()
+
+        # Register all screens. Each is built the first time it is shown;
+        # the screens usually visited next are built while the app is idle.
         Logger.info("[AllergyApp] Registering screens")
-        sm.add_widget(LoginScreen(name='login'))
-        sm.add_widget(LandingScreen(name='landing'))
-        sm.add_widget(AllergyScreen(name='allergy'))
-        sm.add_widget(ResultsScreen(name='results'))
-        sm.add_widget(AdminHubScreen(name='admin_hub'))
-        sm.add_widget(UploadScreen(name='upload'))
-        sm.add_widget(AdminMenuScreen(name='admin_menu'))
+        sm.register('login', 'screens.login_screen:LoginScreen', next_screens=('landing',))
+        sm.register('landing', 'screens.landing_screen:LandingScreen', next_screens=('allergy',))
+        sm.register('allergy', 'screens.allergy_screen:AllergyScreen', next_screens=('results',))
+        sm.register('results', 'screens.results_screen:ResultsScreen')
+        sm.register('admin_hub', 'screens.admin_hub_screen:AdminHubScreen', next_screens=('admin_menu',))
+        sm.register('upload', 'screens.upload_screen:UploadScreen')
+        sm.register('admin_menu', 'screens.admin_menu:AdminMenuScreen')
+        # The OCR settings (and their dependencies) only exist with the feature enabled
         if OCR_ENABLED:
-            sm.add_widget(AdminSettingsScreen(name='admin_settings'))
+            sm.register('admin_settings', 'screens.admin_settings_screen:AdminSettingsScreen')
+        sm.current = 'login'
 
         return sm
 
@@ -97,10 +88,24 @@ class AllergyApp(App):
                 Permission.CAMERA
             ])
 
+    def on_maintenance_complete(self, run, error):
+        """Log the result of a database maintenance run."""
+        if error:
+            Logger.error(f"[AllergyApp] Database maintenance failed: {error}")
+            return
+        Logger.info(
+            f"[AllergyApp] Database maintenance took {run['duration']:.2f}s, "
+            f"reclaimed {run['bytes_reclaimed']} bytes, integrity: {run['integrity']}"
+        )
+
     def on_stop(self):
         """Close the database connection when the app stops."""
         Logger.info("[AllergyApp] Closing database connection")
-        # Close DB connection when app stops
+        # Close DB connections when app stops
+        if hasattr(self.root, 'maintenance'):
+            self.root.maintenance.stop()
+        if hasattr(self.root, 'async_db'):
+            self.root.async_db.close()
         if hasattr(self.root, 'db'):
             self.root.db.close()
 
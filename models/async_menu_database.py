@@ -0,0 +1,109 @@
+import inspect
+from concurrent.futures import ThreadPoolExecutor
+from models.menu_database import MenuDatabase
+
+# MenuDatabase methods that never write. Any other call invalidates the
+# UI-thread database's cached menu when it completes.
+READ_ONLY_METHODS = {
+    'get_menu', 'iter_menu', 'count', 'is_healthy', 'search', 'safe_dishes', 'allergen_masks',
+    'get_meta', 'export_to_csv', 'last_undoable_batch', 'list_menus',
+    'list_versions', 'active_version',
+}
+
+class AsyncMenuDatabase:
+    """
+    Runs MenuDatabase operations on a dedicated worker thread with its own
+    SQLite connection, so large writes and exports don't block the UI.
+
+    Every call returns a ``concurrent.futures.Future``. The optional
+    ``callback(result, error)`` is delivered on the UI thread through
+    ``Clock.schedule_once``.
+    """
+
+    def __init__(self, db, schedule=None):
+        """
+        Args:
+            db: The UI-thread MenuDatabase whose cache is invalidated after
+                writes made by the worker.
+            schedule: ``schedule(func, timeout)`` used to deliver callbacks;
+                defaults to ``Clock.schedule_once``.
+        """
+        self.db = db
+        self._schedule = schedule
+        self._worker_db = None
+        # UI-thread revision of each menu when the worker last read it; the
+        # worker keeps its cached menu while the revision is unchanged
+        self._synced_revisions = {}
+        self._executor = ThreadPoolExecutor(
+            max_workers=1,
+            thread_name_prefix="menu-db",
+            initializer=self._open_worker_db
+        )
+
+    def _open_worker_db(self):
+        """Opens the worker's own connection on the worker thread."""
+        self._worker_db = MenuDatabase(self.db.db_path)
+
+    def _call(self, func, menu_id, stale, readonly, args, kwargs):
+        # Work on the menu that was active when the call was made
+        self._worker_db.use_menu(menu_id, remember=False)
+        if stale:
+            # The UI thread wrote to the menu since the worker cached it
+            self._worker_db.invalidate(menu_id)
+        result = func(self._worker_db, *args, **kwargs)
+        if not readonly:
+            # ``func`` may have written through the connection directly
+            self._worker_db.invalidate(menu_id)
+        if inspect.isgenerator(result):
+            result = list(result)
+        return result
+
+    def _deliver(self, future, menu_id, readonly, callback):
+        """Hands a finished future back to the UI thread."""
+        def on_ui_thread(dt):
+            if not readonly:
+                in_step = self._synced_revisions.get(menu_id) == self.db.revision_of(menu_id)
+                self.db.invalidate(menu_id)
+                if in_step:
+                    # The worker refreshed its own cache after the write
+                    self._synced_revisions[menu_id] = self.db.revision_of(menu_id)
+            if callback is None or future.cancelled():
+                return
+            error = future.exception()
+            callback(None if error else future.result(), error)
+
+        schedule = self._schedule
+        if schedule is None:
+            from kivy.clock import Clock
+            schedule = Clock.schedule_once
+        schedule(on_ui_thread, 0)
+
+    def run(self, func, *args, callback=None, readonly=False, **kwargs):
+        """
+        Runs ``func(worker_db, *args, **kwargs)`` on the worker thread.
+
+        The call works on the menu that is active on the UI thread when it
+        is made. Pass ``readonly=True`` for functions that don't write, so
+        the UI thread's cached menu is kept.
+        """
+        menu_id = self.db.menu_id
+        stale = self._synced_revisions.get(menu_id) != self.db.revision_of(menu_id)
+        self._synced_revisions[menu_id] = self.db.revision_of(menu_id)
+        future = self._executor.submit(self._call, func, menu_id, stale, readonly, args, kwargs)
+        future.add_done_callback(lambda f: self._deliver(f, menu_id, readonly, callback))
+        return future
+
+    def submit(self, method, *args, callback=None, **kwargs):
+        """Runs the named MenuDatabase method on the worker thread."""
+        return self.run(
+            lambda db, *a, **kw: getattr(db, method)(*a, **kw),
+            *args,
+            callback=callback,
+            readonly=method in READ_ONLY_METHODS,
+            **kwargs
+        )
+
+    def close(self):
+        """Finishes queued work and closes the worker's connection."""
+        self._executor.submit(lambda: self._worker_db and self._worker_db.close())
+        self._executor.shutdown(wait=True)
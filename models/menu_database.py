@@ -1,6 +1,56 @@
 import sqlite3
 import os
 import csv
+import re
+import argparse
+import hashlib
+import io
+import json
+import time
+from collections import defaultdict
+from types import MappingProxyType
+from utils.allergy_filter import compute_allergen_mask, allergen_map_signature
+from utils.menu_export import export_menu, FileSink
+
+# Matches either a double-quoted phrase or a bare search term.
+_SEARCH_TOKEN_RE = re.compile(r'"([^"]*)"|(\S+)')
+
+# Number of admin edit batches kept in the undo journal, per menu
+MAX_UNDO_BATCHES = 20
+
+# Menu that existing dishes belong to and that is active on first launch
+DEFAULT_MENU_ID = 1
+
+# Number of versions kept per menu; older ones are garbage collected
+MAX_MENU_VERSIONS = 10
+
+# Number of runs kept in the maintenance log
+MAX_MAINTENANCE_LOG = 100
+
+# Subquery selecting the active version of a menu; bind the menu ID
+_ACTIVE_VERSION = "(SELECT active_version_id FROM menus WHERE id = ?)"
+
+
+def normalize_dish(item, ingredients):
+    """
+    Normalizes a dish for storage and comparison: trims the name and turns
+    the ingredients (list or comma-separated string) into a ', '-joined string.
+    """
+    if isinstance(ingredients, str):
+        ingredients = ingredients.split(',')
+    parts = [part.strip() for part in ingredients if part and part.strip()]
+    return item.strip(), ', '.join(parts)
+
+
+def _freeze_rows(rows):
+    """Converts (id, item, ingredients) tuples into read-only dish mappings."""
+    return tuple(MappingProxyType({'id': r[0], 'item': r[1], 'ingredients': r[2]}) for r in rows)
+
+
+def dish_hash(item, ingredients):
+    """Returns the content hash of a dish after normalization."""
+    item, ingredients = normalize_dish(item, ingredients)
+    return hashlib.sha1(f"{item}\x1f{ingredients}".encode('utf-8')).hexdigest()
 
 class MenuDatabase:
     """
@@ -18,77 +68,1183 @@ class MenuDatabase:
         os.makedirs(os.path.dirname(db_path), exist_ok=True)
         self.db_path = db_path
         self.conn = sqlite3.connect(db_path)
+        try:
+            # Lets run_maintenance() return free pages to the file system. Only
+            # takes effect on new databases; older ones are converted by a VACUUM.
+            self.conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+            # WAL lets the UI thread keep reading while a worker connection writes
+            self.conn.execute("PRAGMA journal_mode=WAL")
+        except sqlite3.Error as e:
+            print(f"Database error enabling WAL: {e}")
+        self.fts_enabled = False
+        self.menu_id = DEFAULT_MENU_ID
+        # Per-menu write counters; get_menu() serves a cached snapshot of each
+        # menu until its counter changes, so switching menus keeps them warm
+        self._revisions = defaultdict(int)
+        self._menu_caches = {}
         self.create_table()
 
+        stored = self.get_meta("active_menu_id")
+        if stored and self._menu_exists(int(stored)):
+            self.menu_id = int(stored)
+
     def create_table(self):
         """Creates the menu table if it doesn't already exist."""
         try:
             with self.conn:
+                # One row per location; every dish belongs to exactly one menu
                 self.conn.execute("""
-                    CREATE TABLE IF NOT EXISTS menu (
+                    CREATE TABLE IF NOT EXISTS menus (
                         id INTEGER PRIMARY KEY,
+                        name TEXT NOT NULL UNIQUE,
+                        created_at REAL NOT NULL,
+                        active_version_id INTEGER
+                    )
+                """)
+                self._ensure_column("menus", "active_version_id", "INTEGER")
+                self.conn.execute(
+                    "INSERT OR IGNORE INTO menus (id, name, created_at) VALUES (?, 'Default', ?)",
+                    (DEFAULT_MENU_ID, time.time())
+                )
+                # AUTOINCREMENT, so the ID of a deleted dish is never handed to a
+                # new one; undo journals and cached snapshots rely on stable IDs
+                self.conn.execute("""
+                    CREATE TABLE IF NOT EXISTS menu (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
                         item TEXT NOT NULL,
-                        ingredients TEXT NOT NULL
+                        ingredients TEXT NOT NULL,
+                        allergen_mask INTEGER NOT NULL DEFAULT 0,
+                        content_hash TEXT,
+                        menu_id INTEGER NOT NULL DEFAULT 1 REFERENCES menus (id)
+                    )
+                """)
+                self.conn.execute("""
+                    CREATE TABLE IF NOT EXISTS meta (
+                        key TEXT PRIMARY KEY,
+                        value TEXT
+                    )
+                """)
+                self.conn.execute("""
+                    CREATE TABLE IF NOT EXISTS edit_batches (
+                        id INTEGER PRIMARY KEY,
+                        created_at REAL NOT NULL,
+                        undone INTEGER NOT NULL DEFAULT 0,
+                        menu_id INTEGER NOT NULL DEFAULT 1
+                    )
+                """)
+                self.conn.execute("""
+                    CREATE TABLE IF NOT EXISTS maintenance_log (
+                        id INTEGER PRIMARY KEY,
+                        started_at REAL NOT NULL,
+                        duration REAL NOT NULL,
+                        bytes_before INTEGER NOT NULL,
+                        bytes_after INTEGER NOT NULL,
+                        integrity TEXT NOT NULL
+                    )
+                """)
+                # Rows as they were before each batch operation, for undo
+                self.conn.execute("""
+                    CREATE TABLE IF NOT EXISTS undo_journal (
+                        id INTEGER PRIMARY KEY,
+                        batch_id INTEGER NOT NULL REFERENCES edit_batches (id) ON DELETE CASCADE,
+                        op TEXT NOT NULL,
+                        dish_id INTEGER NOT NULL,
+                        before TEXT
                     )
                 """)
+                self.conn.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_undo_journal_batch ON undo_journal (batch_id)"
+                )
+                self._ensure_column("menu", "allergen_mask", "INTEGER NOT NULL DEFAULT 0")
+                self._ensure_column("menu", "content_hash", "TEXT")
+                self._ensure_column("menu", "menu_id", f"INTEGER NOT NULL DEFAULT {DEFAULT_MENU_ID}")
+                self._ensure_column("edit_batches", "menu_id", f"INTEGER NOT NULL DEFAULT {DEFAULT_MENU_ID}")
+                self._migrate_menu_autoincrement()
+                # Every read is scoped to one menu, so lead the indexes with menu_id
+                self.conn.execute("DROP INDEX IF EXISTS idx_menu_allergen_mask")
+                self.conn.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_menu_menu_id ON menu (menu_id, id)"
+                )
+                # Reads go through the active version, so the mask is filtered per row
+                self.conn.execute("DROP INDEX IF EXISTS idx_menu_menu_id_allergen_mask")
+
+                # Copy-on-write snapshots: a version lists the dish rows it
+                # contains and unchanged rows are shared between versions
+                self.conn.execute("""
+                    CREATE TABLE IF NOT EXISTS menu_versions (
+                        id INTEGER PRIMARY KEY,
+                        menu_id INTEGER NOT NULL REFERENCES menus (id),
+                        created_at REAL NOT NULL,
+                        label TEXT
+                    )
+                """)
+                self.conn.execute("""
+                    CREATE TABLE IF NOT EXISTS version_dishes (
+                        version_id INTEGER NOT NULL REFERENCES menu_versions (id),
+                        dish_id INTEGER NOT NULL REFERENCES menu (id),
+                        position INTEGER NOT NULL,
+                        PRIMARY KEY (version_id, dish_id)
+                    ) WITHOUT ROWID
+                """)
+                # Menu order; a row copied for an older version keeps its position
+                self.conn.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_version_dishes_position ON version_dishes (version_id, position)"
+                )
+                self.conn.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_version_dishes_dish ON version_dishes (dish_id)"
+                )
+                # Dishes stored before versioning become each menu's first version
+                unversioned = self.conn.execute(
+                    "SELECT id FROM menus WHERE active_version_id IS NULL"
+                ).fetchall()
+                for (menu_id,) in unversioned:
+                    version_id = self._insert_version(menu_id, "Initial menu")
+                    self.conn.execute(
+                        "INSERT INTO version_dishes (version_id, dish_id, position) SELECT ?, id, id FROM menu WHERE menu_id = ?",
+                        (version_id, menu_id)
+                    )
+                    self.conn.execute(
+                        "UPDATE menus SET active_version_id = ? WHERE id = ?", (version_id, menu_id)
+                    )
         except sqlite3.Error as e:
             print(f"Database error in create_table: {e}")
+        self.create_search_index()
+
+        # Masks written with an older allergen dictionary are stale.
+        if self.get_meta("allergen_map_signature") != allergen_map_signature():
+            self.recompute_allergen_masks()
+
+    def _ensure_column(self, table, column, definition):
+        """Adds a column to an existing table created by an older version."""
+        columns = [row[1] for row in self.conn.execute(f"PRAGMA table_info({table})")]
+        if column not in columns:
+            self.conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+    def _migrate_menu_autoincrement(self):
+        """
+        Rebuilds a menu table created without AUTOINCREMENT, keeping every
+        dish ID (so the search index and versions stay valid). IDs still
+        referenced by the undo journal are reserved as well.
+        """
+        sql = self.conn.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'menu'"
+        ).fetchone()[0]
+        if 'AUTOINCREMENT' in sql.upper():
+            return
+        self.conn.execute("""
+            CREATE TABLE menu_autoincrement (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                item TEXT NOT NULL,
+                ingredients TEXT NOT NULL,
+                allergen_mask INTEGER NOT NULL DEFAULT 0,
+                content_hash TEXT,
+                menu_id INTEGER NOT NULL DEFAULT 1 REFERENCES menus (id)
+            )
+        """)
+        self.conn.execute("""
+            INSERT INTO menu_autoincrement (id, item, ingredients, allergen_mask, content_hash, menu_id)
+            SELECT id, item, ingredients, allergen_mask, content_hash, menu_id FROM menu
+        """)
+        # Dropping the table drops its search triggers; create_search_index restores them
+        self.conn.execute("DROP TABLE menu")
+        self.conn.execute("ALTER TABLE menu_autoincrement RENAME TO menu")
+        highest = self.conn.execute("""
+            SELECT MAX(COALESCE((SELECT MAX(id) FROM menu), 0),
+                       COALESCE((SELECT MAX(dish_id) FROM undo_journal), 0))
+        """).fetchone()[0]
+        self.conn.execute("DELETE FROM sqlite_sequence WHERE name = 'menu'")
+        self.conn.execute("INSERT INTO sqlite_sequence (name, seq) VALUES ('menu', ?)", (highest,))
+
+    def get_meta(self, key, default=None):
+        """Reads a value from the metadata table."""
+        try:
+            row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+            return row[0] if row else default
+        except sqlite3.Error as e:
+            print(f"Database error in get_meta: {e}")
+            return default
+
+    def set_meta(self, key, value):
+        """Writes a value to the metadata table."""
+        try:
+            with self.conn:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value)
+                )
+        except sqlite3.Error as e:
+            print(f"Database error in set_meta: {e}")
+
+    def _menu_exists(self, menu_id):
+        try:
+            return self.conn.execute("SELECT 1 FROM menus WHERE id = ?", (menu_id,)).fetchone() is not None
+        except sqlite3.Error as e:
+            print(f"Database error in _menu_exists: {e}")
+            return False
+
+    def create_menu(self, name):
+        """
+        Adds a new, empty menu (e.g. for another location) and returns its ID.
+
+        Raises:
+            ValueError: if the name is empty or already used.
+        """
+        name = name.strip()
+        if not name:
+            raise ValueError("Menu name is required")
+        try:
+            with self.conn:
+                menu_id = self.conn.execute(
+                    "INSERT INTO menus (name, created_at) VALUES (?, ?)", (name, time.time())
+                ).lastrowid
+                self.conn.execute(
+                    "UPDATE menus SET active_version_id = ? WHERE id = ?",
+                    (self._insert_version(menu_id, "New menu"), menu_id)
+                )
+                return menu_id
+        except sqlite3.IntegrityError:
+            raise ValueError(f"A menu named '{name}' already exists")
+
+    def list_menus(self):
+        """Returns every menu as a dictionary with its 'id', 'name' and number of 'dishes'."""
+        try:
+            rows = self.conn.execute("""
+                SELECT menus.id, menus.name, COUNT(version_dishes.dish_id)
+                FROM menus
+                LEFT JOIN version_dishes ON version_dishes.version_id = menus.active_version_id
+                GROUP BY menus.id
+                ORDER BY menus.id
+            """).fetchall()
+            return [{'id': r[0], 'name': r[1], 'dishes': r[2]} for r in rows]
+        except sqlite3.Error as e:
+            print(f"Database error in list_menus: {e}")
+            return []
+
+    def use_menu(self, menu_id, remember=True):
+        """
+        Switches every read and write to another menu. The cached snapshot of
+        the previous menu is kept, so switching back is instant.
+
+        Args:
+            menu_id (int): ID of the menu to activate.
+            remember (bool): Persist the choice for the next launch.
+
+        Raises:
+            ValueError: if there is no such menu.
+        """
+        if not self._menu_exists(menu_id):
+            raise ValueError(f"No menu with ID {menu_id}")
+        self.menu_id = menu_id
+        if remember:
+            self.set_meta("active_menu_id", str(menu_id))
+
+    def create_search_index(self):
+        """
+        Creates the FTS5 index over dish names and ingredients, kept in sync
+        with the menu table by triggers. Falls back to LIKE matching when the
+        SQLite build has no FTS5 support.
+        """
+        try:
+            with self.conn:
+                exists = self.conn.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'menu_fts'"
+                ).fetchone()
+                self.conn.execute("""
+                    CREATE VIRTUAL TABLE IF NOT EXISTS menu_fts USING fts5(
+                        item,
+                        ingredients,
+                        content='menu',
+                        content_rowid='id',
+                        tokenize='unicode61 remove_diacritics 2'
+                    )
+                """)
+                self.conn.executescript("""
+                    CREATE TRIGGER IF NOT EXISTS menu_fts_insert AFTER INSERT ON menu BEGIN
+                        INSERT INTO menu_fts(rowid, item, ingredients)
+                        VALUES (new.id, new.item, new.ingredients);
+                    END;
+                    CREATE TRIGGER IF NOT EXISTS menu_fts_delete AFTER DELETE ON menu BEGIN
+                        INSERT INTO menu_fts(menu_fts, rowid, item, ingredients)
+                        VALUES ('delete', old.id, old.item, old.ingredients);
+                    END;
+                    CREATE TRIGGER IF NOT EXISTS menu_fts_update AFTER UPDATE OF item, ingredients ON menu BEGIN
+                        INSERT INTO menu_fts(menu_fts, rowid, item, ingredients)
+                        VALUES ('delete', old.id, old.item, old.ingredients);
+                        INSERT INTO menu_fts(rowid, item, ingredients)
+                        VALUES (new.id, new.item, new.ingredients);
+                    END;
+                """)
+                if not exists:
+                    # Index any dishes written before the search index existed.
+                    self.conn.execute("INSERT INTO menu_fts(menu_fts) VALUES ('rebuild')")
+            self.fts_enabled = True
+        except sqlite3.Error as e:
+            print(f"FTS5 unavailable, falling back to LIKE search: {e}")
+            self.fts_enabled = False
+
+    def get_menu(self, offset=0, limit=None):
+        """
+        Retrieves the menu, ordered by ID, as a tuple of read-only dish
+        mappings. Pass ``limit`` (and optionally ``offset``) to read a single
+        page.
+
+        Each menu is cached until the next write to it bumps ``revision``,
+        so repeated reads don't touch the database. Page reads are sliced
+        from the cache when it is warm and fetched directly otherwise.
+        """
+        cached = self._cached_menu()
+        if cached is not None:
+            if limit is None:
+                return cached[offset:]
+            return cached[offset:offset + limit]
 
-    def get_menu(self):
-        """Retrieves the entire menu from the database."""
         try:
             with self.conn:
                 cursor = self.conn.cursor()
-                cursor.execute("SELECT id, item, ingredients FROM menu")
-                rows = cursor.fetchall()
-                # Convert list of tuples to list of dictionaries
-                menu_list = [{'id': r[0], 'item': r[1], 'ingredients': r[2]} for r in rows]
-                return menu_list
+                cursor.execute(f"""
+                    SELECT menu.id, menu.item, menu.ingredients
+                    FROM version_dishes
+                    JOIN menu ON menu.id = version_dishes.dish_id
+                    WHERE version_dishes.version_id = {_ACTIVE_VERSION}
+                    ORDER BY version_dishes.position
+                    LIMIT ? OFFSET ?
+                """, (self.menu_id, -1 if limit is None else limit, offset))
+                menu = _freeze_rows(cursor.fetchall())
         except sqlite3.Error as e:
             print(f"Database error in get_menu: {e}")
+            return ()
+
+        if limit is None and offset == 0:
+            self._menu_caches[self.menu_id] = (self.revision, menu)
+        return menu
+
+    @property
+    def revision(self):
+        """Write counter of the active menu."""
+        return self._revisions[self.menu_id]
+
+    def revision_of(self, menu_id):
+        """Write counter of any menu."""
+        return self._revisions[menu_id]
+
+    def _cached_menu(self):
+        """Returns the active menu's cached snapshot, or None if it is stale."""
+        cached = self._menu_caches.get(self.menu_id)
+        if cached is not None and cached[0] == self.revision:
+            return cached[1]
+        return None
+
+    def invalidate(self, menu_id=None):
+        """
+        Marks a cached menu as stale. Call this after the database file was
+        changed through another connection; without ``menu_id`` every menu
+        is invalidated.
+        """
+        for key in [menu_id] if menu_id is not None else set(self._menu_caches) | {self.menu_id}:
+            self._revisions[key] += 1
+
+    def iter_menu(self, batch_size=500):
+        """
+        Yields every dish as a dictionary, fetching ``batch_size`` rows at a
+        time from a single cursor instead of loading the whole table.
+        """
+        try:
+            cursor = self.conn.execute(f"""
+                SELECT menu.id, menu.item, menu.ingredients
+                FROM version_dishes
+                JOIN menu ON menu.id = version_dishes.dish_id
+                WHERE version_dishes.version_id = {_ACTIVE_VERSION}
+                ORDER BY version_dishes.position
+            """, (self.menu_id,))
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                for r in rows:
+                    yield {'id': r[0], 'item': r[1], 'ingredients': r[2]}
+        except sqlite3.Error as e:
+            print(f"Database error in iter_menu: {e}")
+
+    def count(self):
+        """Returns the number of dishes on the menu."""
+        try:
+            return self.conn.execute(
+                f"SELECT COUNT(*) FROM version_dishes WHERE version_id = {_ACTIVE_VERSION}", (self.menu_id,)
+            ).fetchone()[0]
+        except sqlite3.Error as e:
+            print(f"Database error in count: {e}")
+            return 0
+
+    def is_healthy(self):
+        """Checks that the connection is open and the menu table is readable."""
+        try:
+            self.conn.execute("SELECT 1 FROM menu LIMIT 1").fetchall()
+            return True
+        except sqlite3.Error as e:
+            print(f"Database health check failed: {e}")
+            return False
+
+    @staticmethod
+    def _build_fts_query(query):
+        """
+        Translates admin search text into an FTS5 MATCH expression.
+
+        Quoted text is matched as an exact phrase; every bare word is matched
+        as a prefix so "tah" finds "tahini". Terms are ANDed together.
+        """
+        terms = []
+        for phrase, word in _SEARCH_TOKEN_RE.findall(query or ""):
+            if phrase.strip():
+                terms.append('"' + phrase.strip().replace('"', '""') + '"')
+            elif word:
+                word = word.rstrip('*').replace('"', '')
+                if word:
+                    terms.append('"' + word + '"*')
+        return " ".join(terms)
+
+    def search(self, query, limit=50, offset=0):
+        """
+        Searches dish names and ingredients, best matches first.
+
+        Supports prefix matching on bare words and exact phrases in double
+        quotes. Returns one page of results as a list of dictionaries.
+        """
+        try:
+            if self.fts_enabled:
+                match = self._build_fts_query(query)
+                if not match:
+                    return []
+                rows = self.conn.execute(f"""
+                    SELECT menu.id, menu.item, menu.ingredients
+                    FROM menu_fts
+                    JOIN menu ON menu.id = menu_fts.rowid
+                    JOIN version_dishes ON version_dishes.dish_id = menu.id
+                    WHERE menu_fts MATCH ? AND version_dishes.version_id = {_ACTIVE_VERSION}
+                    ORDER BY bm25(menu_fts, 2.0, 1.0)
+                    LIMIT ? OFFSET ?
+                """, (match, self.menu_id, limit, offset)).fetchall()
+            else:
+                words = [p or w.rstrip('*') for p, w in _SEARCH_TOKEN_RE.findall(query or "")]
+                words = [w.strip() for w in words if w.strip()]
+                if not words:
+                    return []
+                where = " AND ".join("(menu.item LIKE ? OR menu.ingredients LIKE ?)" for _ in words)
+                params = [self.menu_id]
+                for w in words:
+                    params.extend([f"%{w}%", f"%{w}%"])
+                rows = self.conn.execute(f"""
+                    SELECT menu.id, menu.item, menu.ingredients
+                    FROM version_dishes
+                    JOIN menu ON menu.id = version_dishes.dish_id
+                    WHERE version_dishes.version_id = {_ACTIVE_VERSION} AND {where}
+                    ORDER BY menu.item
+                    LIMIT ? OFFSET ?
+                """, params + [limit, offset]).fetchall()
+            return [{'id': r[0], 'item': r[1], 'ingredients': r[2]} for r in rows]
+        except sqlite3.Error as e:
+            print(f"Database error in search: {e}")
+            return []
+
+    def safe_dishes(self, mask):
+        """
+        Retrieves every dish containing none of the allergen categories in
+        ``mask`` (see ``utils.allergy_filter.category_mask``), using only the
+        stored allergen masks.
+        """
+        try:
+            rows = self.conn.execute(f"""
+                SELECT menu.id, menu.item, menu.ingredients
+                FROM version_dishes
+                JOIN menu ON menu.id = version_dishes.dish_id
+                WHERE version_dishes.version_id = {_ACTIVE_VERSION} AND menu.allergen_mask & ? = 0
+                ORDER BY version_dishes.position
+            """, (self.menu_id, mask)).fetchall()
+            return [{'id': r[0], 'item': r[1], 'ingredients': r[2]} for r in rows]
+        except sqlite3.Error as e:
+            print(f"Database error in safe_dishes: {e}")
             return []
 
+    def allergen_masks(self):
+        """Returns the stored allergen mask of every dish on the active menu, by dish ID."""
+        try:
+            rows = self.conn.execute(f"""
+                SELECT menu.id, menu.allergen_mask
+                FROM version_dishes
+                JOIN menu ON menu.id = version_dishes.dish_id
+                WHERE version_dishes.version_id = {_ACTIVE_VERSION}
+            """, (self.menu_id,)).fetchall()
+            return dict(rows)
+        except sqlite3.Error as e:
+            print(f"Database error in allergen_masks: {e}")
+            return {}
+
+    def recompute_allergen_masks(self, batch_size=500):
+        """
+        Recomputes the stored allergen mask of every dish. Run this after
+        ALLERGEN_MAP changes; it also happens automatically on startup when
+        the stored dictionary signature differs.
+
+        Returns:
+            int number of dishes whose mask changed.
+        """
+        changed = 0
+        try:
+            with self.conn:
+                last_id = 0
+                while True:
+                    rows = self.conn.execute(
+                        "SELECT id, ingredients, allergen_mask FROM menu WHERE id > ? ORDER BY id LIMIT ?",
+                        (last_id, batch_size)
+                    ).fetchall()
+                    if not rows:
+                        break
+                    last_id = rows[-1][0]
+                    updates = []
+                    for dish_id, ingredients, old_mask in rows:
+                        mask = compute_allergen_mask(ingredients)
+                        if mask != old_mask:
+                            updates.append((mask, dish_id))
+                    self.conn.executemany("UPDATE menu SET allergen_mask = ? WHERE id = ?", updates)
+                    changed += len(updates)
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES ('allergen_map_signature', ?)",
+                    (allergen_map_signature(),)
+                )
+        except sqlite3.Error as e:
+            print(f"Database error in recompute_allergen_masks: {e}")
+        return changed
+
+    def _insert_version(self, menu_id, label):
+        """Creates an empty version of a menu and returns its ID."""
+        return self.conn.execute(
+            "INSERT INTO menu_versions (menu_id, created_at, label) VALUES (?, ?, ?)",
+            (menu_id, time.time(), label)
+        ).lastrowid
+
+    def active_version(self):
+        """Returns the ID of the active menu's current version."""
+        try:
+            row = self.conn.execute(
+                "SELECT active_version_id FROM menus WHERE id = ?", (self.menu_id,)
+            ).fetchone()
+            return row[0] if row else None
+        except sqlite3.Error as e:
+            print(f"Database error in active_version: {e}")
+            return None
+
+    def _insert_dish(self, version_id, item, ingredients, position=None):
+        """
+        Stores a dish on the active menu, adds it to a version at ``position``
+        (last by default) and returns its ID.
+        """
+        dish_id = self.conn.execute(
+            "INSERT INTO menu (item, ingredients, allergen_mask, content_hash, menu_id) VALUES (?, ?, ?, ?, ?)",
+            (item, ingredients, compute_allergen_mask(ingredients), dish_hash(item, ingredients), self.menu_id)
+        ).lastrowid
+        # New IDs are larger than any position in use (positions are either
+        # IDs or indexes into an upload), so by default the dish goes last
+        self.conn.execute(
+            "INSERT INTO version_dishes (version_id, dish_id, position) VALUES (?, ?, ?)",
+            (version_id, dish_id, dish_id if position is None else position)
+        )
+        return dish_id
+
+    def _remove_dish(self, dish_id, version_id):
+        """Removes a dish from a version, deleting its row once no version uses it."""
+        self.conn.execute(
+            "DELETE FROM version_dishes WHERE version_id = ? AND dish_id = ?", (version_id, dish_id)
+        )
+        self.conn.execute(
+            "DELETE FROM menu WHERE id = ? AND NOT EXISTS (SELECT 1 FROM version_dishes WHERE dish_id = ?)",
+            (dish_id, dish_id)
+        )
+
+    def _copy_on_write(self, dish_id, version_id):
+        """
+        Prepares a dish row of ``version_id`` for an update in place: other
+        versions sharing the row are first pointed at a copy of it, so they
+        keep the old content and the dish keeps its ID in ``version_id``.
+        """
+        shared = self.conn.execute(
+            "SELECT 1 FROM version_dishes WHERE dish_id = ? AND version_id != ? LIMIT 1", (dish_id, version_id)
+        ).fetchone()
+        if not shared:
+            return
+        cursor = self.conn.execute("SELECT * FROM menu WHERE id = ?", (dish_id,))
+        row = dict(zip([column[0] for column in cursor.description], cursor.fetchone()))
+        del row['id']
+        columns = list(row)
+        copy_id = self.conn.execute(
+            f"INSERT INTO menu ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)})",
+            [row[column] for column in columns]
+        ).lastrowid
+        self.conn.execute(
+            "UPDATE version_dishes SET dish_id = ? WHERE dish_id = ? AND version_id != ?",
+            (copy_id, dish_id, version_id)
+        )
+
+    def _dish_row(self, dish_id):
+        """Returns every stored column of a dish on the active menu as a dictionary, or None."""
+        cursor = self.conn.execute(f"""
+            SELECT menu.*, version_dishes.position AS position
+            FROM version_dishes
+            JOIN menu ON menu.id = version_dishes.dish_id
+            WHERE version_dishes.version_id = {_ACTIVE_VERSION} AND version_dishes.dish_id = ?
+        """, (self.menu_id, dish_id))
+        row = cursor.fetchone()
+        if row is None:
+            return None
+        return dict(zip([column[0] for column in cursor.description], row))
+
+    def _restore_dish_row(self, row, version_id):
+        """Writes a row captured by _dish_row back into a version, keeping its ID and position."""
+        columns = [column for column in row if column not in ('id', 'position')]
+        # UPDATE an existing row rather than REPLACE it: a REPLACE deletes the
+        # old row without firing menu_fts_delete, which leaves the search
+        # index out of step with the table
+        exists = self.conn.execute("SELECT 1 FROM menu WHERE id = ?", (row['id'],)).fetchone()
+        if exists:
+            self.conn.execute(
+                f"UPDATE menu SET {', '.join(f'{column} = ?' for column in columns)} WHERE id = ?",
+                [row[column] for column in columns] + [row['id']]
+            )
+        else:
+            columns.insert(0, 'id')
+            self.conn.execute(
+                f"INSERT INTO menu ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)})",
+                [row[column] for column in columns]
+            )
+        self.conn.execute(
+            "INSERT OR IGNORE INTO version_dishes (version_id, dish_id, position) VALUES (?, ?, ?)",
+            (version_id, row['id'], row.get('position', row['id']))
+        )
+
+    def apply_batch(self, ops):
+        """
+        Applies a list of admin edits in a single transaction and records
+        them in the undo journal.
+
+        Each operation is a dictionary:
+            {'op': 'add', 'item': ..., 'ingredients': ...}
+            {'op': 'update', 'id': ..., 'item': ..., 'ingredients': ...}
+            {'op': 'delete', 'id': ...}
+
+        If any operation fails (unknown op or missing dish), nothing is
+        applied and the error is raised.
+
+        Returns:
+            dict with the 'batch_id' and the 'added', 'updated' and 'deleted'
+            dish IDs, so the UI can patch only those rows.
+        """
+        result = {'batch_id': None, 'added': [], 'updated': [], 'deleted': []}
+        try:
+            with self.conn:
+                batch_id = self.conn.execute(
+                    "INSERT INTO edit_batches (created_at, menu_id) VALUES (?, ?)", (time.time(), self.menu_id)
+                ).lastrowid
+                result['batch_id'] = batch_id
+                version_id = self.active_version()
+                journal = []
+
+                for op in ops:
+                    kind = op.get('op')
+                    if kind == 'add':
+                        item, ingredients = normalize_dish(op['item'], op['ingredients'])
+                        dish_id = self._insert_dish(version_id, item, ingredients)
+                        journal.append((batch_id, kind, dish_id, None))
+                        result['added'].append(dish_id)
+                    elif kind in ('update', 'delete'):
+                        before = self._dish_row(op['id'])
+                        if before is None:
+                            raise ValueError(f"No dish with ID {op['id']}")
+                        if kind == 'update':
+                            item, ingredients = normalize_dish(op['item'], op['ingredients'])
+                            self._copy_on_write(op['id'], version_id)
+                            self.conn.execute(
+                                "UPDATE menu SET item = ?, ingredients = ?, allergen_mask = ?, content_hash = ? WHERE id = ?",
+                                (item, ingredients, compute_allergen_mask(ingredients),
+                                 dish_hash(item, ingredients), op['id'])
+                            )
+                            result['updated'].append(op['id'])
+                        else:
+                            self._remove_dish(op['id'], version_id)
+                            result['deleted'].append(op['id'])
+                        journal.append((batch_id, kind, op['id'], json.dumps(before)))
+                    else:
+                        raise ValueError(f"Unknown batch operation: {kind!r}")
+
+                self.conn.executemany(
+                    "INSERT INTO undo_journal (batch_id, op, dish_id, before) VALUES (?, ?, ?, ?)", journal
+                )
+                # Only the most recent batches of each menu can be undone
+                self.conn.execute("""
+                    DELETE FROM edit_batches WHERE menu_id = ? AND id NOT IN (
+                        SELECT id FROM edit_batches WHERE menu_id = ? ORDER BY id DESC LIMIT ?
+                    )
+                """, (self.menu_id, self.menu_id, MAX_UNDO_BATCHES))
+                self.conn.execute(
+                    "DELETE FROM undo_journal WHERE batch_id NOT IN (SELECT id FROM edit_batches)"
+                )
+        except sqlite3.Error as e:
+            print(f"Database error in apply_batch: {e}")
+            raise
+        finally:
+            self.invalidate(self.menu_id)
+        return result
+
+    def _clear_undo_journal(self):
+        """
+        Forgets the active menu's undo history. Called when the whole menu is
+        replaced, after which older batches can no longer be reverted safely.
+        """
+        self.conn.execute(
+            "DELETE FROM undo_journal WHERE batch_id IN (SELECT id FROM edit_batches WHERE menu_id = ?)",
+            (self.menu_id,)
+        )
+        self.conn.execute("UPDATE edit_batches SET undone = 1 WHERE menu_id = ?", (self.menu_id,))
+
+    def last_undoable_batch(self):
+        """Returns the ID of the active menu's most recent batch that can be undone, or None."""
+        row = self.conn.execute(
+            "SELECT MAX(id) FROM edit_batches WHERE undone = 0 AND menu_id = ?", (self.menu_id,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def undo_batch(self, batch_id=None):
+        """
+        Reverts a batch applied by apply_batch to the active menu (the most
+        recent one by default) in a single transaction.
+
+        Returns:
+            dict with the 'batch_id' and the 'added' (restored), 'updated'
+            and 'deleted' dish IDs changed by the undo, or None if there was
+            nothing to undo.
+
+        Raises:
+            ValueError: if a later batch that hasn't been undone changed the
+                same dishes.
+        """
+        if batch_id is None:
+            batch_id = self.last_undoable_batch()
+        if batch_id is None:
+            return None
+
+        result = {'batch_id': batch_id, 'added': [], 'updated': [], 'deleted': []}
+        try:
+            with self.conn:
+                undone = self.conn.execute(
+                    "SELECT undone FROM edit_batches WHERE id = ? AND menu_id = ?", (batch_id, self.menu_id)
+                ).fetchone()
+                if undone is None or undone[0]:
+                    return None
+                # Restoring rows a later batch changed again would silently
+                # discard that batch, so only undo in reverse order
+                later = self.conn.execute("""
+                    SELECT MIN(later.batch_id)
+                    FROM undo_journal AS later
+                    JOIN edit_batches ON edit_batches.id = later.batch_id
+                    WHERE edit_batches.menu_id = ? AND edit_batches.undone = 0 AND later.batch_id > ?
+                      AND later.dish_id IN (SELECT dish_id FROM undo_journal WHERE batch_id = ?)
+                """, (self.menu_id, batch_id, batch_id)).fetchone()[0]
+                if later is not None:
+                    raise ValueError(f"Batch {batch_id} can't be undone before batch {later}, which changed the same dishes")
+                version_id = self.active_version()
+                entries = self.conn.execute(
+                    "SELECT op, dish_id, before FROM undo_journal WHERE batch_id = ? ORDER BY id DESC",
+                    (batch_id,)
+                ).fetchall()
+                for op, dish_id, before in entries:
+                    if op == 'add':
+                        self._remove_dish(dish_id, version_id)
+                        result['deleted'].append(dish_id)
+                    else:
+                        self._restore_dish_row(json.loads(before), version_id)
+                        result['updated' if op == 'update' else 'added'].append(dish_id)
+                self.conn.execute("UPDATE edit_batches SET undone = 1 WHERE id = ?", (batch_id,))
+        except sqlite3.Error as e:
+            print(f"Database error in undo_batch: {e}")
+            raise
+        finally:
+            self.invalidate(self.menu_id)
+        return result
+
     def add_dish(self, item, ingredients):
-        """Adds a new dish to the menu."""
+        """Adds a new dish to the menu and returns its ID."""
         try:
             with self.conn:
-                self.conn.execute("INSERT INTO menu (item, ingredients) VALUES (?, ?)", (item, ingredients))
+                dish_id = self._insert_dish(self.active_version(), item, ingredients)
+            self.invalidate(self.menu_id)
+            return dish_id
         except sqlite3.Error as e:
             print(f"Database error in add_dish: {e}")
+            return None
 
     def delete_dish(self, dish_id):
         """Deletes a dish from the menu by its ID."""
         try:
             with self.conn:
-                self.conn.execute("DELETE FROM menu WHERE id = ?", (dish_id,))
+                self._remove_dish(dish_id, self.active_version())
+            self.invalidate(self.menu_id)
         except sqlite3.Error as e:
             print(f"Database error: {e}")
 
     def insert_menu(self, items):
-        cursor = self.conn.cursor()
-        formatted_items = []
+        version_id = self.active_version()
         for item in items:
             ingredients = item['ingredients']
             # Convert list of ingredients to comma-separated string if it's a list
             if isinstance(ingredients, list):
                 ingredients = ', '.join(ingredients)
-            formatted_items.append((item['item'], ingredients))
-        cursor.executemany('INSERT INTO menu (item, ingredients) VALUES (?, ?)', formatted_items)
+            self._insert_dish(version_id, item['item'], ingredients)
         self.conn.commit()
+        self.invalidate(self.menu_id)
+
+    def sync_menu(self, items, label=None):
+        """
+        Makes the active menu match ``items`` by applying only the differences,
+        in a single transaction.
+
+        Dishes are compared by the hash of their normalized name and
+        ingredients. Unchanged dishes keep their IDs, a changed dish with the
+        same name is updated in place, and everything else is inserted or
+        deleted. The menu takes the order of ``items``.
+
+        Any change (including a new order) is saved as a new version (named ``label``) that shares
+        the unchanged dishes with the previous one, which stays available to
+        ``activate_version``.
+
+        Returns:
+            dict with 'inserted' and 'updated' (lists of dish dictionaries),
+            'deleted' (list of IDs), 'unchanged' (count) and 'order' (the
+            IDs of the synced menu, in order).
+        """
+        changes = {'inserted': [], 'updated': [], 'deleted': [], 'unchanged': 0, 'order': []}
+        try:
+            with self.conn:
+                stored = self.conn.execute(f"""
+                    SELECT menu.id, menu.item, menu.ingredients, menu.content_hash
+                    FROM version_dishes
+                    JOIN menu ON menu.id = version_dishes.dish_id
+                    WHERE version_dishes.version_id = {_ACTIVE_VERSION}
+                    ORDER BY version_dishes.position
+                """, (self.menu_id,)).fetchall()
+                ids_by_hash = defaultdict(list)
+                ids_by_name = defaultdict(list)
+                for dish_id, item, ingredients, content_hash in stored:
+                    ids_by_hash[content_hash or dish_hash(item, ingredients)].append(dish_id)
+                    ids_by_name[item.strip().lower()].append(dish_id)
+
+                # Stored dish ID for each uploaded row, by index; None for new dishes
+                order = [None] * len(items)
+                claimed = set()
+                pending = []
+                for index, row in enumerate(items):
+                    item, ingredients = normalize_dish(row['item'], row['ingredients'])
+                    content_hash = dish_hash(item, ingredients)
+                    if ids_by_hash[content_hash]:
+                        order[index] = ids_by_hash[content_hash].pop(0)
+                        claimed.add(order[index])
+                        changes['unchanged'] += 1
+                    else:
+                        pending.append((index, item, ingredients))
+
+                added = []
+                for index, item, ingredients in pending:
+                    candidates = [i for i in ids_by_name[item.lower()] if i not in claimed]
+                    if candidates:
+                        order[index] = candidates[0]
+                        claimed.add(order[index])
+                        changes['updated'].append({'id': order[index], 'item': item, 'ingredients': ingredients})
+                    else:
+                        added.append((index, item, ingredients))
+                changes['deleted'] = [row[0] for row in stored if row[0] not in claimed]
+                reordered = [dish_id for dish_id in order if dish_id is not None] != [
+                    row[0] for row in stored if row[0] in claimed
+                ]
+
+                if pending or changes['deleted'] or reordered:
+                    # Unchanged and updated dishes keep their rows; the previous
+                    # version gets copies of the rows updated below
+                    version_id = self._insert_version(self.menu_id, label)
+                    for row in changes['updated']:
+                        self._copy_on_write(row['id'], version_id)
+                        self.conn.execute(
+                            "UPDATE menu SET item = ?, ingredients = ?, allergen_mask = ?, content_hash = ? WHERE id = ?",
+                            (row['item'], row['ingredients'], compute_allergen_mask(row['ingredients']),
+                             dish_hash(row['item'], row['ingredients']), row['id'])
+                        )
+                    # Each dish is placed at its index in the upload
+                    self.conn.executemany(
+                        "INSERT INTO version_dishes (version_id, dish_id, position) VALUES (?, ?, ?)",
+                        [(version_id, dish_id, index) for index, dish_id in enumerate(order) if dish_id is not None]
+                    )
+                    for index, item, ingredients in added:
+                        order[index] = self._insert_dish(version_id, item, ingredients, position=index)
+                        changes['inserted'].append({'id': order[index], 'item': item, 'ingredients': ingredients})
+                    self._activate(version_id)
+                changes['order'] = order
+        except sqlite3.Error as e:
+            print(f"Database error in sync_menu: {e}")
+            self.invalidate(self.menu_id)
+            raise
+
+        if pending or changes['deleted'] or reordered:
+            cached = self._cached_menu()
+            self.invalidate(self.menu_id)
+            if cached is not None:
+                # Patch the snapshot with the change set instead of re-reading it
+                self._menu_caches[self.menu_id] = (self.revision, tuple(
+                    row if isinstance(row, MappingProxyType) else MappingProxyType(row)
+                    for row in self.apply_changes(cached, changes)
+                ))
+        return changes
+
+    def import_legacy_csv(self, path="app_data/menu.csv"):
+        """
+        Imports a menu CSV written by older versions of the app into the
+        active menu, once.
+
+        The database is the source of truth; the CSV is only read when its
+        size/mtime and content hash differ from those recorded in the
+        metadata table by the last import, so normal launches skip it
+        without reading the file.
+
+        Returns:
+            the ``sync_menu`` change set, or None if nothing was imported.
+        """
+        if not os.path.exists(path):
+            return None
+
+        stat = os.stat(path)
+        stamp = f"{stat.st_size}:{stat.st_mtime_ns}"
+        if self.get_meta("legacy_csv_stat") == stamp:
+            return None
+
+        with open(path, 'rb') as f:
+            data = f.read()
+        digest = hashlib.sha256(data).hexdigest()
+        if self.get_meta("legacy_csv_hash") == digest:
+            # Touched but not modified
+            self.set_meta("legacy_csv_stat", stamp)
+            return None
+
+        reader = csv.DictReader(io.StringIO(data.decode('utf-8'), newline=''))
+        changes = self.sync_menu(list(reader), label=f"Imported {os.path.basename(path)}")
+        self.set_meta("legacy_csv_hash", digest)
+        self.set_meta("legacy_csv_stat", stamp)
+        return changes
 
-    def export_to_csv(self, path="app_data/exported_menu.csv"):
-        dishes = self.get_all_dishes()
-        with open(path, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerow(['id', 'item', 'ingredients'])
-            writer.writerows(dishes)
+    @staticmethod
+    def apply_changes(menu_data, changes):
+        """
+        Applies a ``sync_menu`` change set to an in-memory list of dish
+        dictionaries and returns the updated list, in the synced order.
+        """
+        replaced = {row['id']: row for row in changes['updated']}
+        removed = set(changes['deleted'])
+        result = [replaced.get(row.get('id'), row) for row in menu_data if row.get('id') not in removed]
+        result.extend(changes['inserted'])
+        if changes.get('order'):
+            by_id = {row.get('id'): row for row in result}
+            result = [by_id[dish_id] for dish_id in changes['order'] if dish_id in by_id]
+        return result
+
+    def export_to_csv(self, path="app_data/exported_menu.csv", compress=False):
+        """
+        Streams the menu to a CSV file (gzip-compressed if ``compress``) in
+        fixed-size chunks, without loading the whole table.
+
+        Returns:
+            dict with the number of 'rows' exported and 'bytes' written.
+        """
+        return export_menu(
+            self.iter_menu(), FileSink(path),
+            columns=('id', 'item', 'ingredients'), compress=compress
+        )
 
     def clear_menu(self):
-        cursor = self.conn.cursor()
-        cursor.execute('DELETE FROM menu')
+        # An empty version, so the cleared menu can still be restored
+        self._activate(self._insert_version(self.menu_id, "Cleared menu"))
         self.conn.commit()
+        self.invalidate(self.menu_id)
+
+    def _activate(self, version_id):
+        """
+        Points the active menu at one of its versions and applies the
+        retention limit. Undo history is dropped, as it refers to the
+        previously active version.
+        """
+        self.conn.execute(
+            "UPDATE menus SET active_version_id = ? WHERE id = ?", (version_id, self.menu_id)
+        )
+        self._clear_undo_journal()
+        stale = [row[0] for row in self.conn.execute("""
+            SELECT id FROM menu_versions
+            WHERE menu_id = ? AND id NOT IN (
+                SELECT id FROM menu_versions WHERE menu_id = ? ORDER BY id DESC LIMIT ?
+            )
+        """, (self.menu_id, self.menu_id, MAX_MENU_VERSIONS)) if row[0] != version_id]
+        if stale:
+            self.conn.executemany("DELETE FROM version_dishes WHERE version_id = ?", [(v,) for v in stale])
+            self.conn.executemany("DELETE FROM menu_versions WHERE id = ?", [(v,) for v in stale])
+            self._delete_unreferenced_dishes()
+
+    def _delete_unreferenced_dishes(self):
+        cursor = self.conn.execute("""
+            DELETE FROM menu
+            WHERE menu_id = ? AND NOT EXISTS (
+                SELECT 1 FROM version_dishes WHERE version_dishes.dish_id = menu.id
+            )
+        """, (self.menu_id,))
+        return cursor.rowcount
+
+    def list_versions(self):
+        """
+        Returns the active menu's versions, newest first, as dictionaries
+        with 'id', 'label', 'created_at', number of 'dishes' and whether the
+        version is 'active'.
+        """
+        try:
+            rows = self.conn.execute("""
+                SELECT menu_versions.id, menu_versions.label, menu_versions.created_at,
+                       (SELECT COUNT(*) FROM version_dishes WHERE version_id = menu_versions.id),
+                       menu_versions.id = menus.active_version_id
+                FROM menu_versions
+                JOIN menus ON menus.id = menu_versions.menu_id
+                WHERE menu_versions.menu_id = ?
+                ORDER BY menu_versions.id DESC
+            """, (self.menu_id,)).fetchall()
+            return [
+                {'id': r[0], 'label': r[1], 'created_at': r[2], 'dishes': r[3], 'active': bool(r[4])}
+                for r in rows
+            ]
+        except sqlite3.Error as e:
+            print(f"Database error in list_versions: {e}")
+            return []
+
+    def activate_version(self, version_id):
+        """
+        Makes another version of the active menu current, e.g. to roll back a
+        bad upload. Only the menu's version pointer moves, so this takes the
+        same time whatever the size of the menu.
+
+        Raises:
+            ValueError: if the version doesn't belong to the active menu.
+        """
+        try:
+            with self.conn:
+                found = self.conn.execute(
+                    "SELECT 1 FROM menu_versions WHERE id = ? AND menu_id = ?", (version_id, self.menu_id)
+                ).fetchone()
+                if not found:
+                    raise ValueError(f"No version {version_id} of menu {self.menu_id}")
+                self._activate(version_id)
+        except sqlite3.Error as e:
+            print(f"Database error in activate_version: {e}")
+            raise
+        finally:
+            self.invalidate(self.menu_id)
+
+    def collect_garbage(self):
+        """
+        Deletes dish rows of the active menu that no version references.
+
+        Returns:
+            int number of rows deleted.
+        """
+        try:
+            with self.conn:
+                return self._delete_unreferenced_dishes()
+        except sqlite3.Error as e:
+            print(f"Database error in collect_garbage: {e}")
+            return 0
+
+    def file_size(self):
+        """Returns the size of the database file and its write-ahead log in bytes."""
+        return sum(
+            os.path.getsize(path) for path in (self.db_path, self.db_path + "-wal") if os.path.exists(path)
+        )
+
+    def run_maintenance(self):
+        """
+        Refreshes planner statistics, returns free pages to the file system
+        and checks the database for corruption. Slow on large databases, so
+        run it off the UI thread (see models.menu_maintenance).
+
+        Returns:
+            dict with 'started_at', 'duration' (seconds), 'bytes_before',
+            'bytes_after', 'bytes_reclaimed' and the 'integrity' check result
+            ('ok' or the problems found). The run is also recorded in the
+            maintenance_log table.
+        """
+        started_at = time.time()
+        start = time.perf_counter()
+        bytes_before = self.file_size()
+        try:
+            self.conn.commit()
+            self.conn.execute("ANALYZE")
+            self.conn.execute("PRAGMA optimize")
+            if self.conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+                # Databases created before incremental auto-vacuum need one full VACUUM
+                self.conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+                self.conn.execute("VACUUM")
+            else:
+                self.conn.execute("PRAGMA incremental_vacuum").fetchall()
+            self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchall()
+            problems = [row[0] for row in self.conn.execute("PRAGMA integrity_check")]
+            integrity = "\n".join(problems)
+
+            run = {
+                'started_at': started_at,
+                'duration': time.perf_counter() - start,
+                'bytes_before': bytes_before,
+                'bytes_after': self.file_size(),
+                'integrity': integrity,
+            }
+            run['bytes_reclaimed'] = max(0, run['bytes_before'] - run['bytes_after'])
+            with self.conn:
+                self.conn.execute(
+                    "INSERT INTO maintenance_log (started_at, duration, bytes_before, bytes_after, integrity) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (started_at, run['duration'], run['bytes_before'], run['bytes_after'], integrity)
+                )
+                self.conn.execute(
+                    "DELETE FROM maintenance_log WHERE id <= (SELECT MAX(id) FROM maintenance_log) - ?",
+                    (MAX_MAINTENANCE_LOG,)
+                )
+        except sqlite3.Error as e:
+            print(f"Database error in run_maintenance: {e}")
+            raise
+        return run
+
+    def last_maintenance(self):
+        """Returns the most recent maintenance_log entry as a dictionary, or None."""
+        try:
+            cursor = self.conn.execute("SELECT * FROM maintenance_log ORDER BY id DESC LIMIT 1")
+            row = cursor.fetchone()
+            if row is None:
+                return None
+            return dict(zip([column[0] for column in cursor.description], row))
+        except sqlite3.Error as e:
+            print(f"Database error in last_maintenance: {e}")
+            return None
 
     def close(self):
         """Closes the database connection."""
         if self.conn:
             self.conn.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="IngrediGuard menu database maintenance")
+    parser.add_argument("command", choices=["recompute-masks", "maintain"], help="Maintenance command to run")
+    parser.add_argument("--db", default="app_data/menu.db", help="Path to the menu database")
+    args = parser.parse_args()
+
+    db = MenuDatabase(args.db)
+    if args.command == "recompute-masks":
+        print(f"Recomputed allergen masks, {db.recompute_allergen_masks()} dishes changed")
+    elif args.command == "maintain":
+        run = db.run_maintenance()
+        print(f"Maintenance took {run['duration']:.2f}s, reclaimed {run['bytes_reclaimed']} bytes, "
+              f"integrity: {run['integrity']}")
+    db.close()
@@ -0,0 +1,91 @@
+import threading
+import time
+from models.menu_database import MenuDatabase
+
+# How often the menu database is maintained
+MAINTENANCE_INTERVAL = 24 * 60 * 60
+
+# Delay after startup before the first check, so maintenance doesn't compete
+# with the app loading its screens
+STARTUP_DELAY = 60
+
+class MaintenanceScheduler:
+    """
+    Runs ``MenuDatabase.run_maintenance`` on a background thread with its own
+    SQLite connection, once every ``interval`` seconds. The time of the last
+    run is read from the maintenance log, so the schedule survives restarts.
+    """
+
+    def __init__(self, db_path, interval=MAINTENANCE_INTERVAL, startup_delay=STARTUP_DELAY, on_complete=None):
+        """
+        Args:
+            db_path (str): Path to the menu database.
+            interval (float): Seconds between runs.
+            startup_delay (float): Seconds to wait before the first check.
+            on_complete: ``on_complete(run, error)`` called on the maintenance
+                thread after each run with the ``run_maintenance`` result.
+        """
+        self.db_path = db_path
+        self.interval = interval
+        self.startup_delay = startup_delay
+        self.on_complete = on_complete
+        self._wake = threading.Event()
+        self._forced = False
+        self._stopping = False
+        self._thread = None
+
+    def start(self):
+        """Starts the maintenance thread."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, name="menu-maintenance", daemon=True)
+            self._thread.start()
+
+    def run_now(self):
+        """Asks the maintenance thread to run as soon as possible."""
+        self._forced = True
+        self._wake.set()
+
+    def stop(self, timeout=5):
+        """Stops the maintenance thread, waiting up to ``timeout`` seconds for a running job."""
+        self._stopping = True
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _sleep(self, seconds):
+        self._wake.wait(seconds)
+        self._wake.clear()
+
+    def seconds_until_due(self, db):
+        """Returns how long until the next run is due (zero or less when overdue)."""
+        last = db.last_maintenance()
+        if last is None:
+            return 0
+        return last['started_at'] + self.interval - time.time()
+
+    def _loop(self):
+        self._sleep(self.startup_delay)
+        if self._stopping:
+            return
+        db = MenuDatabase(self.db_path)
+        # Wait for the UI thread's writes instead of failing while they commit
+        db.conn.execute("PRAGMA busy_timeout = 5000")
+        try:
+            while not self._stopping:
+                delay = self.seconds_until_due(db)
+                if not self._forced and delay > 0:
+                    self._sleep(delay)
+                    continue
+                self._forced = False
+                try:
+                    run, error = db.run_maintenance(), None
+                except Exception as e:
+                    run, error = None, e
+                if self.on_complete:
+                    self.on_complete(run, error)
+                if error:
+                    # Don't retry a failing run in a tight loop
+                    self._sleep(self.interval)
+        finally:
+            db.close()
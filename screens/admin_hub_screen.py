@@ -3,12 +3,51 @@ from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.button import Button
 from kivy.uix.popup import Popup
 from kivy.uix.label import Label
+from kivy.uix.gridlayout import GridLayout
+from kivy.uix.scrollview import ScrollView
+from kivy.uix.spinner import Spinner
+from kivy.uix.textinput import TextInput
 from kivy.logger import Logger
 import os
+import time
 # from opentelemetry import trace
 from utils.error_handler import error_handler
 from utils.feature_flags import OCR_ENABLED
 
+def export_menu_to_downloads(db):
+    """
+    Streams the active menu of ``db`` into a new CSV file in the device's
+    Downloads folder and returns the file name. Runs on the database worker
+    thread.
+    """
+    from utils.android_bridge import autoclass
+    from utils.menu_export import export_menu, StreamSink
+
+    # Android API classes
+    PythonActivity = autoclass('org.kivy.android.PythonActivity')
+    ContentValues = autoclass('android.content.ContentValues')
+    Downloads = autoclass('android.provider.MediaStore$Downloads')
+    Environment = autoclass('android.os.Environment')
+
+    # Get the ContentResolver
+    contentResolver = PythonActivity.mActivity.getContentResolver()
+
+    # Set up file metadata
+    file_name = f'menu_export_{int(time.time())}.csv'
+    content_values = ContentValues()
+    content_values.put("_display_name", file_name)
+    content_values.put("mime_type", 'text/csv')
+    content_values.put("relative_path", Environment.DIRECTORY_DOWNLOADS)
+
+    # Insert the file into the MediaStore
+    uri = contentResolver.insert(Downloads.EXTERNAL_CONTENT_URI, content_values)
+
+    # Stream the menu from the database into the file in fixed-size chunks
+    output_stream = contentResolver.openOutputStream(uri)
+    stats = export_menu(db.iter_menu(), StreamSink(output_stream, buffer_type=bytearray))
+    Logger.info(f"export_menu: Wrote {stats['rows']} items ({stats['bytes']} bytes)")
+    return file_name
+
 class AdminHubScreen(BaseScreen):
     def __init__(self, **kwargs):
         """Admin Hub Screen for managing menu and settings."""
@@ -16,9 +55,19 @@ class AdminHubScreen(BaseScreen):
         Logger.info("Initializing Admin Hub Screen")
         super().__init__(**kwargs)
 
+        # Location picker: every admin action works on the selected menu
+        location_row = BoxLayout(size_hint_y=None, height=50, spacing=10)
+        self.menu_ids = {}
+        self.location_spinner = Spinner(text='Default', size_hint_x=0.7)
+        self.location_spinner.bind(text=self.select_location)
+        location_row.add_widget(self.location_spinner)
+        location_row.add_widget(self.make_button("Add Location", on_press=self.prompt_new_location))
+        self.layout.add_widget(location_row)
+
         self.layout.add_widget(self.make_button("Upload Menu", "upload"))
         self.layout.add_widget(self.make_button("Export Menu", on_press=self.export_menu))
         self.layout.add_widget(self.make_button("Edit Menu", "admin_menu"))
+        self.layout.add_widget(self.make_button("Menu History", on_press=self.show_versions))
         if OCR_ENABLED:
             self.layout.add_widget(self.make_button("OCR Settings", "admin_settings"))
 
@@ -39,84 +88,158 @@ class AdminHubScreen(BaseScreen):
             btn.bind(on_press=lambda x: setattr(self.manager, 'current', screen))
         return btn
 
+    @error_handler
+    def refresh_locations(self):
+        """Fill the location picker from the database and select the active menu."""
+        db = self.manager.db
+        menus = db.list_menus()
+        self.menu_ids = {menu['name']: menu['id'] for menu in menus}
+        self.location_spinner.values = [menu['name'] for menu in menus]
+        for menu in menus:
+            if menu['id'] == db.menu_id:
+                self.location_spinner.text = menu['name']
+
+    @error_handler
+    def select_location(self, spinner, name):
+        """Switch the app to the menu of the chosen location."""
+        menu_id = self.menu_ids.get(name)
+        if menu_id is None or menu_id == self.manager.db.menu_id:
+            return
+        Logger.info(f"AdminHubScreen: Switching to menu {menu_id} ({name})")
+        self.manager.db.use_menu(menu_id)
+        self.set_status(f"Now managing '{name}' ({self.manager.db.count()} items)")
+
+    @error_handler
+    def prompt_new_location(self, instance):
+        """Ask for a location name and create an empty menu for it."""
+        content = BoxLayout(orientation='vertical', spacing=10, padding=10)
+        name_input = TextInput(hint_text="Location name", multiline=False, size_hint_y=None, height=40)
+        content.add_widget(name_input)
+
+        button_layout = BoxLayout(spacing=10, size_hint_y=None, height=50)
+        cancel_button = Button(text="Cancel")
+        add_button = Button(text="Add")
+        button_layout.add_widget(cancel_button)
+        button_layout.add_widget(add_button)
+        content.add_widget(button_layout)
+
+        popup = Popup(title="Add Location", content=content, size_hint=(0.8, None), height=200)
+
+        def add_location(_):
+            try:
+                menu_id = self.manager.db.create_menu(name_input.text)
+            except ValueError as e:
+                self.set_status(str(e))
+                return
+            popup.dismiss()
+            self.manager.db.use_menu(menu_id)
+            self.refresh_locations()
+            self.set_status(f"Added location '{name_input.text.strip()}'")
+
+        add_button.bind(on_press=add_location)
+        name_input.bind(on_text_validate=add_location)
+        cancel_button.bind(on_press=popup.dismiss)
+        popup.open()
+
+    @error_handler
+    def show_versions(self, instance):
+        """List saved versions of the current menu, each with a Restore button."""
+        grid = GridLayout(cols=2, spacing=5, size_hint_y=None)
+        grid.bind(minimum_height=grid.setter('height'))
+        popup = Popup(title="Menu History", size_hint=(0.9, 0.8))
+
+        for version in self.manager.db.list_versions():
+            saved = time.strftime('%Y-%m-%d %H:%M', time.localtime(version['created_at']))
+            label = Label(
+                text=f"{version['label'] or 'Menu'} - {saved}\n{version['dishes']} items",
+                size_hint_y=None,
+                height=50,
+                size_hint_x=0.7,
+                halign='left',
+                valign='middle'
+            )
+            label.bind(size=lambda instance, value: setattr(instance, 'text_size', value))
+            grid.add_widget(label)
+
+            button = Button(
+                text="Current" if version['active'] else "Restore",
+                disabled=version['active'],
+                size_hint_y=None,
+                height=50,
+                size_hint_x=0.3
+            )
+            button.bind(on_press=lambda _, v=version: self.restore_version(v, popup))
+            grid.add_widget(button)
+
+        content = BoxLayout(orientation='vertical', spacing=10)
+        scroll = ScrollView()
+        scroll.add_widget(grid)
+        content.add_widget(scroll)
+        close_button = Button(text="Close", size_hint_y=None, height=40)
+        close_button.bind(on_press=popup.dismiss)
+        content.add_widget(close_button)
+        popup.content = content
+        popup.open()
+
+    @error_handler
+    def restore_version(self, version, popup):
+        """Make an earlier version of the menu current again."""
+        Logger.info(f"AdminHubScreen: Restoring menu version {version['id']}")
+        popup.dismiss()
+        self.manager.async_db.submit(
+            'activate_version', version['id'],
+            callback=lambda result, error: self.set_status(
+                f"Error restoring menu: {str(error)}" if error
+                else f"Restored menu with {version['dishes']} items"
+            )
+        )
+
     @error_handler
     def export_menu(self, instance):
         """
         Export the current menu data to a CSV file in the 'Downloads' directory.
+        The export runs on the database worker, so large menus don't freeze the UI.
         """
         Logger.info("export_menu: Starting export process to Downloads.")
-        try:
-            from jnius import autoclass, cast
-            import time
-            import csv
-            from io import StringIO
-
-            # Android API classes
-            PythonActivity = autoclass('org.kivy.android.PythonActivity')
-            ContentValues = autoclass('android.content.ContentValues')
-            MediaStore = autoclass('android.provider.MediaStore')
-            Downloads = autoclass('android.provider.MediaStore$Downloads')
-            Environment = autoclass('android.os.Environment')
-
-            # Get the ContentResolver
-            activity = PythonActivity.mActivity
-            contentResolver = activity.getContentResolver()
-
-            # Prepare CSV data in memory
-            menu_data = self.manager.menu_data
-            output = StringIO()
-            writer = csv.writer(output)
-            writer.writerow(['item', 'ingredients'])
-            for item in menu_data:
-                ingredients_str = ', '.join(item['ingredients']) if isinstance(item['ingredients'], list) else item['ingredients']
-                writer.writerow([item['item'], ingredients_str])
-            csv_data = output.getvalue()
-            output.close()
-
-            # Set up file metadata
-            file_name = f'menu_export_{int(time.time())}.csv'
-            content_values = ContentValues()
-            content_values.put("_display_name", file_name)
-            content_values.put("mime_type", 'text/csv')
-            content_values.put("relative_path", Environment.DIRECTORY_DOWNLOADS)
-            
-            # Insert the file into the MediaStore
-            uri = contentResolver.insert(Downloads.EXTERNAL_CONTENT_URI, content_values)
-
-            # Write the data to the file
-            output_stream = contentResolver.openOutputStream(uri)
-            output_stream.write(csv_data.encode())
-            output_stream.close()
-
-            # Create a message for the popup
-            msg = f"Export successful!\n\nSaved as:\n{file_name}\n\nLocation: Your device's 'Downloads' folder."
-            content = Label(text=msg, text_size=(self.width * 0.7, None), size_hint_y=None, halign='center')
-            content.bind(texture_size=content.setter('size'))
-
-            export_popup = Popup(
-                title='Export Complete',
-                content=content,
-                size_hint=(0.8, 0.5),
-                auto_dismiss=True
-            )
-            export_popup.open()
-            Logger.info(f"Successfully exported menu to Downloads directory as {file_name}")
+        self.set_loading("Exporting menu")
+        self.manager.async_db.run(export_menu_to_downloads, readonly=True, callback=self.on_menu_exported)
 
-        except Exception as e:
-            error_msg = f"Error during export: {e}"
+    @error_handler
+    def on_menu_exported(self, file_name, error):
+        """Called on the UI thread once the export has finished."""
+        if error:
+            error_msg = f"Error during export: {error}"
             Logger.error(error_msg)
-            self.set_status(error_msg)
+            self.clear_loading(error_msg)
+            return
+        self.clear_loading()
+
+        # Create a message for the popup
+        msg = f"Export successful!\n\nSaved as:\n{file_name}\n\nLocation: Your device's 'Downloads' folder."
+        content = Label(text=msg, text_size=(self.width * 0.7, None), size_hint_y=None, halign='center')
+        content.bind(texture_size=content.setter('size'))
+
+        export_popup = Popup(
+            title='Export Complete',
+            content=content,
+            size_hint=(0.8, 0.5),
+            auto_dismiss=True
+        )
+        export_popup.open()
+        Logger.info(f"Successfully exported menu to Downloads directory as {file_name}")
 
     @error_handler
     def on_pre_enter(self):
-        """Refresh menu data when entering the screen."""
+        """Check the menu database when entering the screen."""
         # with self.tracer.start_as_current_span("admin_hub_screen.on_pre_enter") as span:
         #     span.set_attribute("manager_db_exists", hasattr(self.manager, 'db'))
 
-        Logger.info("AdminHubScreen: Refreshing menu data from database")
+        # Screens read the menu through the database's cached snapshot, so
+        # only a cheap count is needed here.
+        Logger.info("AdminHubScreen: Checking menu database")
         try:
-            self.manager.menu_data = self.manager.db.get_menu()
-            Logger.info(f"AdminHubScreen: Loaded {len(self.manager.menu_data)} menu items from database")
+            self.refresh_locations()
+            Logger.info(f"AdminHubScreen: {self.manager.db.count()} menu items in database")
         except Exception as e:
-            Logger.error(f"AdminHubScreen: Error refreshing menu data: {str(e)}")
+            Logger.error(f"AdminHubScreen: Error checking menu data: {str(e)}")
             self.set_status(f"Error loading menu: {str(e)}")
@@ -2,6 +2,7 @@ from screens.base_screen import BaseScreen
 from kivy.uix.label import Label
 from kivy.uix.button import Button
 from kivy.uix.textinput import TextInput
+from kivy.uix.spinner import Spinner
 from kivy.storage.jsonstore import JsonStore
 from kivy.logger import Logger
 from kivy.uix.boxlayout import BoxLayout
@@ -9,6 +10,10 @@ from kivy.uix.popup import Popup
 import os
 # from opentelemetry import trace
 from utils.error_handler import error_handler
+from utils.feature_flags import OCR_ENABLED
+
+# OCR engines an admin can pick; "tesseract" runs on the device without network
+OCR_ENGINES = ('ocr.space', 'tesseract')
 
 class AdminSettingsScreen(BaseScreen):
     def __init__(self, **kwargs):
@@ -41,6 +46,13 @@ class AdminSettingsScreen(BaseScreen):
         save_button.bind(on_press=self.save_key)
         self.layout.add_widget(save_button)
 
+        engine_row = BoxLayout(orientation='horizontal', size_hint_y=None, height=40)
+        engine_row.add_widget(Label(text="OCR Engine"))
+        self.engine_spinner = Spinner(text=OCR_ENGINES[0], values=OCR_ENGINES)
+        self.engine_spinner.bind(text=self.save_engine)
+        engine_row.add_widget(self.engine_spinner)
+        self.layout.add_widget(engine_row)
+
         self.status_label = Label(text="")
         self.layout.add_widget(self.status_label)
 
@@ -61,6 +73,9 @@ class AdminSettingsScreen(BaseScreen):
             self.api_input.text = ""
             self.status_label.text = "No API Key found. Please enter one."
 
+        if self.store.exists("ocr_backend"):
+            self.engine_spinner.text = self.store.get("ocr_backend")["value"]
+
     @error_handler
     def save_key(self, instance):
         """Save the API key to the store."""
@@ -77,6 +92,18 @@ class AdminSettingsScreen(BaseScreen):
             Logger.warning("[AdminSettingsScreen] API key is empty")
             self.status_label.text = "API Key cannot be empty."
 
+    @error_handler
+    def save_engine(self, spinner, engine):
+        """Save the selected OCR engine; the next scan uses it."""
+        if self.store.exists("ocr_backend") and self.store.get("ocr_backend")["value"] == engine:
+            return
+        Logger.info(f"[AdminSettingsScreen] Switching OCR engine to {engine}")
+        self.store.put("ocr_backend", value=engine)
+        if OCR_ENABLED:
+            from utils.ocr_api import set_backend
+            set_backend(None)
+        self.status_label.text = f"OCR engine set to {engine}."
+
     @error_handler
     def show_api_info(self, instance):
         """Show a popup with information about getting an OCR API key."""
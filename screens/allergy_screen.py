@@ -6,9 +6,44 @@ from kivy.uix.widget import Widget
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.scrollview import ScrollView
 from kivy.uix.gridlayout import GridLayout
+from kivy.uix.progressbar import ProgressBar
+from kivy.clock import Clock
 from kivy.logger import Logger
+import threading
 from utils.error_handler import error_handler
-from utils.allergy_filter import perform_allergy_filter, ALLERGEN_MAP
+from utils.allergy_filter import (
+    perform_allergy_filter, perform_category_filter, category_mask, ALLERGEN_MAP, FilterCancelled
+)
+from utils.allergen_index import AllergenIndex, MAX_SUGGESTIONS, split_allergens
+
+# Seconds of typing pause before the live safe-dish count is refreshed
+LIVE_COUNT_DELAY = 0.25
+
+def filter_menu_job(db, allergen_input, cancel, progress):
+    """
+    Reads the menu and filters it for ``allergen_input``. Runs on the
+    database worker thread.
+
+    When every allergen is a known category or term, the stored allergen
+    masks answer the query and no ingredient text is parsed.
+    """
+    allergens = split_allergens(allergen_input)
+    if allergens and not category_mask(allergens)[1]:
+        menu_data = db.get_menu()
+        safe_ids = {
+            allergen: {row['id'] for row in db.safe_dishes(category_mask([allergen])[0])}
+            for allergen in allergens
+        }
+        if progress is not None:
+            progress(len(menu_data), len(menu_data))
+        return perform_category_filter(menu_data, safe_ids)
+    return perform_allergy_filter(db.get_menu(), allergen_input, cancel=cancel, progress=progress)
+
+def build_allergen_index(db):
+    """Builds the AllergenIndex of the active menu. Runs on the database worker thread."""
+    menu_data = db.get_menu()
+    masks = db.allergen_masks()
+    return AllergenIndex(menu_data, [masks.get(row['id'], 0) for row in menu_data])
 
 class AllergyScreen(BaseScreen):
     def __init__(self, **kwargs):
@@ -48,9 +83,28 @@ class AllergyScreen(BaseScreen):
             font_size=18  # Added font size for better readability
         )
         
+        self.allergen_input.bind(on_text_validate=self.filter_menu, text=self.on_allergen_text)
         input_wrapper.add_widget(self.allergen_input)
         self.layout.add_widget(input_wrapper)
 
+        # Autocomplete for the allergen being typed, and a live safe-dish count
+        self.suggestion_row = BoxLayout(orientation='horizontal', size_hint_y=None, height=36, spacing=8)
+        self.suggestion_buttons = []
+        for _ in range(MAX_SUGGESTIONS):
+            suggestion_btn = Button(text='', opacity=0, disabled=True)
+            suggestion_btn.bind(on_press=lambda btn: self.accept_suggestion(btn.text))
+            self.suggestion_row.add_widget(suggestion_btn)
+            self.suggestion_buttons.append(suggestion_btn)
+        self.layout.add_widget(self.suggestion_row)
+
+        self.live_count_label = Label(text='', size_hint_y=None, height=24)
+        self.layout.add_widget(self.live_count_label)
+
+        # Built on the database worker when the menu changes
+        self.allergen_index = None
+        self.index_revision = None
+        self._live_count_event = Clock.create_trigger(self.update_live_count, LIVE_COUNT_DELAY)
+
         # Add a label for quick filters
         self.layout.add_widget(Label(
             text='Common Allergens:',
@@ -131,6 +185,17 @@ class AllergyScreen(BaseScreen):
         
         button_wrapper.add_widget(self.filter_button)
         self.layout.add_widget(button_wrapper)
+
+        # Progress of a running filter, hidden while idle
+        self.progress_row = BoxLayout(orientation='horizontal', size_hint_y=None, height=40,
+                                      spacing=10, opacity=0, disabled=True)
+        self.progress_bar = ProgressBar(max=1, value=0, size_hint_x=0.75)
+        self.progress_row.add_widget(self.progress_bar)
+        cancel_button = Button(text='Cancel', size_hint_x=0.25)
+        cancel_button.bind(on_press=lambda x: self.cancel_filter(status="Filtering cancelled."))
+        self.progress_row.add_widget(cancel_button)
+        self.layout.add_widget(self.progress_row)
+        self.filter_cancel = None
         
         # Add flexible space to push admin and back buttons to the bottom
         # Use a smaller flexible space since we've added quick filters
@@ -159,25 +224,132 @@ class AllergyScreen(BaseScreen):
             # Insert before the last item (back button)
             self.layout.add_widget(self.admin_btn, index=len(self.layout.children) - 1)
 
+        self.refresh_allergen_index()
+
+    @error_handler
+    def refresh_allergen_index(self):
+        """Rebuild the autocomplete and live-count index if the menu changed."""
+        revision = (self.manager.db.menu_id, self.manager.db.revision)
+        if revision == self.index_revision:
+            return
+        self.index_revision = revision
+        self.manager.async_db.run(
+            build_allergen_index, readonly=True,
+            callback=lambda index, error: self.on_index_built(revision, index, error)
+        )
+
+    def on_index_built(self, revision, index, error):
+        if error:
+            Logger.error(f"[AllergyScreen] Error building allergen index: {str(error)}")
+            self.index_revision = None
+            return
+        if revision != self.index_revision:
+            return
+        Logger.info(f"[AllergyScreen] Allergen index built: {index.size} dishes, {len(index.trie)} words")
+        self.allergen_index = index
+        self.on_allergen_text(self.allergen_input, self.allergen_input.text)
+
+    def on_allergen_text(self, instance, text):
+        """Update suggestions right away and the live count after a pause."""
+        suggestions = self.allergen_index.suggest(text.lower()) if self.allergen_index else []
+        for button, word in zip(self.suggestion_buttons, suggestions + [''] * MAX_SUGGESTIONS):
+            button.text = word
+            button.opacity = 1 if word else 0
+            button.disabled = not word
+        self._live_count_event.cancel()
+        self._live_count_event()
+
+    def accept_suggestion(self, word):
+        """Replace the allergen being typed with the chosen suggestion."""
+        text = self.allergen_input.text
+        fragment_start = max(text.rfind(','), text.rfind(' ')) + 1
+        prefix = text[:fragment_start]
+        self.allergen_input.text = f"{prefix}{' ' if prefix.endswith(',') else ''}{word}, "
+
+    def update_live_count(self, dt=None):
+        """Show how many dishes are safe for the allergens typed so far."""
+        if self.allergen_index is None:
+            self.live_count_label.text = ''
+            return
+        safe = self.allergen_index.safe_count(self.allergen_input.text)
+        if safe is None:
+            self.live_count_label.text = ''
+        else:
+            self.live_count_label.text = f"{safe} of {self.allergen_index.size} dishes look safe"
+
     @error_handler
     def filter_menu(self, instance):
         """
-        UI-facing method that gathers data and calls the core filtering logic.
+        Start filtering the menu on the database worker. A filter still
+        running from an earlier tap is cancelled first.
         """
         Logger.info("[AllergyScreen] Filtering menu based on allergens")
+        self.cancel_filter()
         allergen_input = self.allergen_input.text.lower().strip()
-        menu_data = self.manager.menu_data
+        if not allergen_input:
+            self.set_status("Please enter at least one allergen.")
+            return
+
+        # Each job has its own event, so results of a replaced job are dropped
+        cancel = threading.Event()
+        self.filter_cancel = cancel
+        self.show_progress(True)
+        self.set_status("Checking dishes...")
+        self.manager.async_db.run(
+            filter_menu_job, allergen_input, cancel,
+            lambda done, total: Clock.schedule_once(lambda dt: self.update_progress(cancel, done, total)),
+            readonly=True,
+            callback=lambda result, error: self.on_filter_finished(cancel, result, error)
+        )
 
-        filtered_menu = perform_allergy_filter(menu_data, allergen_input)
+    def update_progress(self, cancel, done, total):
+        """Show how many dishes the running filter has checked."""
+        if cancel is not self.filter_cancel:
+            return
+        self.progress_bar.max = max(total, 1)
+        self.progress_bar.value = done
+        self.set_status(f"Checked {done} of {total} dishes...")
+
+    @error_handler
+    def on_filter_finished(self, cancel, filtered_menu, error):
+        """Called on the UI thread when a filter job ends; opens the results."""
+        if cancel is not self.filter_cancel or cancel.is_set():
+            return
+        self.filter_cancel = None
+        self.show_progress(False)
 
+        if isinstance(error, FilterCancelled):
+            return
+        if error:
+            Logger.error(f"[AllergyScreen] Error filtering menu: {str(error)}")
+            self.set_status(f"Error filtering menu: {str(error)}")
+            return
         if filtered_menu is None:
             self.set_status("Please enter at least one allergen.")
             return
 
+        self.set_status("")
         self.manager.filtered_menu = filtered_menu
         self.manager.current = 'results'
 
+    def cancel_filter(self, status=None):
+        """Cancel the running filter job, if any."""
+        if self.filter_cancel is not None:
+            Logger.info("[AllergyScreen] Cancelling filter")
+            self.filter_cancel.set()
+            self.filter_cancel = None
+        self.show_progress(False)
+        if status is not None:
+            self.set_status(status)
+
+    def show_progress(self, visible):
+        self.progress_bar.value = 0
+        self.progress_row.opacity = 1 if visible else 0
+        self.progress_row.disabled = not visible
+
     def on_leave(self):
+        self.cancel_filter()
+        self._live_count_event.cancel()
         self.allergen_input.text = ""
 
 
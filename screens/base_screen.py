@@ -3,6 +3,7 @@ from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.button import Button
 from kivy.uix.label import Label
 from kivy.logger import Logger
+from kivy.clock import Clock
 from utils.error_handler import error_handler
 
 class BaseScreen(Screen):
@@ -15,6 +16,9 @@ class BaseScreen(Screen):
         self.status_label = Label(text='', size_hint_y=None, height=30)
         self.layout.add_widget(self.status_label)
         self.add_widget(self.layout)
+        self._loading_event = None
+        self._loading_text = ''
+        self._loading_step = 0
 
     @error_handler
     def set_status(self, text):
@@ -22,6 +26,30 @@ class BaseScreen(Screen):
         Logger.info(f"BaseScreen: Setting status: {text}")
         self.status_label.text = text
 
+    @error_handler
+    def set_loading(self, text):
+        """Show an animated loading message until clear_loading is called."""
+        Logger.info(f"BaseScreen: Loading: {text}")
+        self.clear_loading()
+        self._loading_text = text
+        self._loading_step = 0
+        self.status_label.text = text
+        self._loading_event = Clock.schedule_interval(self._animate_loading, 0.3)
+
+    def _animate_loading(self, dt):
+        self._loading_step = (self._loading_step + 1) % 4
+        self.status_label.text = self._loading_text + '.' * self._loading_step
+
+    @error_handler
+    def clear_loading(self, text=None):
+        """Stop the loading animation, optionally replacing it with a status."""
+        if self._loading_event is not None:
+            self._loading_event.cancel()
+            self._loading_event = None
+            self.status_label.text = ''
+        if text is not None:
+            self.set_status(text)
+
     @error_handler
     def add_back_button(self, target_screen):
         """Add a back button that switches to the given screen."""
@@ -34,4 +62,5 @@ class BaseScreen(Screen):
     def on_leave(self):
         """Clear the status label when leaving the screen."""
         Logger.info(f"BaseScreen: Leaving {self.__class__.__name__}")
+        self.clear_loading()
         self.set_status('')
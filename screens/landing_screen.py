@@ -58,7 +58,7 @@ class LandingScreen(BaseScreen):
         #     span.set_attribute("manager_menu_data", self.manager.menu_data)
         #     span.set_attribute("manager_is_admin", self.manager.is_admin)
 
-        if not self.manager.menu_data:
+        if self.manager.db.count() == 0:
             Logger.info("[LandingScreen] No menu data found, navigating to upload screen")
             if self.manager.is_admin:
                 self.manager.current = 'upload'
@@ -1,12 +1,108 @@
 from screens.base_screen import BaseScreen
 from kivy.uix.label import Label
-from kivy.uix.button import Button
-from kivy.uix.scrollview import ScrollView
-from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.recycleview import RecycleView
+from kivy.uix.recycleboxlayout import RecycleBoxLayout
+from kivy.uix.recycleview.views import RecycleDataViewBehavior
+from kivy.utils import escape_markup
 from kivy.logger import Logger
+import math
 # from opentelemetry import trace
 from utils.error_handler import error_handler
 
+# Heights of the recycled rows, in pixels
+HEADER_HEIGHT = 44
+ROW_HEIGHT = 36
+# Metrics of the default label font used to estimate wrapped row heights
+CHAR_WIDTH = 9
+LINE_HEIGHT = 20
+ROW_PADDING = 8
+
+
+def estimate_row_height(text, width):
+    """
+    Returns an estimate of the height needed to show ``text`` (without
+    markup) wrapped to ``width`` pixels. It only sizes rows that haven't
+    been shown yet; ResultRow sets the exact height once a row renders.
+    """
+    if not width:
+        return ROW_HEIGHT
+    chars_per_line = max(1, int(width // CHAR_WIDTH))
+    lines = math.ceil(len(text) / chars_per_line)
+    return max(ROW_HEIGHT, lines * LINE_HEIGHT + 2 * ROW_PADDING)
+
+
+def min_row_height(text):
+    """Section headers are taller than dish rows."""
+    return HEADER_HEIGHT if text.startswith('[b]') else ROW_HEIGHT
+
+
+class ResultRow(RecycleDataViewBehavior, Label):
+    """
+    One recycled row of the results list: a section header or a dish. The
+    text wraps instead of being cut off, so the allergens that make a dish
+    unsafe are always visible.
+    """
+    def __init__(self, **kwargs):
+        super().__init__(markup=True, halign='left', valign='middle', padding=(0, ROW_PADDING), **kwargs)
+        self.rv = None
+        self.index = None
+        self.bind(width=lambda inst, width: setattr(inst, 'text_size', (width, None)))
+        self.bind(texture_size=self.fit_text)
+
+    def refresh_view_attrs(self, rv, index, data):
+        self.rv = rv
+        self.index = index
+        return super().refresh_view_attrs(rv, index, data)
+
+    def fit_text(self, instance, texture_size):
+        """
+        Replaces the estimated height of the row's data entry with the
+        height of the rendered text. Runs for visible rows only, and again
+        when a width change re-wraps them.
+        """
+        if self.rv is None or self.index is None or self.index >= len(self.rv.data):
+            return
+        data = self.rv.data[self.index]
+        if data.get('text') != self.text:
+            return
+        height = max(texture_size[1], min_row_height(self.text))
+        if height != data.get('height'):
+            self.rv.data[self.index] = dict(data, height=height)
+
+
+def build_result_rows(menu_data, width=None):
+    """
+    Returns the RecycleView data for the filtered menu: a header followed
+    by the safe dishes, then a header followed by the dishes to avoid.
+
+    Dish rows start at a height estimated for their text wrapped to
+    ``width`` pixels (one line when the width isn't known yet).
+    """
+    safe_rows = [row for row in menu_data if row['is_safe']]
+    unsafe_rows = [row for row in menu_data if not row['is_safe']]
+
+    rows = []
+    if safe_rows:
+        rows.append({'text': "[b]No Allergens Found:[/b]", 'height': HEADER_HEIGHT})
+        rows.extend(
+            {
+                'text': f"  - {escape_markup(row['item'])}",
+                'height': estimate_row_height(f"  - {row['item']}", width)
+            }
+            for row in safe_rows
+        )
+    if unsafe_rows:
+        rows.append({'text': "[b]Better to Avoid (Contains Allergens):[/b]", 'height': HEADER_HEIGHT})
+        for row in unsafe_rows:
+            reasons = ", ".join(row.get('offending', []))
+            # Softer red color and clearer text
+            rows.append({
+                'text': f"  - [color=ff6666]{escape_markup(row['item'])}[/color] (contains {escape_markup(reasons)})",
+                'height': estimate_row_height(f"  - {row['item']} (contains {reasons})", width)
+            })
+    return rows
+
+
 class ResultsScreen(BaseScreen):
     def __init__(self, **kwargs):
         """Results Screen for displaying filtered menu items."""
@@ -14,67 +110,35 @@ class ResultsScreen(BaseScreen):
         Logger.info("[ResultsScreen] Initializing Results Screen")
         super().__init__(**kwargs)
 
-        self.scroll = ScrollView(size_hint=(1, 1))
-        self.results_label = Label(
-            text='Results will show here',
-            markup=True,
-            size_hint_y=None,
-            size_hint_x=None,
-            width=800,
-            halign='left',
-            valign='top',
-            text_size=(800, None),
-        )
-        self.results_label.bind(
-            texture_size=self.update_label_height,
-            width=lambda inst, val: setattr(inst, "text_size", (val, None))
+        # Only the rows on screen get a widget, and those widgets are reused
+        # while scrolling, so large menus cost no more to show than small ones
+        self.results_view = RecycleView(size_hint=(1, 1))
+        self.results_view.viewclass = ResultRow
+        rows_layout = RecycleBoxLayout(
+            orientation='vertical',
+            default_size=(None, ROW_HEIGHT),
+            default_size_hint=(1, None),
+            size_hint_y=None
         )
-        self.scroll.add_widget(self.results_label)
+        rows_layout.bind(minimum_height=rows_layout.setter('height'))
+        self.results_view.add_widget(rows_layout)
+        self.results_view.data = [{'text': 'Results will show here', 'height': ROW_HEIGHT}]
 
-        self.layout.add_widget(self.scroll)
+        self.layout.add_widget(self.results_view)
         self.add_back_button("allergy")
 
-    @error_handler
-    def update_label_height(self, instance, size):
-        """Update the height of the label based on its texture size."""
-        # with self.tracer.start_as_current_span("results_screen.update_label_height") as span:
-        Logger.info("[ResultsScreen] Updating label height")
-        self.results_label.height = size[1]
-
     @error_handler
     def on_pre_enter(self):
         """Display the filtered menu items when entering the screen."""
         # with self.tracer.start_as_current_span("results_screen.on_pre_enter") as span:
         #     span.set_attribute("manager_filtered_menu", self.manager.filtered_menu)
 
-        Logger.info("[ResultsScreen] Displaying filtered menu items")
-        Logger.debug("[ResultsScreen] Filtered menu data:", self.manager.filtered_menu)
-        print("Filtered Menu Data:", self.manager.filtered_menu)
         menu_data = self.manager.filtered_menu
-        self.results_label.text = ""
+        Logger.info(f"[ResultsScreen] Displaying {len(menu_data or [])} filtered menu items")
 
         if not menu_data:
-            self.results_label.markup = True
-            self.results_label.text = "[b]No menu items to display.[/b]"
+            self.results_view.data = [{'text': "[b]No menu items to display.[/b]", 'height': HEADER_HEIGHT}]
             return
 
-        safe_rows = [row for row in menu_data if row['is_safe']]
-        unsafe_rows = [row for row in menu_data if not row['is_safe']]
-
-        results_text = ""
-        if safe_rows:
-            results_text += "[b]No Allergens Found:[/b]\n"
-            for row in safe_rows:
-                item = row['item']
-                results_text += f"  - {item}\n"
-        
-        if unsafe_rows:
-            results_text += "[b]Better to Avoid (Contains Allergens):[/b]\n"
-            for row in unsafe_rows:
-                item = row['item']
-                reasons = ", ".join(row.get('offending', []))
-                # Softer red color and clearer text
-                results_text += f"  - [color=ff6666]{item}[/color] (contains {reasons})\n"
-
-        self.results_label.markup = True
-        self.results_label.text = results_text
\ No newline at end of file
+        self.results_view.data = build_result_rows(menu_data, self.results_view.width)
+        self.results_view.scroll_y = 1
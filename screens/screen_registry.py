@@ -0,0 +1,84 @@
+from kivy.uix.screenmanager import ScreenManager
+from kivy.clock import Clock
+from kivy.logger import Logger
+import importlib
+import time
+
+# Seconds after entering a screen before its likely successors are built,
+# so pre-building never competes with the transition animation
+PREBUILD_DELAY = 1.0
+
+
+class LazyScreenManager(ScreenManager):
+    """
+    ScreenManager that builds screens on first use. Screens are registered
+    with a factory and only instantiated when navigated to (or looked up
+    with get_screen), so screens a user never visits cost nothing.
+
+    Each registration can name the screens likely to follow it; once the
+    screen has been entered, those are built on an idle frame so the next
+    navigation doesn't pay for construction.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._factories = {}
+        self._next_screens = {}
+        self._prebuild_event = None
+        self.build_times = {}
+        self.bind(current=self._schedule_prebuild)
+
+    def register(self, name, factory, next_screens=()):
+        """
+        Register a screen without building it.
+
+        Args:
+            name (str): Screen name used for navigation.
+            factory: ``factory(name=name)`` returns the Screen, e.g. its class,
+                or a ``"module:Class"`` path so the module is only imported
+                when the screen is built.
+            next_screens (tuple): Names of screens to pre-build after this one is entered.
+        """
+        self._factories[name] = factory
+        self._next_screens[name] = tuple(next_screens)
+
+    def is_built(self, name):
+        return super().has_screen(name)
+
+    def has_screen(self, name):
+        return name in self._factories or super().has_screen(name)
+
+    def get_screen(self, name):
+        """Return the named screen, building it first if it is registered but not built yet."""
+        if not super().has_screen(name) and name in self._factories:
+            self._build(name)
+        return super().get_screen(name)
+
+    def _build(self, name):
+        start = time.perf_counter()
+        factory = self._factories[name]
+        if isinstance(factory, str):
+            module_name, class_name = factory.split(':')
+            factory = getattr(importlib.import_module(module_name), class_name)
+        screen = factory(name=name)
+        self.add_widget(screen)
+        self.build_times[name] = time.perf_counter() - start
+        Logger.info(f"[LazyScreenManager] Built screen '{name}' in {self.build_times[name] * 1000:.0f}ms")
+        return screen
+
+    def _schedule_prebuild(self, instance, current):
+        if self._prebuild_event is not None:
+            self._prebuild_event.cancel()
+        self._prebuild_event = Clock.schedule_once(lambda dt: self.prebuild_next(current), PREBUILD_DELAY)
+
+    def prebuild_next(self, name):
+        """Build the registered successors of ``name`` that aren't built yet, one per frame."""
+        self._prebuild_event = None
+        pending = [
+            next_name for next_name in self._next_screens.get(name, ())
+            if next_name in self._factories and not self.is_built(next_name)
+        ]
+        if pending:
+            self._build(pending[0])
+        if len(pending) > 1:
+            self._prebuild_event = Clock.schedule_once(lambda dt: self.prebuild_next(name), 0)
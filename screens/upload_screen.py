@@ -5,31 +5,59 @@ from utils.feature_flags import OCR_ENABLED
 
 # Conditional import: only bring in the heavy OCR module when the feature flag is enabled.
 if OCR_ENABLED:
-    from utils.ocr_api import extract_menu_from_image
+    from utils.ocr_api import extract_menu_pages_async, quota_warning
 else:
-    def extract_menu_from_image(*_args, **_kwargs):
+    def extract_menu_pages_async(*_args, **_kwargs):
+        return None
+
+    def quota_warning():
         return None
 
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.label import Label
 from kivy.uix.button import Button
-from kivy.uix.scrollview import ScrollView
+from kivy.uix.recycleview import RecycleView
+from kivy.uix.recycleboxlayout import RecycleBoxLayout
+from kivy.utils import escape_markup
+from kivy.clock import Clock
 from kivy.logger import Logger
-from jnius import autoclass, cast
+# Android classes are looked up inside the methods that use them
+from utils.android_bridge import autoclass, cast
 import os
-import csv
 import time
 from io import StringIO
-import platform
+from itertools import islice
 # from opentelemetry import trace
 from utils.error_handler import error_handler
 
-if platform == 'android':
-    from android import mActivity
-    Intent = autoclass('android.content.Intent')
-    File = autoclass('java.io.File')
-    Uri = autoclass('android.net.Uri')
-    FileProvider = autoclass('androidx.core.content.FileProvider')
+# Preview rows are added in chunks, spending at most this many seconds per
+# frame, so a large upload never stalls the UI
+PREVIEW_FRAME_BUDGET = 0.004
+PREVIEW_CHUNK = 50
+
+# Heights of the recycled preview rows, in pixels
+PREVIEW_ROW_HEIGHT = 56
+PREVIEW_INFO_HEIGHT = 30
+
+
+class PreviewRow(Label):
+    """One recycled row of the upload preview."""
+    def __init__(self, **kwargs):
+        super().__init__(markup=True, halign='left', valign='top', padding=(10, 4), **kwargs)
+        self.bind(size=lambda inst, size: setattr(inst, 'text_size', size))
+
+
+def preview_row(number, row):
+    """Returns the RecycleView entry previewing one parsed dish."""
+    ingredients = row['ingredients']
+    if isinstance(ingredients, list):
+        ingredients = ', '.join(ingredients)
+    return {
+        'text': f"{number}. [b]{escape_markup(row['item'].strip())}[/b]\n"
+                f"   Ingredients: {escape_markup(ingredients.strip())}",
+        'height': PREVIEW_ROW_HEIGHT
+    }
+
 
 class UploadScreen(BaseScreen):
     def __init__(self, **kwargs):
@@ -56,12 +84,20 @@ class UploadScreen(BaseScreen):
         self.layout.add_widget(button_row)
         Logger.info("UploadScreen: File selection buttons added")
 
-        self.preview_container = BoxLayout(orientation='vertical', size_hint_y=None)
-        self.preview_container.bind(minimum_height=self.preview_container.setter('height'))
-        
-        self.preview_area = ScrollView(size_hint=(1, 0.4))
-        self.preview_area.add_widget(self.preview_container)
-        self.layout.add_widget(self.preview_area)
+        # Every parsed row can be previewed; only the visible ones get widgets
+        self.preview_view = RecycleView(size_hint=(1, 0.4))
+        self.preview_view.viewclass = PreviewRow
+        preview_layout = RecycleBoxLayout(
+            orientation='vertical',
+            default_size=(None, PREVIEW_ROW_HEIGHT),
+            default_size_hint=(1, None),
+            size_hint_y=None
+        )
+        preview_layout.bind(minimum_height=preview_layout.setter('height'))
+        self.preview_view.add_widget(preview_layout)
+        self.layout.add_widget(self.preview_view)
+        self._preview_rows = None
+        self._preview_event = None
         Logger.info("UploadScreen: Preview area added")
 
         button_layout = BoxLayout(orientation='vertical', spacing=10, size_hint_y=None, height=110)
@@ -82,8 +118,12 @@ class UploadScreen(BaseScreen):
 
         self.selected_uri = None
         self.image_path = None
+        # Pages captured in the current multi-page session, in page order
+        self.image_paths = []
         self.parsed_menu_data = None
         self.is_ocr_mode = False
+        self.ocr_job = None
+        self.page_times = []
 
         self.bind(manager=self._set_back_button)
         Logger.info("UploadScreen: UploadScreen initialized")
@@ -105,6 +145,7 @@ class UploadScreen(BaseScreen):
 
         activity.bind(on_activity_result=self.on_activity_result)
         self.is_ocr_mode = False
+        self.image_paths = []
 
     @error_handler
     def capture_photo(self, instance):
@@ -192,6 +233,7 @@ class UploadScreen(BaseScreen):
         if request_code == 1002:
             # Revoke the URI permissions we granted
             try:
+                Intent = autoclass('android.content.Intent')
                 PythonActivity = autoclass('org.kivy.android.PythonActivity')
                 activity_instance = PythonActivity.mActivity
                 File = autoclass('java.io.File')
@@ -224,7 +266,10 @@ class UploadScreen(BaseScreen):
     def on_camera_success(self, path):
         # with self.tracer.start_as_current_span("upload_screen.on_camera_success") as span:
         Logger.info(f"UploadScreen: Camera capture successful, image saved to {path}")
-        self.set_status("Photo captured. Processing with OCR...")
+        self.image_paths.append(path)
+        pages = len(self.image_paths)
+        self.set_status(f"{pages} page{'s' if pages > 1 else ''} captured. Capture the next page or preview.")
+        self.camera_button.text = f"Capture Page {pages + 1}"
         self.upload_button.disabled = False
 
     @error_handler
@@ -324,7 +369,7 @@ class UploadScreen(BaseScreen):
         # with self.tracer.start_as_current_span("upload_screen.load_menu") as span:
         #     span.set_attribute("is_ocr_mode", self.is_ocr_mode)
 
-        if self.is_ocr_mode and self.image_path:
+        if self.is_ocr_mode and self.image_paths:
             # Only attempt OCR processing when the feature is turned on.
             if OCR_ENABLED:
                 self.load_menu_from_image()
@@ -345,20 +390,58 @@ class UploadScreen(BaseScreen):
         # with self.tracer.start_as_current_span("upload_screen.load_menu_from_image") as span:
         #     span.set_attribute("image_path", self.image_path)
 
+        # Pages are processed concurrently on the OCR workers, with timeouts
+        # and retries; the jobs are cancelled if the user leaves the screen.
+        self.cancel_ocr()
+        self.upload_button.disabled = True
+        self.page_times = []
+        self.set_loading(f"Processing {len(self.image_paths)} page(s) with OCR")
+        Logger.info(f"UploadScreen: Processing {len(self.image_paths)} page(s) with OCR")
+        self.ocr_job = extract_menu_pages_async(
+            self.image_paths, on_page=self.on_ocr_page, on_done=self.on_ocr_finished
+        )
+
+    @error_handler
+    def cancel_ocr(self):
+        """Cancel running OCR requests, if any."""
+        if self.ocr_job is not None:
+            Logger.info("UploadScreen: Cancelling OCR request")
+            self.ocr_job.cancel()
+            self.ocr_job = None
+
+    @error_handler
+    def on_ocr_page(self, index, page):
+        """Show progress as each page finishes."""
+        self.set_loading(
+            f"OCR page {index + 1} done in {page['seconds'] or 0:.1f}s "
+            f"({self.ocr_job.finished()}/{len(self.image_paths)})"
+        )
+
+    @error_handler
+    def on_ocr_finished(self, csv_text, pages):
+        """Called on the UI thread once OCR of every captured page has finished."""
+        self.ocr_job = None
+        self.upload_button.disabled = False
+        self.page_times = [
+            f"Page {number}: {page['seconds']:.1f}s" if page['csv'] else f"Page {number}: failed"
+            for number, page in enumerate(pages, 1)
+        ]
         try:
-            self.set_status("Processing image with OCR...")
-            Logger.info(f"UploadScreen: Processing image with OCR: {self.image_path}")
-        
-            # Extract menu text from image using OCR
-            csv_text = extract_menu_from_image(self.image_path)
-            if not csv_text:
-                self.set_status("OCR processing failed. Check API key and try again.")
+            warning = quota_warning()
+            if warning:
+                Logger.warning(f"UploadScreen: {warning}")
+
+            if not any(page['csv'] for page in pages):
+                Logger.error("UploadScreen: OCR failed for every page")
+                self.clear_loading(warning or "OCR processing failed. Check API key and try again.")
                 return
-                
+
+            self.clear_loading()
             Logger.info(f"UploadScreen: OCR extraction successful. CSV data length: {len(csv_text)}")
             
             # Parse the extracted CSV text
-            menu_data = parse_menu_stream(StringIO(csv_text))
+            stats = {}
+            menu_data = parse_menu_stream(StringIO(csv_text), stats)
             
             if not menu_data:
                 Logger.info("UploadScreen: No data parsed from OCR result.")
@@ -367,8 +450,9 @@ class UploadScreen(BaseScreen):
                 
             self.manager.menu_df = menu_data
             self.parsed_menu_data = menu_data
-            self.set_status(f"Extracted {len(menu_data)} menu items from image")
-            self.show_preview(menu_data)
+            status = f"Extracted {len(menu_data)} menu items from {len(pages)} page(s)"
+            self.set_status(f"{status}. {warning}" if warning else status)
+            self.show_preview(menu_data, stats)
             self.confirm_button.disabled = False
         
         except Exception as e:
@@ -389,24 +473,19 @@ class UploadScreen(BaseScreen):
             Logger.info("UploadScreen: Attempting to read from URI")
             csv_text = self.read_text_from_uri(self.selected_uri)
 
-            from io import StringIO
-            Logger.info("UploadScreen: Calling parse_menu_stream")
-            Logger.info(f"UploadScreen: Raw CSV text preview -- {csv_text[:100]}")
-            Logger.info(f"UploadScreen: parse_menu_stream is {parse_menu_stream}")
-            menu_data = parse_menu_stream(StringIO(csv_text))
-            Logger.info(f"UploadScreen: Parsed menu data -- {menu_data}")
-            
+            stats = {}
+            menu_data = parse_menu_stream(StringIO(csv_text), stats)
+
             if not menu_data:
                 Logger.info("UploadScreen: No data parsed from menu file.")
                 self.set_status("No data parsed from menu file.")
                 return
-            
-            Logger.info("UploadScreen: Successfully invoked parse_menu_stream")
+
+            Logger.info(f"UploadScreen: Loaded {len(menu_data)} items from menu file")
             self.manager.menu_df = menu_data
             self.parsed_menu_data = menu_data
             self.set_status(f"Loaded {len(menu_data)} items")
-            Logger.info(f"UploadScreen: Loaded menu data (before preview) -- {menu_data}")
-            self.show_preview(menu_data)
+            self.show_preview(menu_data, stats)
             self.confirm_button.disabled = False
 
         except Exception as e:
@@ -434,54 +513,63 @@ class UploadScreen(BaseScreen):
 
             inputStream.close()
             text = buffer.decode("utf-8").replace('\r\n', '\n').replace('\r', '\n')
-            Logger.info(f"UploadScreen: First 100 characters\n{text[:100]}")
+            Logger.info(f"UploadScreen: Read {len(text)} characters")
             return text
         except Exception as e:
             Logger.exception(f"UploadScreen: Error reading CSV text from URI: {str(e)}")
             raise e
 
     @error_handler
-    def show_preview(self, menu_data):
+    def show_preview(self, menu_data, stats=None):
+        """
+        Preview every parsed row. Rows are added over several frames by
+        render_preview_chunk; parse statistics and OCR page times come first.
+        """
         # with self.tracer.start_as_current_span("upload_screen.show_preview") as span:
         #     span.set_attribute("menu_data", menu_data)
 
-        Logger.info("UploadScreen: Showing preview of menu data")
-        
+        self.cancel_preview()
         if not menu_data:
             Logger.info("UploadScreen: No menu data to preview.")
             self.set_status("No data to preview.")
             return
-        Logger.info(f"UploadScreen: Menu data for preview -- {menu_data}")
-
-        preview_lines = []
-        for i, row in enumerate(menu_data[:100], 1):
-            item = row['item'].strip()
-            ingredients = row['ingredients']
-            if isinstance(ingredients, list):
-                ingredients = ', '.join(ingredients)
-            ingredients = ingredients.strip()
-            preview_lines.append(f"{i}. [b]{item}[/b]")
-            preview_lines.append(f"   Ingredients: {ingredients}")
-            preview_lines.append("")  # Add blank line between items
-        
-        preview_text = "\n".join(preview_lines)
-        Logger.info(f"UploadScreen: Preview text -- {preview_text}")
-        
-        self.preview_container.clear_widgets()
-        preview_label = Label(
-            text=preview_text,
-            size_hint_y=None,
-            text_size=(self.preview_container.width - 20, None),
-            halign='left',
-            valign='top',
-            markup=True,
-            padding=(10, 10)
-        )
-        preview_label.bind(
-            texture_size=lambda instance, value: setattr(instance, 'height', value[1]),
-            width=lambda instance, value: setattr(instance, 'text_size', (value - 20, None))
-        )
-        self.preview_container.add_widget(preview_label)
+        Logger.info(f"UploadScreen: Previewing {len(menu_data)} rows")
+
+        info = []
+        if stats:
+            info.append(
+                f"[i]{stats['rows']} rows, {stats['duplicates']} duplicates, "
+                f"{stats['empty_ingredients']} without ingredients[/i]"
+            )
+        if self.is_ocr_mode and self.page_times:
+            info.append("[i]" + ", ".join(self.page_times) + "[/i]")
+        self.preview_view.data = [{'text': text, 'height': PREVIEW_INFO_HEIGHT} for text in info]
+        self.preview_view.scroll_y = 1
+
+        self._preview_rows = enumerate(menu_data, 1)
+        self._preview_event = Clock.schedule_interval(self.render_preview_chunk, 0)
+
+    def render_preview_chunk(self, dt):
+        """Add preview rows until this frame's time budget is spent."""
+        deadline = time.perf_counter() + PREVIEW_FRAME_BUDGET
+        rows = []
+        done = False
+        while not done and time.perf_counter() < deadline:
+            chunk = [preview_row(number, row) for number, row in islice(self._preview_rows, PREVIEW_CHUNK)]
+            rows.extend(chunk)
+            done = len(chunk) < PREVIEW_CHUNK
+        self.preview_view.data.extend(rows)
+        if done:
+            self._preview_rows = None
+            self._preview_event = None
+            return False
+
+    def cancel_preview(self):
+        """Stop a preview that is still being rendered."""
+        if self._preview_event is not None:
+            self._preview_event.cancel()
+            self._preview_event = None
+        self._preview_rows = None
 
     @error_handler
     def confirm_menu(self, instance):
@@ -493,30 +581,30 @@ class UploadScreen(BaseScreen):
             self.set_status("No data to save.")
             return
 
-        try:
-            save_path = os.path.join("app_data", "menu.csv")
-            os.makedirs(os.path.dirname(save_path), exist_ok=True)
-            with open(save_path, "w", newline='', encoding="utf-8") as f:
-                writer = csv.writer(f)
-                writer.writerow(["item", "ingredients"])
-                for item in self.parsed_menu_data:
-                    ingredients = item['ingredients']
-                    if isinstance(ingredients, list):
-                        ingredients = ', '.join(ingredients)
-                    Logger.info(f"UploadScreen: Writing item {item['item']} with ingredients {ingredients}")
-                    writer.writerow([item['item'], ingredients])
-
-            self.manager.db.clear_menu()
-            self.manager.db.insert_menu(self.parsed_menu_data)
-            self.manager.menu_data = self.manager.db.get_menu()
-            Logger.info(f"UploadScreen: Saved menu data to {save_path}")
-            self.set_status("Menu uploaded and saved successfully.")
-            
-            self.manager.current = 'admin_hub'
-            
-        except Exception as e:
-            Logger.exception(f"UploadScreen: Error saving menu: {str(e)}")
-            self.set_status(f"Error saving menu: {str(e)}")
+        # Save on the database worker so large menus don't freeze the UI
+        self.confirm_button.disabled = True
+        self.upload_button.disabled = True
+        self.set_loading("Saving menu")
+        self.manager.async_db.submit(
+            'sync_menu', self.parsed_menu_data, label="Upload", callback=self.on_menu_saved
+        )
+
+    @error_handler
+    def on_menu_saved(self, changes, error):
+        """Called on the UI thread once the menu has been written."""
+        if error:
+            Logger.error(f"UploadScreen: Error saving menu: {str(error)}")
+            self.clear_loading(f"Error saving menu: {str(error)}")
+            self.confirm_button.disabled = False
+            return
+
+        Logger.info(
+            f"UploadScreen: Saved menu data to database -- "
+            f"{len(changes['inserted'])} added, {len(changes['updated'])} updated, "
+            f"{len(changes['deleted'])} removed, {changes['unchanged']} unchanged"
+        )
+        self.clear_loading("Menu uploaded and saved successfully.")
+        self.manager.current = 'admin_hub'
 
     @error_handler
     def _set_back_button(self, instance, value):
@@ -530,14 +618,8 @@ class UploadScreen(BaseScreen):
         """Clear the preview area when leaving the screen."""
         # with self.tracer.start_as_current_span("upload_screen.clear_preview") as span:
         Logger.info(f"UploadScreen: Clearing preview area")
-        if hasattr(self, 'preview_container'):
-            self.preview_container.clear_widgets()
-            empty_label = Label(
-                text="",
-                size_hint_y=None,
-                height=20
-            )
-            self.preview_container.add_widget(empty_label)
+        self.cancel_preview()
+        self.preview_view.data = []
 
     @error_handler
     def on_leave(self):
@@ -547,7 +629,13 @@ class UploadScreen(BaseScreen):
         self.clear_preview()
         self.selected_uri = None
         self.image_path = None
+        self.image_paths = []
+        self.page_times = []
         self.parsed_menu_data = None
         self.is_ocr_mode = False
+        self.cancel_ocr()
+        if OCR_ENABLED:
+            self.camera_button.text = 'Capture Menu Photo'
+
         self.set_status('')
         super().on_leave()
\ No newline at end of file
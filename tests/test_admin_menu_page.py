@@ -0,0 +1,51 @@
+import unittest
+import tempfile
+import shutil
+import sys
+import os
+
+# Add the root project directory to the Python path to allow imports from screens
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from models.menu_database import MenuDatabase
+from screens.admin_menu import read_menu_page
+
+class TestReadMenuPage(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.db = MenuDatabase(os.path.join(self.tmp_dir, "menu.db"))
+        self.db.insert_menu([
+            {'item': f'Dish {i}', 'ingredients': 'Tahini' if i % 2 else 'Rice'} for i in range(5)
+        ])
+
+    def tearDown(self):
+        self.db.close()
+        shutil.rmtree(self.tmp_dir)
+
+    def test_pages(self):
+        """TC-ADMIN-01: Pages hold page_size dishes and report whether another follows."""
+        first = read_menu_page(self.db, '', 0, 2)
+        self.assertEqual([row['item'] for row in first['rows']], ['Dish 0', 'Dish 1'])
+        self.assertTrue(first['has_next'])
+        self.assertEqual(first['label'], "Page 1 of 3 (5 dishes)")
+
+        last = read_menu_page(self.db, '', 2, 2)
+        self.assertEqual([row['item'] for row in last['rows']], ['Dish 4'])
+        self.assertFalse(last['has_next'])
+
+    def test_page_past_the_end(self):
+        """TC-ADMIN-02: A page past the end (e.g. after deletes) shows the last page."""
+        page = read_menu_page(self.db, '', 7, 2)
+        self.assertEqual(page['page'], 2)
+        self.assertEqual(len(page['rows']), 1)
+
+    def test_search_pages(self):
+        """TC-ADMIN-03: With a query, pages hold search hits."""
+        page = read_menu_page(self.db, 'tahini', 0, 10)
+        self.assertEqual(sorted(row['item'] for row in page['rows']), ['Dish 1', 'Dish 3'])
+        self.assertFalse(page['has_next'])
+        self.assertEqual(page['label'], "Results page 1")
+
+if __name__ == '__main__':
+    unittest.main()
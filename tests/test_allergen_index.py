@@ -0,0 +1,64 @@
+import unittest
+import sys
+import os
+
+# Add the root project directory to the Python path to allow imports from utils
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.allergen_index import PrefixTrie, AllergenIndex
+from utils.allergy_filter import perform_allergy_filter
+
+class TestAllergenIndex(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a small menu and its index."""
+        self.menu_data = [
+            {'item': 'Classic Burger', 'ingredients': 'Beef, Wheat Bun, Lettuce, Tomato'},
+            {'item': 'Peanut Butter Shake', 'ingredients': 'Milk, Peanut Butter, Sugar'},
+            {'item': 'Veggie Salad', 'ingredients': ['Lettuce', 'Cucumber', 'Bell Pepper']},
+            {'item': 'Mac and Cheese', 'ingredients': 'Pasta, Cheese, Butter'},
+            {'item': 'Hummus', 'ingredients': 'Chickpeas, Tahini, Garlic'},
+        ]
+        self.index = AllergenIndex(self.menu_data)
+
+    def test_trie_suggestions(self):
+        """TC-INDEX-01: The trie returns completions of a prefix alphabetically, a word before its extensions."""
+        trie = PrefixTrie(['sesame', 'sesame seed', 'soy', 'soya', 'shellfish'])
+        self.assertEqual(trie.suggest('so'), ['soy', 'soya'])
+        self.assertEqual(trie.suggest('SES', limit=1), ['sesame'])
+        self.assertEqual(trie.suggest('x'), [])
+        self.assertEqual(len(trie), 5)
+        self.assertEqual(trie.suggest('s', limit=3), ['sesame', 'sesame seed', 'shellfish'])
+
+    def test_safe_count_matches_filter(self):
+        """TC-INDEX-02: Live counts agree with perform_allergy_filter."""
+        for allergens in ["milk", "peanut, wheat", "cheese", "sesame", "gra, ", "Lettuce  Garlic"]:
+            expected = sum(row['is_safe'] for row in perform_allergy_filter(self.menu_data, allergens))
+            self.assertEqual(self.index.safe_count(allergens), expected, allergens)
+        self.assertIsNone(self.index.safe_count(" , "))
+
+    def test_unsafe_sets_are_cached(self):
+        """TC-INDEX-03: Each allergen is looked up once and then reused."""
+        first = self.index.unsafe_for('milk')
+        self.index.safe_count('milk, soy')
+        self.assertIs(self.index.unsafe_for('MILK'), first)
+
+    def test_suggest_last_fragment(self):
+        """TC-INDEX-04: Suggestions complete the allergen being typed, from allergens and menu words."""
+        self.assertEqual(self.index.suggest('milk, tah'), ['tahini'])
+        self.assertIn('chickpeas', self.index.suggest('chick'))
+        self.assertEqual(self.index.suggest('milk, '), [])
+        self.assertNotIn('soy', self.index.suggest('soy'))
+
+    def test_unfinished_word_not_counted(self):
+        """TC-INDEX-05: A half-typed allergen gives no count until it is a known word."""
+        self.assertIsNone(self.index.safe_count("mi"))
+        self.assertIsNone(self.index.safe_count("pean"))
+        self.assertEqual(self.index.safe_count("milk, pean"), self.index.safe_count("milk"))
+        self.assertEqual(self.index.safe_count("peanut"), 4)
+        self.assertEqual(self.index.safe_count("garlic"), 4)
+        # A finished word counts even if nothing on the menu contains it
+        self.assertEqual(self.index.safe_count("pean, "), 5)
+
+if __name__ == '__main__':
+    unittest.main()
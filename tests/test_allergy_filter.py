@@ -5,7 +5,11 @@ import os
 # Add the root project directory to the Python path to allow imports from utils
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from utils.allergy_filter import perform_allergy_filter
+from utils.allergy_filter import (
+    perform_allergy_filter, compute_allergen_mask, category_mask, ALLERGEN_BITS,
+    FilterCancelled, FILTER_PROGRESS_INTERVAL
+)
+import threading
 
 class TestAllergyFilter(unittest.TestCase):
 
@@ -114,5 +118,46 @@ class TestAllergyFilter(unittest.TestCase):
         self.assertFalse(mac_and_cheese['is_safe'])
         self.assertIn('cheese', mac_and_cheese['offending'])
 
+    def test_allergen_mask(self):
+        """TC-FILTER-09: Dish masks have one bit per allergen category present."""
+        mask = compute_allergen_mask('Pasta, Cheese, Butter')
+        self.assertEqual(mask, ALLERGEN_BITS['wheat'] | ALLERGEN_BITS['milk'])
+        self.assertEqual(compute_allergen_mask(['Toasted Sesame Seed', 'Rice']), ALLERGEN_BITS['sesame'])
+        self.assertEqual(compute_allergen_mask('Veggie Patty, Bun'), 0)
+
+    def test_category_mask(self):
+        """TC-FILTER-10: Category and ingredient inputs map to category bits."""
+        mask, unmatched = category_mask(['Peanut', 'cheese', 'gra'])
+        self.assertEqual(mask, ALLERGEN_BITS['peanut'] | ALLERGEN_BITS['milk'])
+        self.assertEqual(unmatched, ['gra'])
+
+    def test_progress_and_cancel(self):
+        """TC-FILTER-11: Progress is reported while filtering and a set cancel event stops it."""
+        menu = self.menu_data * FILTER_PROGRESS_INTERVAL
+        reports = []
+        result = perform_allergy_filter(menu, "milk", progress=lambda done, total: reports.append(done))
+        self.assertEqual(len(result), len(menu))
+        self.assertEqual(reports, [0, 250, 500, 750, 1000])
+
+        cancel = threading.Event()
+
+        def cancel_midway(done, total):
+            if done:
+                cancel.set()
+
+        with self.assertRaises(FilterCancelled):
+            perform_allergy_filter(menu, "milk", cancel=cancel, progress=cancel_midway)
+
+    def test_cancel_is_not_logged_as_error(self):
+        """TC-FILTER-12: Cancelling the filter doesn't log an error."""
+        cancel = threading.Event()
+        cancel.set()
+        with self.assertNoLogs('kivy', level='ERROR'):
+            with self.assertRaises(FilterCancelled):
+                perform_allergy_filter(self.menu_data, "milk", cancel=cancel)
+        with self.assertLogs('kivy', level='ERROR'):
+            with self.assertRaises(TypeError):
+                perform_allergy_filter(None, "milk")
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
@@ -0,0 +1,59 @@
+import unittest
+import tempfile
+import shutil
+import sys
+import os
+
+# Add the root project directory to the Python path to allow imports from screens
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from models.menu_database import MenuDatabase
+from screens.allergy_screen import filter_menu_job, build_allergen_index
+from utils.allergy_filter import perform_allergy_filter
+
+class TestAllergyJobs(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.db = MenuDatabase(os.path.join(self.tmp_dir, "menu.db"))
+        self.db.insert_menu([
+            {'item': 'Mac and Cheese', 'ingredients': 'Pasta, Cheese, Butter'},
+            {'item': 'Hummus', 'ingredients': 'Chickpeas, Tahini, Garlic'},
+            {'item': 'Nut Mix', 'ingredients': 'Brazil Nuts, Raisins'},
+            {'item': 'Peanut Shake', 'ingredients': 'Milk, Peanut Butter'},
+        ])
+
+    def tearDown(self):
+        self.db.close()
+        shutil.rmtree(self.tmp_dir)
+
+    def results(self, filtered):
+        return {row['item']: sorted(row['offending']) for row in filtered}
+
+    def test_category_queries_use_masks(self):
+        """TC-JOBS-01: Known categories and terms are filtered from the stored allergen masks."""
+        filtered = filter_menu_job(self.db, "milk, peanut", None, None)
+        self.assertEqual(self.results(filtered), {
+            'Mac and Cheese': ['milk'], 'Hummus': [], 'Nut Mix': [], 'Peanut Shake': ['milk', 'peanut'],
+        })
+        self.assertEqual(self.results(filtered), self.results(perform_allergy_filter(self.db.get_menu(), "milk, peanut")))
+
+        # The masks also match multi-word terms ("brazil nuts") that the word filter misses
+        self.assertEqual(self.results(filter_menu_job(self.db, "walnut", None, None))['Nut Mix'], ['walnut'])
+
+    def test_other_words_use_ingredients(self):
+        """TC-JOBS-02: Allergens outside the dictionary are matched against ingredient words."""
+        reports = []
+        filtered = filter_menu_job(self.db, "garlic, milk", None, lambda done, total: reports.append(done))
+        self.assertEqual(self.results(filtered)['Hummus'], ['garlic'])
+        self.assertEqual(reports[-1], 4)
+
+    def test_index_counts_from_masks(self):
+        """TC-JOBS-03: The live count index answers categories from the stored masks."""
+        index = build_allergen_index(self.db)
+        self.assertEqual(index.safe_count("walnut"), 3)
+        self.assertEqual(index.safe_count("cheese"), 2)
+        self.assertEqual(index.safe_count("garlic"), 3)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+import unittest
+import tempfile
+import threading
+import shutil
+import sys
+import os
+
+# Add the root project directory to the Python path to allow imports from models
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from models.menu_database import MenuDatabase
+from models.async_menu_database import AsyncMenuDatabase
+
+class TestAsyncMenuDatabase(unittest.TestCase):
+
+    def setUp(self):
+        """Create a database and a worker whose callbacks are queued like the Kivy Clock."""
+        self.tmp_dir = tempfile.mkdtemp()
+        self.db = MenuDatabase(os.path.join(self.tmp_dir, "menu.db"))
+        self.scheduled = []
+        self.async_db = AsyncMenuDatabase(self.db, schedule=lambda func, timeout: self.scheduled.append(func))
+
+    def tearDown(self):
+        self.async_db.close()
+        self.db.close()
+        shutil.rmtree(self.tmp_dir)
+
+    def run_scheduled(self):
+        """Deliver queued callbacks, as the Clock would on the UI thread."""
+        while self.scheduled:
+            self.scheduled.pop(0)(0)
+
+    def test_runs_on_worker_thread(self):
+        """TC-ASYNC-01: Operations run off the calling thread."""
+        future = self.async_db.run(lambda db: threading.current_thread(), readonly=True)
+        self.assertIsNot(future.result(timeout=5), threading.current_thread())
+
+    def test_write_invalidates_ui_cache(self):
+        """TC-ASYNC-02: A worker write refreshes the UI thread's cached menu."""
+        self.assertEqual(self.db.get_menu(), ())
+        results = []
+        future = self.async_db.submit(
+            'insert_menu',
+            [{'item': 'Hummus', 'ingredients': 'Chickpeas, Tahini'}],
+            callback=lambda result, error: results.append((result, error))
+        )
+        future.result(timeout=5)
+        self.async_db.submit('count').result(timeout=5)
+        self.run_scheduled()
+
+        self.assertEqual(results, [(None, None)])
+        self.assertEqual([row['item'] for row in self.db.get_menu()], ['Hummus'])
+
+    def test_errors_are_delivered(self):
+        """TC-ASYNC-03: Exceptions reach the callback instead of being lost."""
+        results = []
+        def fail(db):
+            raise ValueError("boom")
+        future = self.async_db.run(fail, callback=lambda result, error: results.append((result, error)))
+        with self.assertRaises(ValueError):
+            future.result(timeout=5)
+        self.run_scheduled()
+        self.assertIsNone(results[0][0])
+        self.assertIsInstance(results[0][1], ValueError)
+
+    def test_generators_are_materialized(self):
+        """TC-ASYNC-04: iter_menu results are read on the worker."""
+        self.db.add_dish('Hummus', 'Chickpeas, Tahini')
+        rows = self.async_db.submit('iter_menu', batch_size=1).result(timeout=5)
+        self.assertEqual([row['item'] for row in rows], ['Hummus'])
+
+    def test_calls_use_active_menu(self):
+        """TC-ASYNC-05: A call works on the menu active when it was made."""
+        downtown = self.db.create_menu('Downtown')
+        self.db.use_menu(downtown)
+        self.db.get_menu()
+        future = self.async_db.submit('add_dish', 'Lentil Soup', 'Lentils')
+        self.db.use_menu(1)
+        future.result(timeout=5)
+        self.run_scheduled()
+
+        self.assertEqual(self.db.count(), 0)
+        self.db.use_menu(downtown)
+        self.assertEqual([row['item'] for row in self.db.get_menu()], ['Lentil Soup'])
+
+    def test_worker_keeps_its_cache(self):
+        """TC-ASYNC-06: The worker's cached menu is reused until either thread writes."""
+        self.db.add_dish('Hummus', 'Chickpeas, Tahini')
+        first = self.async_db.submit('get_menu').result(timeout=5)
+        self.assertIs(self.async_db.submit('get_menu').result(timeout=5), first)
+
+        # A write on the UI thread
+        self.db.add_dish('Lentil Soup', 'Lentils')
+        second = self.async_db.submit('get_menu').result(timeout=5)
+        self.assertEqual([row['item'] for row in second], ['Hummus', 'Lentil Soup'])
+
+        # A write made directly through the worker's connection
+        def rename(db):
+            with db.conn:
+                db.conn.execute("UPDATE menu SET item = 'Hummus Plate' WHERE item = 'Hummus'")
+        self.async_db.run(rename).result(timeout=5)
+        third = self.async_db.submit('get_menu').result(timeout=5)
+        self.assertEqual([row['item'] for row in third], ['Hummus Plate', 'Lentil Soup'])
+        self.run_scheduled()
+        self.assertIs(self.async_db.submit('get_menu').result(timeout=5), third)
+
+if __name__ == '__main__':
+    unittest.main()
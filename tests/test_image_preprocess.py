@@ -0,0 +1,72 @@
+import unittest
+import io
+import sys
+import os
+from PIL import Image, ImageDraw
+
+# Add the root project directory to the Python path to allow imports from utils
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.image_preprocess import preprocess_image
+
+def make_photo(size=(3200, 2400), orientation=None, quality=95):
+    """Encode a busy, low-contrast test photo as a camera would."""
+    image = Image.effect_noise(size, 40).convert('RGB')
+    draw = ImageDraw.Draw(image)
+    for y in range(0, size[1], 60):
+        draw.text((40, y), "Hummus - Chickpeas, Tahini, Lemon " * 8, fill=(60, 60, 60))
+    exif = Image.Exif()
+    if orientation:
+        exif[0x0112] = orientation
+    buffer = io.BytesIO()
+    image.save(buffer, format='JPEG', quality=quality, exif=exif)
+    return buffer.getvalue()
+
+class TestImagePreprocess(unittest.TestCase):
+
+    def test_photo_is_shrunk(self):
+        """TC-IMG-01: A large photo is downscaled, grayscale and within budget."""
+        data = make_photo()
+        processed, stats = preprocess_image(data)
+        image = Image.open(io.BytesIO(processed))
+
+        self.assertEqual(image.mode, 'L')
+        self.assertLessEqual(max(image.size), 2000)
+        self.assertEqual(image.size, stats['size'])
+        self.assertLessEqual(len(processed), 1024 * 1024)
+        self.assertEqual(stats['bytes_before'], len(data))
+        self.assertEqual(stats['bytes_saved'], len(data) - len(processed))
+        self.assertGreater(stats['bytes_saved'], 0)
+        self.assertGreaterEqual(stats['seconds'], 0)
+
+    def test_downscale_to_long_edge(self):
+        """TC-IMG-02: Without a tight budget the long edge is the target size."""
+        processed, stats = preprocess_image(make_photo(), long_edge=1200, max_bytes=10 * 1024 * 1024)
+        self.assertEqual(stats['size'], (1200, 900))
+
+    def test_exif_orientation_applied(self):
+        """TC-IMG-03: A rotated camera photo comes out upright."""
+        processed, stats = preprocess_image(make_photo((1600, 1200), orientation=6))
+        self.assertEqual(Image.open(io.BytesIO(processed)).size, (1200, 1600))
+        self.assertEqual(stats['size'], (1200, 1600))
+
+    def test_byte_budget(self):
+        """TC-IMG-04: A tight budget lowers quality and then size until it fits."""
+        processed, stats = preprocess_image(make_photo(), max_bytes=150 * 1024)
+        self.assertLessEqual(len(processed), 150 * 1024)
+        self.assertLess(max(stats['size']), 2000)
+
+    def test_small_image_kept(self):
+        """TC-IMG-05: An image already smaller than the result is uploaded as is."""
+        data = make_photo((300, 200), quality=30)
+        processed, stats = preprocess_image(data)
+        self.assertIs(processed, data)
+        self.assertEqual(stats['bytes_saved'], 0)
+
+    def test_not_an_image(self):
+        """TC-IMG-06: Undecodable data raises instead of uploading garbage."""
+        with self.assertRaises(OSError):
+            preprocess_image(b'not an image')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,475 @@
+import unittest
+import tempfile
+import sqlite3
+import shutil
+import sys
+import os
+
+# Add the root project directory to the Python path to allow imports from models
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from models.menu_database import MenuDatabase, MAX_MENU_VERSIONS
+from utils.allergy_filter import category_mask
+
+class TestMenuDatabase(unittest.TestCase):
+
+    def setUp(self):
+        """Create a fresh database in a temporary directory for each test."""
+        self.tmp_dir = tempfile.mkdtemp()
+        self.db = MenuDatabase(os.path.join(self.tmp_dir, "menu.db"))
+        self.db.insert_menu([
+            {'item': 'Falafel Wrap', 'ingredients': ['Chickpeas', 'Tahini', 'Wheat Wrap']},
+            {'item': 'Hummus Plate', 'ingredients': 'Chickpeas, Tahini, Olive Oil, Lemon'},
+            {'item': 'Greek Salad', 'ingredients': 'Tomato, Cucumber, Feta Cheese, Olive Oil'},
+            {'item': 'Tahini Cookie', 'ingredients': 'Flour, Sugar, Butter'},
+        ])
+
+    def tearDown(self):
+        self.db.close()
+        shutil.rmtree(self.tmp_dir)
+
+    def test_search_ingredient(self):
+        """TC-DB-01: Search finds every dish mentioning an ingredient."""
+        items = {row['item'] for row in self.db.search("tahini")}
+        self.assertEqual(items, {'Falafel Wrap', 'Hummus Plate', 'Tahini Cookie'})
+
+    def test_search_ranks_name_matches_first(self):
+        """TC-DB-02: A match in the dish name outranks an ingredient match."""
+        results = self.db.search("tahini")
+        self.assertEqual(results[0]['item'], 'Tahini Cookie')
+
+    def test_search_prefix_and_phrase(self):
+        """TC-DB-03: Bare words match as prefixes, quoted text as a phrase."""
+        self.assertEqual(len(self.db.search("tah")), 3)
+        items = {row['item'] for row in self.db.search('"olive oil"')}
+        self.assertEqual(items, {'Hummus Plate', 'Greek Salad'})
+        self.assertEqual(self.db.search('"oil olive"'), [])
+
+    def test_search_pagination(self):
+        """TC-DB-04: limit and offset page through the ranked results."""
+        first = self.db.search("tahini", limit=2)
+        rest = self.db.search("tahini", limit=2, offset=2)
+        self.assertEqual(len(first), 2)
+        self.assertEqual(len(rest), 1)
+        self.assertNotIn(rest[0]['id'], [row['id'] for row in first])
+
+    def test_search_index_follows_writes(self):
+        """TC-DB-05: Triggers keep the index in sync with adds and deletes."""
+        self.db.add_dish('Sesame Noodles', 'Noodles, Tahini, Soy Sauce')
+        self.assertEqual(len(self.db.search("tahini")), 4)
+
+        cookie = self.db.search("cookie")[0]
+        self.db.delete_dish(cookie['id'])
+        self.assertEqual(self.db.search("cookie"), [])
+
+        self.db.clear_menu()
+        self.assertEqual(self.db.search("tahini"), [])
+
+    def test_search_empty_query(self):
+        """TC-DB-06: Blank or punctuation-only queries return nothing."""
+        self.assertEqual(self.db.search(""), [])
+        self.assertEqual(self.db.search(' " '), [])
+
+    def test_safe_dishes_by_category(self):
+        """TC-DB-07: safe_dishes filters on the stored allergen mask."""
+        mask, unmatched = category_mask(['sesame'])
+        self.assertEqual(unmatched, [])
+        items = {row['item'] for row in self.db.safe_dishes(mask)}
+        self.assertEqual(items, {'Greek Salad', 'Tahini Cookie'})
+
+        mask, _ = category_mask(['cheese', 'wheat'])
+        items = {row['item'] for row in self.db.safe_dishes(mask)}
+        self.assertEqual(items, {'Hummus Plate'})
+
+    def test_mask_maintained_on_add(self):
+        """TC-DB-08: add_dish stores the mask of the new dish."""
+        self.db.add_dish('Shrimp Cocktail', 'Shrimp, Lemon')
+        mask, _ = category_mask(['crustacean'])
+        items = {row['item'] for row in self.db.safe_dishes(mask)}
+        self.assertNotIn('Shrimp Cocktail', items)
+        self.assertEqual(len(items), 4)
+
+    def test_recompute_allergen_masks(self):
+        """TC-DB-09: Bulk recompute repairs stale masks."""
+        with self.db.conn:
+            self.db.conn.execute("UPDATE menu SET allergen_mask = 0")
+        self.assertEqual(self.db.recompute_allergen_masks(batch_size=2), 4)
+        self.assertEqual(self.db.recompute_allergen_masks(), 0)
+
+        mask, _ = category_mask(['milk'])
+        items = {row['item'] for row in self.db.safe_dishes(mask)}
+        self.assertEqual(items, {'Falafel Wrap', 'Hummus Plate'})
+
+    def test_sync_menu_diff(self):
+        """TC-DB-10: sync_menu only applies inserts, updates and deletes."""
+        before = {row['item']: row['id'] for row in self.db.get_menu()}
+        changes = self.db.sync_menu([
+            {'item': 'Falafel Wrap', 'ingredients': ['Chickpeas', 'Tahini', 'Wheat Wrap']},
+            {'item': ' Hummus Plate ', 'ingredients': 'Chickpeas,Tahini,  Olive Oil, Lemon'},
+            {'item': 'Greek Salad', 'ingredients': 'Tomato, Cucumber, Olive Oil'},
+            {'item': 'Lentil Soup', 'ingredients': 'Lentils, Carrot, Celery'},
+        ])
+
+        self.assertEqual(changes['unchanged'], 2)
+        self.assertEqual([row['id'] for row in changes['updated']], [before['Greek Salad']])
+        self.assertEqual([row['item'] for row in changes['inserted']], ['Lentil Soup'])
+        self.assertEqual(changes['deleted'], [before['Tahini Cookie']])
+
+        after = {row['item']: row['id'] for row in self.db.get_menu()}
+        self.assertEqual(after['Falafel Wrap'], before['Falafel Wrap'])
+        self.assertEqual(after['Greek Salad'], before['Greek Salad'])
+        self.assertNotIn('Tahini Cookie', after)
+
+        # The updated dish has a fresh allergen mask and search entry
+        mask, _ = category_mask(['milk'])
+        self.assertIn('Greek Salad', {row['item'] for row in self.db.safe_dishes(mask)})
+        self.assertEqual(self.db.search("feta"), [])
+
+    def test_sync_menu_is_idempotent(self):
+        """TC-DB-11: Syncing the same menu twice changes nothing."""
+        items = [{'item': row['item'], 'ingredients': row['ingredients']} for row in self.db.get_menu()]
+        changes = self.db.sync_menu(items)
+        self.assertEqual(changes['unchanged'], 4)
+        self.assertEqual(changes['inserted'] + changes['updated'] + changes['deleted'], [])
+
+    def test_apply_changes(self):
+        """TC-DB-12: A change set patches an in-memory copy of the menu."""
+        menu = self.db.get_menu()
+        changes = self.db.sync_menu([
+            {'item': 'Falafel Wrap', 'ingredients': 'Chickpeas, Tahini'},
+            {'item': 'Lentil Soup', 'ingredients': 'Lentils'},
+        ])
+        patched = MenuDatabase.apply_changes(menu, changes)
+        self.assertEqual(sorted(patched, key=lambda r: r['id']), list(self.db.get_menu()))
+
+    def test_sync_menu_keeps_upload_order(self):
+        """TC-DB-33: A synced menu takes the order of the upload and keeps dish IDs."""
+        before = {row['item']: row['id'] for row in self.db.get_menu()}
+        cached = self.db.get_menu()
+        changes = self.db.sync_menu([
+            {'item': 'Tahini Cookie', 'ingredients': 'Flour, Sugar, Butter'},
+            {'item': 'Lentil Soup', 'ingredients': 'Lentils'},
+            {'item': 'Falafel Wrap', 'ingredients': 'Chickpeas, Tahini, Wheat Wrap'},
+            {'item': 'Hummus Plate', 'ingredients': 'Chickpeas, Olive Oil'},
+        ])
+        expected = ['Tahini Cookie', 'Lentil Soup', 'Falafel Wrap', 'Hummus Plate']
+        self.assertEqual([row['item'] for row in self.db.get_menu()], expected)
+        self.assertEqual([row['item'] for row in MenuDatabase.apply_changes(cached, changes)], expected)
+        self.db.invalidate()
+        self.assertEqual([row['item'] for row in self.db.get_menu()], expected)
+        self.assertEqual(self.db.get_menu()[0]['id'], before['Tahini Cookie'])
+        self.assertEqual(self.db.get_menu()[3]['id'], before['Hummus Plate'])
+
+        # A reorder alone is a change too
+        self.db.sync_menu([dict(row) for row in reversed(self.db.get_menu())])
+        self.db.invalidate()
+        self.assertEqual([row['item'] for row in self.db.get_menu()], expected[::-1])
+
+        # Dishes added later still go last
+        self.db.add_dish('Baklava', 'Walnuts')
+        self.assertEqual(self.db.get_menu()[-1]['item'], 'Baklava')
+
+    def test_import_legacy_csv_once(self):
+        """TC-DB-13: A legacy menu.csv is imported once and then skipped."""
+        csv_path = os.path.join(self.tmp_dir, "menu.csv")
+        with open(csv_path, "w", newline='', encoding="utf-8") as f:
+            f.write('item,ingredients\nFalafel Wrap,"Chickpeas, Tahini, Wheat Wrap"\nLentil Soup,Lentils\n')
+
+        changes = self.db.import_legacy_csv(csv_path)
+        self.assertEqual([row['item'] for row in changes['inserted']], ['Lentil Soup'])
+        self.assertEqual(len(self.db.get_menu()), 2)
+
+        # Edits made in the app survive later launches
+        self.db.add_dish('Baklava', 'Walnuts, Honey, Phyllo')
+        self.assertIsNone(self.db.import_legacy_csv(csv_path))
+        self.assertEqual(len(self.db.get_menu()), 3)
+
+        # Touching the file without changing it still skips the import
+        os.utime(csv_path, (0, 0))
+        self.assertIsNone(self.db.import_legacy_csv(csv_path))
+        self.assertEqual(len(self.db.get_menu()), 3)
+
+    def test_import_legacy_csv_missing(self):
+        """TC-DB-14: No CSV means nothing to import."""
+        self.assertIsNone(self.db.import_legacy_csv(os.path.join(self.tmp_dir, "missing.csv")))
+
+    def test_get_menu_pages(self):
+        """TC-DB-15: get_menu reads pages in ID order."""
+        full = self.db.get_menu()
+        self.assertEqual(self.db.get_menu(offset=0, limit=3), full[:3])
+        self.assertEqual(self.db.get_menu(offset=3, limit=3), full[3:])
+        self.assertEqual(self.db.get_menu(offset=10, limit=3), ())
+
+    def test_count_and_iter_menu(self):
+        """TC-DB-16: count and iter_menu agree with a full read."""
+        self.assertEqual(self.db.count(), 4)
+        self.assertEqual(list(self.db.iter_menu(batch_size=3)), list(self.db.get_menu()))
+        self.assertTrue(self.db.is_healthy())
+
+        dish_id = self.db.add_dish('Baklava', 'Walnuts, Honey')
+        self.assertEqual(self.db.get_menu(offset=4, limit=1)[0]['id'], dish_id)
+        self.assertEqual(self.db.count(), 5)
+
+    def test_menu_cache_revision(self):
+        """TC-DB-17: get_menu serves a cached snapshot until a write."""
+        first = self.db.get_menu()
+        self.assertIs(self.db.get_menu(), first)
+        with self.assertRaises(TypeError):
+            first[0]['item'] = 'Changed'
+
+        revision = self.db.revision
+        self.db.add_dish('Baklava', 'Walnuts, Honey')
+        self.assertGreater(self.db.revision, revision)
+        second = self.db.get_menu()
+        self.assertIsNot(second, first)
+        self.assertEqual(len(second), 5)
+
+        self.db.delete_dish(second[-1]['id'])
+        self.assertEqual(len(self.db.get_menu()), 4)
+        self.db.clear_menu()
+        self.assertEqual(self.db.get_menu(), ())
+
+    def test_menu_cache_patched_by_sync(self):
+        """TC-DB-18: sync_menu patches a warm cache to match the table."""
+        self.db.get_menu()
+        self.db.sync_menu([
+            {'item': 'Greek Salad', 'ingredients': 'Tomato, Olive Oil'},
+            {'item': 'Lentil Soup', 'ingredients': 'Lentils'},
+        ])
+        cached = self.db.get_menu()
+        self.db.invalidate()
+        self.assertEqual(cached, self.db.get_menu())
+
+        # An unchanged sync keeps the same snapshot
+        self.db.sync_menu([dict(row) for row in cached])
+        self.assertIs(self.db.get_menu(), self.db.get_menu())
+        self.assertEqual(self.db.get_menu(), cached)
+
+    def test_apply_batch(self):
+        """TC-DB-19: apply_batch applies mixed operations and reports affected IDs."""
+        ids = {row['item']: row['id'] for row in self.db.get_menu()}
+        result = self.db.apply_batch([
+            {'op': 'add', 'item': 'Baklava', 'ingredients': ['Walnuts', 'Honey']},
+            {'op': 'update', 'id': ids['Greek Salad'], 'item': 'Greek Salad', 'ingredients': 'Tomato, Olive Oil'},
+            {'op': 'delete', 'id': ids['Tahini Cookie']},
+            {'op': 'delete', 'id': ids['Falafel Wrap']},
+        ])
+        self.assertEqual(len(result['added']), 1)
+        self.assertEqual(result['updated'], [ids['Greek Salad']])
+        self.assertEqual(result['deleted'], [ids['Tahini Cookie'], ids['Falafel Wrap']])
+
+        items = {row['item'] for row in self.db.get_menu()}
+        self.assertEqual(items, {'Hummus Plate', 'Greek Salad', 'Baklava'})
+        mask, _ = category_mask(['tree nut'])
+        self.assertNotIn('Baklava', {row['item'] for row in self.db.safe_dishes(mask)})
+
+    def test_apply_batch_is_atomic(self):
+        """TC-DB-20: A failing operation rolls back the whole batch."""
+        before = self.db.get_menu()
+        with self.assertRaises(ValueError):
+            self.db.apply_batch([
+                {'op': 'delete', 'id': before[0]['id']},
+                {'op': 'delete', 'id': 9999},
+            ])
+        self.assertEqual(self.db.get_menu(), before)
+
+    def test_undo_batch(self):
+        """TC-DB-21: undo_batch reverts the most recent batch in one step."""
+        before = self.db.get_menu()
+        ids = [row['id'] for row in before]
+        self.db.apply_batch([{'op': 'delete', 'id': dish_id} for dish_id in ids[:2]])
+        second = self.db.apply_batch([
+            {'op': 'add', 'item': 'Baklava', 'ingredients': 'Walnuts, Honey'},
+            {'op': 'update', 'id': ids[2], 'item': 'Salad', 'ingredients': 'Lettuce'},
+        ])
+
+        undo = self.db.undo_batch()
+        self.assertEqual(undo['batch_id'], second['batch_id'])
+        self.assertEqual(undo['deleted'], second['added'])
+        self.assertEqual(undo['updated'], [ids[2]])
+
+        undo = self.db.undo_batch()
+        self.assertEqual(sorted(undo['added']), ids[:2])
+        self.assertEqual(self.db.get_menu(), before)
+        self.assertEqual(len(self.db.search("tahini")), 3)
+        self.assertIsNone(self.db.undo_batch())
+    def test_menu_partitions(self):
+        """TC-DB-22: Reads and writes only touch the active menu."""
+        downtown = self.db.create_menu('Downtown')
+        with self.assertRaises(ValueError):
+            self.db.create_menu('Downtown')
+        with self.assertRaises(ValueError):
+            self.db.use_menu(999)
+
+        self.db.use_menu(downtown)
+        self.assertEqual(self.db.get_menu(), ())
+        self.db.sync_menu([{'item': 'Tahini Toast', 'ingredients': 'Bread, Tahini'}])
+        self.assertEqual([row['item'] for row in self.db.search('tahini')], ['Tahini Toast'])
+        self.assertEqual(len(self.db.safe_dishes(0)), 1)
+        self.db.clear_menu()
+        self.db.add_dish('Lentil Soup', 'Lentils')
+
+        self.db.use_menu(1)
+        self.assertEqual(self.db.count(), 4)
+        self.assertEqual(
+            [(m['name'], m['dishes']) for m in self.db.list_menus()],
+            [('Default', 4), ('Downtown', 1)]
+        )
+
+        # The active menu is remembered across launches
+        self.db.use_menu(downtown)
+        self.db.close()
+        self.db = MenuDatabase(os.path.join(self.tmp_dir, "menu.db"))
+        self.assertEqual([row['item'] for row in self.db.get_menu()], ['Lentil Soup'])
+
+    def test_menu_caches_stay_warm(self):
+        """TC-DB-23: Switching menus keeps each menu's cached snapshot."""
+        default_menu = self.db.get_menu()
+        downtown = self.db.create_menu('Downtown')
+        self.db.use_menu(downtown)
+        self.db.add_dish('Lentil Soup', 'Lentils')
+        downtown_menu = self.db.get_menu()
+
+        self.db.use_menu(1)
+        self.assertIs(self.db.get_menu(), default_menu)
+        self.db.use_menu(downtown)
+        self.assertIs(self.db.get_menu(), downtown_menu)
+
+    def stored_rows(self):
+        return self.db.conn.execute("SELECT COUNT(*) FROM menu").fetchone()[0]
+
+    def test_versions_roll_back_upload(self):
+        """TC-DB-24: An upload is a new version and the previous one can be restored."""
+        before = [(row['item'], row['ingredients']) for row in self.db.get_menu()]
+        self.db.sync_menu([
+            {'item': 'Falafel Wrap', 'ingredients': 'Chickpeas, Tahini, Wheat Wrap'},
+            {'item': 'Hummus Plate', 'ingredients': 'Chickpeas, Olive Oil'},
+        ], label='Upload')
+        # Only the updated dish is stored twice; the unchanged one is shared
+        self.assertEqual(self.stored_rows(), 5)
+
+        versions = self.db.list_versions()
+        self.assertEqual([(v['label'], v['dishes'], v['active']) for v in versions],
+                         [('Upload', 2, True), ('Initial menu', 4, False)])
+
+        self.db.activate_version(versions[1]['id'])
+        self.assertEqual([(row['item'], row['ingredients']) for row in self.db.get_menu()], before)
+        self.assertEqual(self.db.count(), 4)
+        self.assertEqual(len(self.db.search('feta')), 1)
+
+        with self.assertRaises(ValueError):
+            self.db.activate_version(999)
+
+    def test_batch_update_keeps_old_versions(self):
+        """TC-DB-25: Editing a shared dish leaves earlier versions untouched."""
+        self.db.sync_menu([dict(row) for row in self.db.get_menu()][:3])
+        old_version, new_version = self.db.list_versions()[1]['id'], self.db.active_version()
+        dish_id = self.db.get_menu()[0]['id']
+        self.db.apply_batch([{'op': 'update', 'id': dish_id, 'item': 'Falafel Bowl', 'ingredients': 'Chickpeas'}])
+        self.assertEqual(self.db.get_menu()[0]['id'], dish_id)
+
+        self.db.activate_version(old_version)
+        self.assertEqual(self.db.get_menu()[0]['item'], 'Falafel Wrap')
+        self.db.activate_version(new_version)
+        self.assertEqual(self.db.get_menu()[0]['item'], 'Falafel Bowl')
+
+    def test_cleared_menu_can_be_restored(self):
+        """TC-DB-26: clear_menu keeps the previous version."""
+        self.db.clear_menu()
+        self.assertEqual(self.db.count(), 0)
+        self.db.activate_version(self.db.list_versions()[1]['id'])
+        self.assertEqual(self.db.count(), 4)
+
+    def test_version_retention(self):
+        """TC-DB-27: Old versions are dropped and their unshared dishes collected."""
+        for i in range(MAX_MENU_VERSIONS + 5):
+            self.db.sync_menu([{'item': f'Special {i}', 'ingredients': 'Rice'}])
+        self.assertEqual(len(self.db.list_versions()), MAX_MENU_VERSIONS)
+        self.assertEqual(self.stored_rows(), MAX_MENU_VERSIONS)
+        self.assertEqual(self.db.collect_garbage(), 0)
+
+    def test_existing_dishes_become_first_version(self):
+        """TC-DB-28: A database from before versioning keeps its dishes."""
+        path = os.path.join(self.tmp_dir, "old.db")
+        conn = sqlite3.connect(path)
+        conn.execute("CREATE TABLE menu (id INTEGER PRIMARY KEY, item TEXT NOT NULL, ingredients TEXT NOT NULL)")
+        conn.execute("INSERT INTO menu (item, ingredients) VALUES ('Greek Salad', 'Feta Cheese')")
+        conn.commit()
+        conn.close()
+
+        db = MenuDatabase(path)
+        try:
+            self.assertEqual([row['item'] for row in db.get_menu()], ['Greek Salad'])
+            self.assertEqual(len(db.safe_dishes(category_mask(['dairy'])[0])), 0)
+            self.assertEqual(db.list_menus(), [{'id': 1, 'name': 'Default', 'dishes': 1}])
+        finally:
+            db.close()
+
+    def assert_search_index_intact(self):
+        self.db.conn.execute("INSERT INTO menu_fts(menu_fts, rank) VALUES ('integrity-check', 1)")
+
+    def test_undo_keeps_search_index(self):
+        """TC-DB-29: Undoing an update or delete leaves the search index in step with the menu."""
+        ids = {row['item']: row['id'] for row in self.db.get_menu()}
+        self.db.apply_batch([{'op': 'update', 'id': ids['Greek Salad'], 'item': 'Village Salad', 'ingredients': 'Tomato'}])
+        self.db.undo_batch()
+        self.assertEqual(self.db.search('village'), [])
+        self.assertEqual([row['item'] for row in self.db.search('feta')], ['Greek Salad'])
+        self.assert_search_index_intact()
+
+        # After an upload the deleted dish is still held by the previous version
+        self.db.sync_menu([dict(row) for row in self.db.get_menu()][:3], label='Upload')
+        self.db.apply_batch([{'op': 'delete', 'id': ids['Hummus Plate']}])
+        self.db.undo_batch()
+        self.assertEqual([row['item'] for row in self.db.search('hummus')], ['Hummus Plate'])
+        self.assert_search_index_intact()
+
+    def test_dish_ids_are_not_reused(self):
+        """TC-DB-30: A deleted dish's ID is never given to a new dish, so undo can't overwrite it."""
+        last = self.db.get_menu()[-1]
+        first = self.db.apply_batch([{'op': 'delete', 'id': last['id']}])
+        second = self.db.apply_batch([{'op': 'add', 'item': 'Baklava', 'ingredients': 'Walnuts, Honey'}])
+        self.assertGreater(second['added'][0], last['id'])
+
+        self.db.undo_batch(first['batch_id'])
+        items = [row['item'] for row in self.db.get_menu()]
+        self.assertIn('Baklava', items)
+        self.assertIn(last['item'], items)
+
+    def test_undo_refuses_out_of_order(self):
+        """TC-DB-31: A batch can't be undone while a later batch on the same dishes stands."""
+        dish_id = self.db.get_menu()[0]['id']
+        first = self.db.apply_batch([{'op': 'update', 'id': dish_id, 'item': 'Falafel Bowl', 'ingredients': 'Chickpeas'}])
+        self.db.apply_batch([{'op': 'update', 'id': dish_id, 'item': 'Falafel Plate', 'ingredients': 'Chickpeas'}])
+        with self.assertRaises(ValueError):
+            self.db.undo_batch(first['batch_id'])
+        self.assertEqual(self.db.get_menu()[0]['item'], 'Falafel Plate')
+
+        self.db.undo_batch()
+        self.db.undo_batch(first['batch_id'])
+        self.assertEqual(self.db.get_menu()[0]['item'], 'Falafel Wrap')
+
+    def test_menu_table_migrated_to_autoincrement(self):
+        """TC-DB-32: An older menu table keeps its dish IDs and stops reusing deleted ones."""
+        path = os.path.join(self.tmp_dir, "old.db")
+        conn = sqlite3.connect(path)
+        conn.execute("CREATE TABLE menu (id INTEGER PRIMARY KEY, item TEXT NOT NULL, ingredients TEXT NOT NULL)")
+        conn.execute("INSERT INTO menu (id, item, ingredients) VALUES (3, 'Greek Salad', 'Feta Cheese')")
+        conn.execute("INSERT INTO menu (id, item, ingredients) VALUES (7, 'Tahini Cookie', 'Tahini, Flour')")
+        conn.commit()
+        conn.close()
+
+        db = MenuDatabase(path)
+        try:
+            self.assertEqual([(row['id'], row['item']) for row in db.get_menu()],
+                             [(3, 'Greek Salad'), (7, 'Tahini Cookie')])
+            self.assertEqual([row['id'] for row in db.search('tahini')], [7])
+            db.delete_dish(7)
+            self.assertEqual(db.add_dish('Baklava', 'Walnuts'), 8)
+            self.assertEqual([row['item'] for row in db.search('feta')], ['Greek Salad'])
+            db.conn.execute("INSERT INTO menu_fts(menu_fts, rank) VALUES ('integrity-check', 1)")
+        finally:
+            db.close()
+
+if __name__ == '__main__':
+    unittest.main()
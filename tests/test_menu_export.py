@@ -0,0 +1,87 @@
+import unittest
+import tempfile
+import shutil
+import gzip
+import csv
+import io
+import sys
+import os
+
+# Add the root project directory to the Python path to allow imports from utils
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.menu_export import iter_csv_chunks, export_menu, StreamSink
+from models.menu_database import MenuDatabase
+
+class RecordingStream:
+    """Writable stream that records each write, like an Android OutputStream."""
+
+    def __init__(self):
+        self.writes = []
+        self.closed = False
+
+    def write(self, data):
+        self.writes.append(data)
+
+    def close(self):
+        self.closed = True
+
+class TestMenuExport(unittest.TestCase):
+
+    def setUp(self):
+        self.rows = [
+            {'id': i, 'item': f'Dish {i}', 'ingredients': ['Rice', 'Beans, "Black"']}
+            for i in range(500)
+        ]
+
+    def test_fixed_size_chunks(self):
+        """TC-EXPORT-01: Every chunk but the last has exactly chunk_size bytes."""
+        chunks = list(iter_csv_chunks(self.rows, chunk_size=1000))
+        self.assertGreater(len(chunks), 1)
+        self.assertTrue(all(len(chunk) == 1000 for chunk in chunks[:-1]))
+        self.assertLessEqual(len(chunks[-1]), 1000)
+
+        parsed = list(csv.DictReader(io.StringIO(b''.join(chunks).decode('utf-8'))))
+        self.assertEqual(len(parsed), 500)
+        self.assertEqual(parsed[0], {'item': 'Dish 0', 'ingredients': 'Rice, Beans, "Black"'})
+
+    def test_gzip_round_trip(self):
+        """TC-EXPORT-02: Compressed output is a valid gzip of the plain CSV."""
+        plain = b''.join(iter_csv_chunks(self.rows))
+        compressed = b''.join(iter_csv_chunks(self.rows, chunk_size=256, compress=True))
+        self.assertEqual(gzip.decompress(compressed), plain)
+        self.assertLess(len(compressed), len(plain))
+
+    def test_stream_sink(self):
+        """TC-EXPORT-03: Stream exports write chunks and close the stream."""
+        stream = RecordingStream()
+        stats = export_menu(iter(self.rows), StreamSink(stream, buffer_type=bytearray), chunk_size=4096)
+        self.assertEqual(stats['rows'], 500)
+        self.assertEqual(stats['bytes'], sum(len(w) for w in stream.writes))
+        self.assertTrue(all(isinstance(w, bytearray) for w in stream.writes))
+        self.assertTrue(stream.closed)
+
+    def test_empty_menu_writes_header(self):
+        """TC-EXPORT-04: An empty menu still exports the header row."""
+        self.assertEqual(b''.join(iter_csv_chunks([])), b'item,ingredients\r\n')
+
+    def test_database_export_to_file(self):
+        """TC-EXPORT-05: MenuDatabase.export_to_csv streams the table to disk."""
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            db = MenuDatabase(os.path.join(tmp_dir, "menu.db"))
+            db.insert_menu(self.rows[:50])
+            path = os.path.join(tmp_dir, "export.csv.gz")
+            stats = db.export_to_csv(path, compress=True)
+            db.close()
+
+            self.assertEqual(stats['rows'], 50)
+            with gzip.open(path, 'rt', encoding='utf-8', newline='') as f:
+                parsed = list(csv.DictReader(f))
+            self.assertEqual(list(parsed[0].keys()), ['id', 'item', 'ingredients'])
+            self.assertEqual(parsed[49]['item'], 'Dish 49')
+        finally:
+            shutil.rmtree(tmp_dir)
+
+if __name__ == '__main__':
+    unittest.main()
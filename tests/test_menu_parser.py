@@ -50,5 +50,14 @@ class TestMenuParser(unittest.TestCase):
         self.assertIsInstance(result, list)
         self.assertEqual(len(result), 0)
 
+    def test_parse_stats(self):
+        """TC-PARSE-05: Test that row, duplicate and empty-ingredient counts are reported."""
+        csv_data = "item,ingredients\nSalad,\"Lettuce, Carrot\"\nBread,\n salad ,Lettuce\nSoup,\" , \""
+        stats = {}
+        result = parse_menu_stream(StringIO(csv_data), stats)
+
+        self.assertEqual(len(result), 4)
+        self.assertEqual(stats, {'rows': 4, 'duplicates': 1, 'empty_ingredients': 2})
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,84 @@
+import unittest
+import tempfile
+import threading
+import shutil
+import sys
+import os
+
+# Add the root project directory to the Python path to allow imports from utils
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils import ocr_api
+from utils.ocr_cache import OcrCache
+from utils.ocr_client import OcrError, OcrCancelled
+from utils.ocr_backends import (
+    FakeOcrBackend, TesseractBackend, OcrSpaceBackend, create_backend, FAKE_TEXT
+)
+
+
+class TestOcrBackends(unittest.TestCase):
+
+    def setUp(self):
+        """Route the OCR pipeline through a fake backend and a temporary cache."""
+        self.tmp_dir = tempfile.mkdtemp()
+        self.image_path = os.path.join(self.tmp_dir, "menu.jpg")
+        with open(self.image_path, 'wb') as f:
+            f.write(b'\xff\xd8 not really a jpeg')
+        self.backend = FakeOcrBackend()
+        ocr_api.set_backend(self.backend)
+        self.saved_cache = ocr_api._cache
+        ocr_api._cache = OcrCache(os.path.join(self.tmp_dir, "ocr_cache.db"))
+
+    def tearDown(self):
+        ocr_api._cache.close()
+        ocr_api._cache = self.saved_cache
+        ocr_api.set_backend(None)
+        shutil.rmtree(self.tmp_dir)
+
+    def test_pipeline_runs_offline(self):
+        """TC-BACKEND-01: The fake backend drives extraction without network or API key."""
+        csv_text = ocr_api.text_to_csv(ocr_api.process_image_ocr(self.image_path))
+        self.assertEqual(csv_text.split('\n')[1], '"Hummus","Chickpeas, Tahini, Garlic"')
+        self.assertEqual(self.backend.calls, ["menu.jpg"])
+
+    def test_cache_is_per_backend(self):
+        """TC-BACKEND-02: Results cached for one backend aren't reused for another."""
+        ocr_api.process_image_ocr(self.image_path)
+        ocr_api.process_image_ocr(self.image_path)
+        self.assertEqual(len(self.backend.calls), 1)
+
+        other = FakeOcrBackend(text="Soup - Leek")
+        ocr_api.set_backend(other)
+        self.assertEqual(ocr_api.process_image_ocr(self.image_path), "Soup - Leek")
+        self.assertEqual(len(other.calls), 1)
+
+    def test_fake_backend_cancel(self):
+        """TC-BACKEND-03: The fake backend honours cancellation while waiting."""
+        cancel = threading.Event()
+        cancel.set()
+        with self.assertRaises(OcrCancelled):
+            FakeOcrBackend(delay=5).recognize(b'', "menu.jpg", cancel)
+        self.assertEqual(FakeOcrBackend().recognize(b'', "menu.jpg"), FAKE_TEXT)
+
+    def test_create_backend(self):
+        """TC-BACKEND-04: Backends are created by their config name."""
+        self.assertIsInstance(create_backend("ocr.space"), OcrSpaceBackend)
+        self.assertIsInstance(create_backend("tesseract", language="deu"), TesseractBackend)
+        with self.assertRaises(ValueError):
+            create_backend("abbyy")
+
+    def test_missing_tesseract(self):
+        """TC-BACKEND-05: A missing Tesseract install is reported as an OcrError."""
+        backend = TesseractBackend(command=os.path.join(self.tmp_dir, "tesseract"))
+        self.assertFalse(backend.available())
+        with self.assertRaises(OcrError):
+            backend.recognize(b'', "menu.jpg")
+
+    @unittest.skipUnless(shutil.which("tesseract"), "Tesseract is not installed")
+    def test_tesseract_reports_bad_image(self):
+        """TC-BACKEND-06: Tesseract failures surface its error output."""
+        with self.assertRaises(OcrError):
+            TesseractBackend().recognize(b'not an image', "menu.jpg")
+
+if __name__ == '__main__':
+    unittest.main()
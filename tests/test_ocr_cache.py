@@ -0,0 +1,59 @@
+import unittest
+import tempfile
+import shutil
+import time
+import sys
+import os
+
+# Add the root project directory to the Python path to allow imports from utils
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.ocr_cache import OcrCache, cache_key
+
+OPTIONS = {"language": "eng", "isTable": True, "OCREngine": 2}
+
+class TestOcrCache(unittest.TestCase):
+
+    def setUp(self):
+        """Create a cache in a temporary directory for each test."""
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, "ocr_cache.db")
+        self.cache = OcrCache(self.path, max_bytes=100)
+
+    def tearDown(self):
+        self.cache.close()
+        shutil.rmtree(self.tmp_dir)
+
+    def test_key_covers_content_and_options(self):
+        """TC-CACHE-01: Keys change with the image bytes and the OCR options."""
+        key = cache_key(b'photo', OPTIONS)
+        self.assertEqual(key, cache_key(b'photo', dict(reversed(list(OPTIONS.items())))))
+        self.assertNotEqual(key, cache_key(b'photo2', OPTIONS))
+        self.assertNotEqual(key, cache_key(b'photo', dict(OPTIONS, OCREngine=1)))
+
+    def test_results_persist(self):
+        """TC-CACHE-02: A stored result survives reopening the cache."""
+        key = cache_key(b'photo', OPTIONS)
+        self.assertIsNone(self.cache.get(key))
+        self.cache.put(key, "Hummus - Chickpeas")
+        self.cache.close()
+        self.cache = OcrCache(self.path, max_bytes=100)
+        self.assertEqual(self.cache.get(key), "Hummus - Chickpeas")
+
+    def test_lru_eviction(self):
+        """TC-CACHE-03: Least recently used entries are evicted to stay within the size bound."""
+        for name in ('a', 'b', 'c'):
+            self.cache.put(name, name * 40)
+            time.sleep(0.01)
+        # 'a' and 'b' don't both fit next to 'c'; the older one goes
+        self.assertIsNone(self.cache.get('a'))
+
+        self.cache.get('b')
+        time.sleep(0.01)
+        self.cache.put('d', 'd' * 40)
+        self.assertEqual(self.cache.get('b'), 'b' * 40)
+        self.assertIsNone(self.cache.get('c'))
+        self.assertLessEqual(self.cache.size(), 100)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,131 @@
+import unittest
+import tempfile
+import threading
+import shutil
+import json
+import time
+import sys
+import os
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add the root project directory to the Python path to allow imports from utils
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.ocr_client import OcrClient, OcrError, OcrCancelled
+
+PARSED = {"ParsedResults": [{"ParsedText": "Hummus - Chickpeas, Tahini"}]}
+
+
+class StubOcrHandler(BaseHTTPRequestHandler):
+    """Answers each POST with the next scripted (status, body, delay) response."""
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers['Content-Length']))
+        server = self.server
+        server.clients.append(self.client_address)
+        status, body, delay = server.responses.pop(0) if server.responses else (200, PARSED, 0)
+        time.sleep(delay)
+        data = json.dumps(body).encode('utf-8')
+        try:
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+        except OSError:
+            pass
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestOcrClient(unittest.TestCase):
+
+    def setUp(self):
+        """Start a stub OCR server and write a small image file."""
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), StubOcrHandler)
+        self.server.daemon_threads = True
+        self.server.responses = []
+        self.server.clients = []
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+        self.tmp_dir = tempfile.mkdtemp()
+        self.image_path = os.path.join(self.tmp_dir, "menu.jpg")
+        with open(self.image_path, 'wb') as f:
+            f.write(b'\xff\xd8 not really a jpeg')
+
+        self.scheduled = []
+        self.client = OcrClient(
+            url=f"http://127.0.0.1:{self.server.server_address[1]}/parse/image",
+            timeout=(1, 0.5), retries=2, backoff=0.01,
+            schedule=lambda func, timeout: self.scheduled.append(func)
+        )
+
+    def tearDown(self):
+        self.client.close()
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.tmp_dir)
+
+    def test_recognize_reuses_connection(self):
+        """TC-OCR-01: Requests return the parsed text over one keep-alive connection."""
+        self.assertEqual(self.client.recognize(self.image_path, "key"), "Hummus - Chickpeas, Tahini")
+        self.client.recognize(self.image_path, "key")
+        self.assertEqual(len(self.server.clients), 2)
+        self.assertEqual(len(set(self.server.clients)), 1)
+
+    def test_retries_server_errors(self):
+        """TC-OCR-02: 5xx responses and read timeouts are retried."""
+        self.server.responses = [(503, {}, 0), (200, PARSED, 1)]
+        self.assertEqual(self.client.recognize(self.image_path, "key"), "Hummus - Chickpeas, Tahini")
+        self.assertEqual(len(self.server.clients), 3)
+
+    def test_gives_up_after_retries(self):
+        """TC-OCR-03: Persistent failures raise after the retry budget."""
+        self.server.responses = [(500, {}, 0)] * 5
+        with self.assertRaises(OcrError):
+            self.client.recognize(self.image_path, "key")
+        self.assertEqual(len(self.server.clients), 3)
+
+    def test_client_errors_are_not_retried(self):
+        """TC-OCR-04: 4xx responses and processing errors fail immediately."""
+        self.server.responses = [(403, {}, 0)]
+        with self.assertRaises(OcrError):
+            self.client.recognize(self.image_path, "key")
+        self.server.responses = [(200, {"IsErroredOnProcessing": True, "ErrorMessage": ["Bad image"]}, 0)]
+        with self.assertRaisesRegex(OcrError, "Bad image"):
+            self.client.recognize(self.image_path, "key")
+        self.assertEqual(len(self.server.clients), 2)
+
+    def test_submit_delivers_callback(self):
+        """TC-OCR-05: submit runs off the calling thread and reports back."""
+        results = []
+        job = self.client.submit(self.client.recognize, self.image_path, "key",
+                                 callback=lambda result, error: results.append((result, error)))
+        job.result(timeout=5)
+        while not self.scheduled:
+            time.sleep(0.01)
+        self.scheduled.pop(0)(0)
+        self.assertEqual(results, [("Hummus - Chickpeas, Tahini", None)])
+
+    def test_cancel_during_backoff(self):
+        """TC-OCR-06: A cancelled job stops retrying and skips its callback."""
+        self.client.backoff = 5
+        self.server.responses = [(503, {}, 0)]
+        results = []
+        job = self.client.submit(self.client.recognize, self.image_path, "key",
+                                 callback=lambda result, error: results.append((result, error)))
+        while not self.server.clients:
+            time.sleep(0.01)
+        started = time.monotonic()
+        job.cancel()
+        with self.assertRaises(OcrCancelled):
+            job.result(timeout=5)
+        self.assertLess(time.monotonic() - started, 2)
+        for func in self.scheduled:
+            func(0)
+        self.assertEqual(results, [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,139 @@
+import unittest
+import tempfile
+import threading
+import shutil
+import time
+import sys
+import os
+
+# Add the root project directory to the Python path to allow imports from utils
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils import ocr_api
+from utils.ocr_cache import OcrCache
+from utils.ocr_client import OcrCancelled
+from utils.ocr_backends import FakeOcrBackend
+from utils.ocr_limits import TokenBucket, SingleFlight, OcrUsage
+
+
+class TestOcrLimits(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.usage_path = os.path.join(self.tmp_dir, "ocr_usage.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_token_bucket_refills(self):
+        """TC-LIMIT-01: The bucket allows a burst, then one request per refill interval."""
+        now = [0.0]
+        bucket = TokenBucket(rate=2, capacity=3, clock=lambda: now[0])
+        self.assertEqual([bucket.try_acquire() for _ in range(4)], [True, True, True, False])
+        now[0] += 0.5
+        self.assertTrue(bucket.try_acquire())
+        self.assertFalse(bucket.try_acquire())
+        now[0] += 100
+        self.assertEqual(sum(bucket.try_acquire() for _ in range(5)), 3)
+
+    def test_token_bucket_waits_and_cancels(self):
+        """TC-LIMIT-02: acquire blocks until a token is free and stops when cancelled."""
+        bucket = TokenBucket(rate=20, capacity=1)
+        self.assertLess(bucket.acquire(), 0.01)
+        self.assertGreater(bucket.acquire(), 0.02)
+
+        slow = TokenBucket(rate=0.01, capacity=1)
+        slow.acquire()
+        cancel = threading.Event()
+        threading.Timer(0.05, cancel.set).start()
+        with self.assertRaises(OcrCancelled):
+            slow.acquire(cancel)
+
+    def test_single_flight_coalesces(self):
+        """TC-LIMIT-03: Concurrent calls with the same key share one execution."""
+        flight = SingleFlight()
+        calls = []
+        release = threading.Event()
+
+        def work():
+            calls.append(1)
+            release.wait(5)
+            return "text"
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(flight.do("key", work)))
+                   for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        while flight.in_flight() == 0:
+            time.sleep(0.01)
+        time.sleep(0.05)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+        self.assertEqual(calls, [1])
+        self.assertEqual(results, ["text"] * 4)
+        self.assertEqual(flight.in_flight(), 0)
+
+    def test_usage_persists_per_month(self):
+        """TC-LIMIT-04: Usage survives a restart, resets each month and warns near the quota."""
+        month = [time.strptime("2026-10-15", "%Y-%m-%d")]
+        usage = OcrUsage(self.usage_path, quota=10, now=lambda: month[0])
+        for _ in range(8):
+            usage.record()
+        self.assertIsNone(usage.warning())
+        usage.record()
+
+        reopened = OcrUsage(self.usage_path, quota=10, now=lambda: month[0])
+        self.assertEqual(reopened.used(), 9)
+        self.assertIn("almost used up", reopened.warning())
+        reopened.record()
+        self.assertEqual(reopened.remaining(), 0)
+        self.assertIn("used up", reopened.warning())
+
+        month[0] = time.strptime("2026-11-01", "%Y-%m-%d")
+        self.assertEqual(reopened.used(), 0)
+
+
+class TestOcrPipelineLimits(unittest.TestCase):
+
+    def setUp(self):
+        """Route the OCR pipeline through a slow metered fake backend."""
+        self.tmp_dir = tempfile.mkdtemp()
+        self.image_path = os.path.join(self.tmp_dir, "menu.jpg")
+        with open(self.image_path, 'wb') as f:
+            f.write(b'\xff\xd8 not really a jpeg')
+        self.backend = FakeOcrBackend(delay=0.2, metered=True)
+        ocr_api.set_backend(self.backend)
+        self.saved = (ocr_api._cache, ocr_api._usage)
+        ocr_api._cache = OcrCache(os.path.join(self.tmp_dir, "ocr_cache.db"))
+        ocr_api._usage = OcrUsage(os.path.join(self.tmp_dir, "ocr_usage.json"), quota=2)
+
+    def tearDown(self):
+        ocr_api._cache.close()
+        ocr_api._cache, ocr_api._usage = self.saved
+        ocr_api.set_backend(None)
+        shutil.rmtree(self.tmp_dir)
+
+    def test_duplicate_requests_share_one_call(self):
+        """TC-LIMIT-05: A double tap on the same photo makes one metered request."""
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(ocr_api.process_image_ocr(self.image_path)))
+                   for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+        self.assertEqual(len(self.backend.calls), 1)
+        self.assertEqual(len(set(results)), 1)
+        self.assertEqual(ocr_api._usage.used(), 1)
+
+    def test_quota_exhausted(self):
+        """TC-LIMIT-06: Requests stop once the monthly quota is used up."""
+        ocr_api._usage.record(2)
+        self.assertIsNone(ocr_api.process_image_ocr(self.image_path))
+        self.assertEqual(self.backend.calls, [])
+        self.assertIn("used up", ocr_api.quota_warning())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import unittest
+import threading
+import time
+import sys
+import os
+
+# Add the root project directory to the Python path to allow imports from utils
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.ocr_client import OcrClient
+from utils.ocr_api import MultiPageOcr, merge_page_csv
+
+
+class TestMultiPageOcr(unittest.TestCase):
+
+    def setUp(self):
+        """Create a two-worker client whose callbacks are run by the test."""
+        self.scheduled = []
+        self.client = OcrClient(max_workers=2, schedule=lambda func, timeout: self.scheduled.append(func))
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def tearDown(self):
+        self.client.close()
+
+    def fake_extract(self, image_path, cancel=None):
+        """Pretend OCR: later pages finish first, so completion order differs from page order."""
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(0.05 * (4 - int(image_path)))
+        with self.lock:
+            self.in_flight -= 1
+        return f"item,ingredients\n\"Dish {image_path}\",\"Rice\""
+
+    def run_callbacks(self, ocr, timeout=5):
+        deadline = time.monotonic() + timeout
+        while ocr.finished() < len(ocr.pages) and time.monotonic() < deadline:
+            while self.scheduled:
+                self.scheduled.pop(0)(0)
+            time.sleep(0.01)
+
+    def test_pages_merge_in_order(self):
+        """TC-PAGES-01: Pages run concurrently within the worker limit and merge in page order."""
+        done = []
+        finished_order = []
+        ocr = MultiPageOcr(
+            ["1", "2", "3"], client=self.client, extract=self.fake_extract,
+            on_page=lambda index, page: finished_order.append(index),
+            on_done=lambda csv_text, pages: done.append((csv_text, pages))
+        ).start()
+        self.run_callbacks(ocr)
+
+        self.assertEqual(len(done), 1)
+        csv_text, pages = done[0]
+        self.assertEqual(csv_text, 'item,ingredients\n"Dish 1","Rice"\n"Dish 2","Rice"\n"Dish 3","Rice"')
+        self.assertTrue(all(page['seconds'] > 0 and page['error'] is None for page in pages))
+        self.assertEqual(self.max_in_flight, 2)
+        self.assertNotEqual(finished_order, [0, 1, 2])
+
+    def test_cancel_skips_callbacks(self):
+        """TC-PAGES-02: Cancelling stops queued pages and their callbacks."""
+        done = []
+        ocr = MultiPageOcr(["1", "2", "3"], client=self.client, extract=self.fake_extract,
+                           on_done=lambda csv_text, pages: done.append(csv_text)).start()
+        ocr.cancel()
+        time.sleep(0.3)
+        for func in self.scheduled:
+            func(0)
+        self.assertEqual(done, [])
+        self.assertEqual(ocr.finished(), 0)
+
+    def test_merge_skips_failed_pages(self):
+        """TC-PAGES-03: Failed pages are left out of the merged CSV."""
+        merged = merge_page_csv(['item,ingredients\n"Soup","Leek"\n', None, '"A","B"\n"Tea","Water"'])
+        self.assertEqual(merged, 'item,ingredients\n"Soup","Leek"\n"Tea","Water"')
+
+if __name__ == '__main__':
+    unittest.main()
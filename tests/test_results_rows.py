@@ -0,0 +1,50 @@
+import unittest
+import sys
+import os
+
+# Add the root project directory to the Python path to allow imports from screens
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from screens.results_screen import build_result_rows, HEADER_HEIGHT, ROW_HEIGHT
+
+MENU = [
+    {'item': 'Hummus Plate', 'is_safe': True},
+    {'item': 'Falafel Wrap', 'is_safe': False, 'offending': ['wheat', 'sesame']},
+    {'item': 'Nut [Special]', 'is_safe': False,
+     'offending': ['peanut', 'tree nut', 'dairy', 'egg', 'wheat', 'soy', 'sesame', 'shellfish']},
+]
+
+class TestResultRows(unittest.TestCase):
+
+    def test_sections_and_allergens(self):
+        """TC-RESULTS-01: Safe dishes, then dishes to avoid with the allergens they contain."""
+        rows = build_result_rows(MENU)
+        self.assertEqual(len(rows), 5)
+        self.assertIn("No Allergens Found", rows[0]['text'])
+        self.assertEqual(rows[0]['height'], HEADER_HEIGHT)
+        self.assertIn("Hummus Plate", rows[1]['text'])
+        self.assertIn("Better to Avoid", rows[2]['text'])
+        self.assertIn("(contains wheat, sesame)", rows[3]['text'])
+        # Markup characters in dish names are escaped
+        self.assertIn("Nut &bl;Special&br;", rows[4]['text'])
+
+    def test_only_unsafe_section(self):
+        """TC-RESULTS-02: A section without dishes has no header."""
+        rows = build_result_rows([row for row in MENU if not row['is_safe']])
+        self.assertEqual(len(rows), 3)
+        self.assertIn("Better to Avoid", rows[0]['text'])
+
+    def test_rows_grow_to_show_every_allergen(self):
+        """TC-RESULTS-03: Long allergen lists wrap onto taller rows on narrow screens."""
+        wide = build_result_rows(MENU, width=1000)
+        narrow = build_result_rows(MENU, width=240)
+        self.assertEqual(wide[1]['height'], ROW_HEIGHT)
+        self.assertEqual(narrow[1]['height'], ROW_HEIGHT)
+        self.assertEqual(wide[4]['height'], ROW_HEIGHT)
+        self.assertGreater(narrow[4]['height'], ROW_HEIGHT)
+        self.assertGreater(narrow[4]['height'], narrow[3]['height'])
+        # Before the view has a width every row starts at one line
+        self.assertTrue(all(row['height'] in (HEADER_HEIGHT, ROW_HEIGHT) for row in build_result_rows(MENU)))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+import sys
+import os
+
+# Add the root project directory to the Python path to allow imports from screens
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from kivy.uix.screenmanager import Screen
+from screens.screen_registry import LazyScreenManager
+
+class CountingScreen(Screen):
+    built = []
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        CountingScreen.built.append(self.name)
+
+class TestLazyScreenManager(unittest.TestCase):
+
+    def setUp(self):
+        CountingScreen.built = []
+        self.sm = LazyScreenManager()
+        self.sm.register('login', CountingScreen, next_screens=('landing', 'allergy'))
+        self.sm.register('landing', CountingScreen)
+        self.sm.register('allergy', CountingScreen)
+        self.sm.register('admin_menu', CountingScreen)
+
+    def test_screens_built_on_first_navigation(self):
+        """TC-SCREENS-01: Registering builds nothing; navigating builds only the target."""
+        self.assertEqual(CountingScreen.built, [])
+        self.assertTrue(self.sm.has_screen('admin_menu'))
+        self.assertFalse(self.sm.is_built('admin_menu'))
+
+        self.sm.current = 'login'
+        self.assertEqual(CountingScreen.built, ['login'])
+        self.assertIs(self.sm.current_screen, self.sm.get_screen('login'))
+
+        self.sm.current = 'landing'
+        self.sm.current = 'login'
+        self.assertEqual(CountingScreen.built, ['login', 'landing'])
+        self.assertIn('landing', self.sm.build_times)
+
+    def test_prebuild_next(self):
+        """TC-SCREENS-02: The likely next screens are pre-built once, one at a time."""
+        self.sm.current = 'login'
+        self.sm.prebuild_next('login')
+        self.assertEqual(CountingScreen.built, ['login', 'landing'])
+        self.sm.prebuild_next('login')
+        self.sm.prebuild_next('login')
+        self.assertEqual(CountingScreen.built, ['login', 'landing', 'allergy'])
+        self.assertFalse(self.sm.is_built('admin_menu'))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,139 @@
+import re
+from utils.allergy_filter import ALLERGEN_MAP, category_mask, _expand_allergens, _ingredient_words
+
+# Suggestions offered for a prefix
+MAX_SUGGESTIONS = 4
+
+
+class PrefixTrie:
+    """
+    Prefix tree of words. ``suggest`` walks to the node for the prefix and
+    collects completions depth-first, stopping at ``limit``. Every branch
+    ends in a word, so its cost is the prefix length plus the length of the
+    words returned, whatever the vocabulary size.
+    """
+
+    def __init__(self, words=()):
+        self.root = {}
+        self.size = 0
+        for word in words:
+            self.insert(word)
+
+    def insert(self, word):
+        word = word.strip().lower()
+        if not word:
+            return
+        node = self.root
+        for char in word:
+            node = node.setdefault(char, {})
+        if '' not in node:
+            # The empty key marks the end of a word and holds the word itself
+            node[''] = word
+            self.size += 1
+
+    def __len__(self):
+        return self.size
+
+    def suggest(self, prefix, limit=MAX_SUGGESTIONS):
+        """Returns up to ``limit`` words starting with ``prefix`` in alphabetical order."""
+        node = self.root
+        for char in prefix.strip().lower():
+            node = node.get(char)
+            if node is None:
+                return []
+
+        # Depth-first in character order, so a word comes before its longer
+        # completions (e.g. "soy" before "soya")
+        found = []
+        stack = [node]
+        while stack and len(found) < limit:
+            current = stack.pop()
+            if '' in current:
+                found.append(current[''])
+            stack.extend(current[char] for char in sorted(current, reverse=True) if char)
+        return found
+
+
+def split_allergens(text):
+    """Splits allergen input the way perform_allergy_filter does."""
+    return [a.strip().lower() for a in re.split(r'[,\s]+', text) if a.strip()]
+
+
+class AllergenIndex:
+    """
+    Answers "how many dishes are safe for these allergens?" while the user
+    types. Built once per menu: an inverted index from ingredient word to
+    dish positions, plus a PrefixTrie over the allergen names and terms and
+    the menu's ingredient vocabulary for autocomplete.
+
+    The unsafe dishes of each allergen are cached, so a keystroke only
+    unions cached sets; results match perform_allergy_filter. Given the
+    dishes' stored allergen ``masks`` (in menu order), known categories and
+    terms are answered from those instead of the ingredient words.
+    """
+
+    def __init__(self, menu_data, masks=None):
+        self.size = len(menu_data)
+        self._masks = masks
+        self._postings = {}
+        for position, row in enumerate(menu_data):
+            ingredients = row.get('ingredients', '')
+            ingredients_list = ingredients if isinstance(ingredients, list) else ingredients.split(',')
+            for word in _ingredient_words(ingredients_list):
+                self._postings.setdefault(word, []).append(position)
+        self._unsafe = {}
+
+        self.trie = PrefixTrie(ALLERGEN_MAP)
+        for terms in ALLERGEN_MAP.values():
+            for term in terms:
+                self.trie.insert(term)
+        for word in self._postings:
+            if word.isalpha():
+                self.trie.insert(word)
+
+    def unsafe_for(self, allergen):
+        """Returns the positions of dishes containing ``allergen`` (cached)."""
+        allergen = allergen.lower()
+        unsafe = self._unsafe.get(allergen)
+        if unsafe is None:
+            mask, unmatched = category_mask([allergen])
+            if self._masks is not None and not unmatched:
+                unsafe = frozenset(position for position, dish_mask in enumerate(self._masks) if dish_mask & mask)
+            else:
+                unsafe = frozenset(
+                    position
+                    for term in _expand_allergens([allergen])
+                    for position in self._postings.get(term, ())
+                )
+            self._unsafe[allergen] = unsafe
+        return unsafe
+
+    def is_known(self, word):
+        """True if ``word`` is an allergen category or term, or an ingredient word of the menu."""
+        return not category_mask([word])[1] or word.lower() in self._postings
+
+    def safe_count(self, allergen_input):
+        """
+        Returns the number of dishes safe for every allergen in the input
+        string, or None when it names no allergen.
+
+        A last word still being typed is left out until it is a known
+        allergen or ingredient word, so "pean" doesn't report every dish
+        as safe.
+        """
+        allergens = split_allergens(allergen_input)
+        if allergens and allergen_input[-1] not in ', ' and not self.is_known(allergens[-1]):
+            allergens.pop()
+        if not allergens:
+            return None
+        unsafe = set()
+        for allergen in allergens:
+            unsafe |= self.unsafe_for(allergen)
+        return self.size - len(unsafe)
+
+    def suggest(self, allergen_input, limit=MAX_SUGGESTIONS):
+        """Returns completions for the allergen being typed at the end of the input."""
+        if not allergen_input or allergen_input[-1] in ', ':
+            return []
+        fragment = re.split(r'[,\s]+', allergen_input)[-1]
+        return [word for word in self.trie.suggest(fragment, limit + 1) if word != fragment.lower()][:limit]
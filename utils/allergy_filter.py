@@ -1,4 +1,6 @@
-from utils.error_handler import error_handler
+from utils.error_handler import error_handler, Cancelled
+import hashlib
+import json
 import re
 
 # Attempt to import kivy logger, but create a dummy if it fails.
@@ -40,6 +42,88 @@ for category, terms in ALLERGEN_MAP.items():
     for term in terms:
         REVERSE_ALLERGEN_MAP[term.lower()] = category
 
+# Dishes filtered between checks for cancellation and progress reports
+FILTER_PROGRESS_INTERVAL = 250
+
+
+class FilterCancelled(Cancelled):
+    """Raised by perform_allergy_filter when its ``cancel`` event is set."""
+
+
+# Bit assigned to each allergen category, in ALLERGEN_MAP order. Used for the
+# per-dish allergen mask persisted by MenuDatabase.
+ALLERGEN_BITS = {category: 1 << i for i, category in enumerate(ALLERGEN_MAP)}
+
+
+def allergen_map_signature():
+    """
+    Returns a short hash of ALLERGEN_MAP (including category order), so stored
+    allergen masks can be recomputed when the dictionary changes.
+    """
+    payload = json.dumps(list(ALLERGEN_MAP.items()))
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def _ingredient_words(ingredients_list):
+    """Builds a set of normalized words from all ingredient phrases."""
+    ingredient_words = set()
+    for phrase in ingredients_list:
+        normalized = re.sub(r'[^a-zA-Z0-9 ]', ' ', phrase.lower())
+        ingredient_words.update(normalized.split())
+    return ingredient_words
+
+
+def compute_allergen_mask(ingredients):
+    """
+    Computes the ALLERGEN_BITS mask of every category present in a dish.
+
+    Args:
+        ingredients (str or list): Comma-separated string or list of ingredients.
+
+    Returns:
+        int with one bit set per allergen category found.
+    """
+    ingredients_list = ingredients if isinstance(ingredients, list) else ingredients.split(',')
+    words = _ingredient_words(ingredients_list)
+    # Padded phrases let multi-word terms ("sesame seed") match on word boundaries
+    phrases = [' ' + ' '.join(re.sub(r'[^a-zA-Z0-9 ]', ' ', p.lower()).split()) + ' '
+               for p in ingredients_list]
+
+    mask = 0
+    for category, terms in ALLERGEN_MAP.items():
+        for term in terms:
+            term = term.lower()
+            if term in words or (' ' in term and any(f' {term} ' in p for p in phrases)):
+                mask |= ALLERGEN_BITS[category]
+                break
+    return mask
+
+
+def category_mask(allergens):
+    """
+    Converts allergen names into an ALLERGEN_BITS mask.
+
+    Category names map to their own bit and known ingredient terms map to
+    their parent category (e.g. 'cheese' -> 'milk').
+
+    Returns:
+        tuple of (mask, unmatched) where unmatched lists inputs that are not
+        part of ALLERGEN_MAP and therefore need an ingredient text search.
+    """
+    mask = 0
+    unmatched = []
+    for allergen in allergens:
+        a_lower = allergen.strip().lower()
+        if not a_lower:
+            continue
+        if a_lower in ALLERGEN_BITS:
+            mask |= ALLERGEN_BITS[a_lower]
+        elif a_lower in REVERSE_ALLERGEN_MAP:
+            mask |= ALLERGEN_BITS[REVERSE_ALLERGEN_MAP[a_lower]]
+        else:
+            unmatched.append(a_lower)
+    return mask, unmatched
+
 
 def _expand_allergens(input_allergens):
     """
@@ -62,16 +146,22 @@ def _expand_allergens(input_allergens):
 
 
 @error_handler
-def perform_allergy_filter(menu_data, allergen_input_string):
+def perform_allergy_filter(menu_data, allergen_input_string, cancel=None, progress=None):
     """
     Filters a menu based on user-entered allergens.
 
     Args:
         menu_data (list): A list of menu item dictionaries.
         allergen_input_string (str): Comma- or space-separated string of allergens.
+        cancel (threading.Event): Optional; stops the filter when set.
+        progress (callable): Optional ``progress(done, total)``, called every
+            FILTER_PROGRESS_INTERVAL dishes and once at the end.
 
     Returns:
         list of filtered menu items with flags and offending allergens.
+
+    Raises:
+        FilterCancelled: if ``cancel`` is set before the filter finishes.
     """
     if not allergen_input_string:
         Logger.warning("[AllergyFilter] Allergen input string is empty.")
@@ -83,23 +173,29 @@ def perform_allergy_filter(menu_data, allergen_input_string):
         Logger.warning("[AllergyFilter] No valid allergens provided after parsing.")
         return None
 
+    # Expand each allergen once rather than for every dish
+    expanded = [(user_allergen.lower(), _expand_allergens([user_allergen])) for user_allergen in input_allergens]
+
     filtered_menu = []
-    for row in menu_data:
+    total = len(menu_data)
+    for index, row in enumerate(menu_data):
+        if index % FILTER_PROGRESS_INTERVAL == 0:
+            if cancel is not None and cancel.is_set():
+                raise FilterCancelled("Allergy filter cancelled")
+            if progress is not None:
+                progress(index, total)
+
         ingredients = row.get('ingredients', '')
         ingredients_list = ingredients if isinstance(ingredients, list) else [i.strip() for i in ingredients.split(',')]
 
         # Build a set of normalized words from all ingredient phrases
-        ingredient_words = set()
-        for phrase in ingredients_list:
-            normalized = re.sub(r'[^a-zA-Z0-9 ]', ' ', phrase.lower())
-            ingredient_words.update(normalized.split())
+        ingredient_words = _ingredient_words(ingredients_list)
 
         offending_keywords = set()
-        for user_allergen in input_allergens:
-            expanded_terms = _expand_allergens([user_allergen])
+        for user_allergen, expanded_terms in expanded:
             for term in expanded_terms:
                 if term.lower() in ingredient_words:
-                    offending_keywords.add(user_allergen.lower())
+                    offending_keywords.add(user_allergen)
                     break
 
         filtered_row = {
@@ -110,4 +206,33 @@ def perform_allergy_filter(menu_data, allergen_input_string):
         }
         filtered_menu.append(filtered_row)
 
+    if progress is not None:
+        progress(total, total)
+    return filtered_menu
+
+
+@error_handler
+def perform_category_filter(menu_data, safe_ids):
+    """
+    Filters a menu for allergens that are all ALLERGEN_MAP categories or
+    terms, from the dishes MenuDatabase.safe_dishes found safe for each of
+    them, so no ingredient text is parsed.
+
+    Args:
+        menu_data (list): Menu item dictionaries with their 'id'.
+        safe_ids (dict): Maps each entered allergen to the set of IDs of
+            the dishes without it.
+
+    Returns:
+        list of filtered menu items, as returned by perform_allergy_filter.
+    """
+    filtered_menu = []
+    for row in menu_data:
+        offending = [allergen for allergen, safe in safe_ids.items() if row['id'] not in safe]
+        filtered_menu.append({
+            'item': row.get('item', ''),
+            'ingredients': row.get('ingredients', ''),
+            'offending': offending,
+            'is_safe': not offending
+        })
     return filtered_menu
@@ -0,0 +1,25 @@
+"""
+Lazy access to the Android Java bridge. pyjnius starts (or attaches to) the
+JVM when imported, so it is only imported on the first call that needs a
+Java class, never when a screen module is loaded.
+"""
+
+_jnius = None
+
+
+def _load():
+    global _jnius
+    if _jnius is None:
+        import jnius
+        _jnius = jnius
+    return _jnius
+
+
+def autoclass(name):
+    """Returns the Java class ``name``, see ``jnius.autoclass``."""
+    return _load().autoclass(name)
+
+
+def cast(destination, obj):
+    """Casts a Java object, see ``jnius.cast``."""
+    return _load().cast(destination, obj)
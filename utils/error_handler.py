@@ -11,6 +11,12 @@ except ImportError:
     Logger.error = Logger.error
     Logger.critical = Logger.critical
 
+class Cancelled(Exception):
+    """
+    Base class for exceptions that signal a cancelled operation. They are
+    expected, so error_handler re-raises them without logging an error.
+    """
+
 def error_handler(func):
     """
     Decorator for handling errors in functions.
@@ -31,6 +37,8 @@ def error_handler(func):
                 Logger.info(f"Arguments: {kwargs}")
             
             return func(*args, **kwargs)
+        except Cancelled:
+            raise
         except Exception as e:
             # Log the error
             Logger.error(f"Error in {func.__name__}: {str(e)}")
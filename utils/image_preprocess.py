@@ -0,0 +1,75 @@
+import io
+import time
+from PIL import Image, ImageOps
+
+# Long edge in pixels; menu text stays legible for OCR well below camera resolution
+TARGET_LONG_EDGE = 2000
+
+# OCR.space's free tier rejects uploads over 1 MB
+MAX_UPLOAD_BYTES = 1024 * 1024
+
+# JPEG qualities tried, best first, until the image fits the byte budget
+JPEG_QUALITIES = (85, 75, 65, 50)
+
+# Smallest long edge the budget loop will shrink to
+MIN_LONG_EDGE = 600
+
+
+def _encode_jpeg(image, quality):
+    buffer = io.BytesIO()
+    image.save(buffer, format='JPEG', quality=quality, optimize=True)
+    return buffer.getvalue()
+
+
+def preprocess_image(data, long_edge=TARGET_LONG_EDGE, max_bytes=MAX_UPLOAD_BYTES, grayscale=True):
+    """
+    Prepares a photo for OCR upload: applies the EXIF orientation, downscales
+    it to ``long_edge``, converts it to grayscale, normalizes the contrast
+    and re-encodes it as a JPEG of at most ``max_bytes`` (lowering the
+    quality, then the size, until it fits).
+
+    Args:
+        data (bytes): Encoded image, e.g. a camera JPEG.
+        long_edge (int): Maximum width or height in pixels.
+        max_bytes (int): Byte budget for the result.
+        grayscale (bool): Drop colour, which OCR doesn't need.
+
+    Returns:
+        tuple of (bytes, stats). ``stats`` holds 'bytes_before',
+        'bytes_after', 'bytes_saved', 'seconds' and the final 'size'. If
+        the original is already smaller and within budget, it is returned
+        unchanged.
+
+    Raises:
+        OSError: if the data is not an image Pillow can read.
+    """
+    start = time.perf_counter()
+    image = Image.open(io.BytesIO(data))
+    mode = 'L' if grayscale else 'RGB'
+    # Let the JPEG decoder downscale while decoding, which is much faster
+    # than loading the full-resolution photo
+    image.draft(mode, (long_edge, long_edge))
+    image = ImageOps.exif_transpose(image).convert(mode)
+    if max(image.size) > long_edge:
+        image.thumbnail((long_edge, long_edge), Image.LANCZOS)
+    image = ImageOps.autocontrast(image, cutoff=1)
+
+    while True:
+        for quality in JPEG_QUALITIES:
+            encoded = _encode_jpeg(image, quality)
+            if len(encoded) <= max_bytes:
+                break
+        if len(encoded) <= max_bytes or max(image.size) <= MIN_LONG_EDGE:
+            break
+        image.thumbnail((int(max(image.size) * 0.75),) * 2, Image.LANCZOS)
+
+    if len(data) <= max_bytes and len(data) < len(encoded):
+        encoded = data
+    stats = {
+        'bytes_before': len(data),
+        'bytes_after': len(encoded),
+        'bytes_saved': len(data) - len(encoded),
+        'seconds': time.perf_counter() - start,
+        'size': image.size,
+    }
+    return encoded, stats
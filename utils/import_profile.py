@@ -0,0 +1,94 @@
+"""
+Startup import profiling. Imports a module in a fresh interpreter with
+``python -X importtime`` and parses the timings, so startup regressions
+can be reported and checked against a budget.
+
+Usage:
+    python -m utils.import_profile [module]
+
+The unit tests only check that the deferred modules stay out of startup;
+the time budget is checked on demand, as timings depend on machine load:
+    RUN_IMPORT_BENCHMARK=1 python -m pytest tests/test_import_budget.py
+"""
+import os
+import subprocess
+import sys
+
+# Root of the app, where ``main`` lives
+APP_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Upper bound for importing ``main`` (the work done before the login screen
+# can be built), in seconds. Most of it is Kivy's own startup.
+IMPORT_BUDGET_SECONDS = 2.0
+
+# Modules that must stay out of startup; they load when first needed
+DEFERRED_MODULES = (
+    'jnius',
+    'requests',
+    'kivy.uix.popup',
+    'kivy.uix.recycleview',
+    'screens.upload_screen',
+    'screens.admin_menu',
+    'utils.ocr_api',
+)
+
+
+def profile_imports(module='main', cwd=APP_ROOT):
+    """
+    Imports ``module`` in a new interpreter and returns its import timings.
+
+    Returns:
+        dict with 'total' (seconds to import ``module``), 'modules' (set of
+        every module imported) and 'entries', a list of
+        ``(module, self_seconds, cumulative_seconds, depth)`` in import order.
+
+    Raises:
+        RuntimeError: if the import fails.
+    """
+    env = dict(os.environ, KIVY_NO_ARGS='1', KIVY_NO_CONSOLELOG='1', KIVY_NO_FILELOG='1')
+    process = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=cwd, env=env, capture_output=True, text=True
+    )
+    entries = []
+    errors = []
+    for line in process.stderr.splitlines():
+        if not line.startswith('import time:'):
+            errors.append(line)
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        if not self_us.strip().isdigit():
+            continue  # the column header
+        depth = (len(name) - len(name.lstrip(' '))) // 2
+        entries.append((name.strip(), int(self_us) / 1e6, int(cumulative_us) / 1e6, depth))
+    if process.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n" + "\n".join(errors[-20:]))
+
+    total = next((cumulative for name, _, cumulative, _ in reversed(entries) if name == module), 0.0)
+    return {
+        'total': total,
+        'modules': {name for name, _, _, _ in entries},
+        'entries': entries,
+    }
+
+
+def format_report(profile, top=15):
+    """Returns a text report of the total and the slowest imports."""
+    lines = [f"Total: {profile['total'] * 1000:.0f}ms for {len(profile['entries'])} modules",
+             f"{'cumulative':>12} {'self':>8}  module"]
+    slowest = sorted(profile['entries'], key=lambda entry: entry[2], reverse=True)[:top]
+    for name, self_time, cumulative, depth in slowest:
+        lines.append(f"{cumulative * 1000:>10.1f}ms {self_time * 1000:>6.1f}ms  {name}")
+    return "\n".join(lines)
+
+
+if __name__ == '__main__':
+    profile = profile_imports(sys.argv[1] if len(sys.argv) > 1 else 'main')
+    print(format_report(profile))
+    eager = [name for name in DEFERRED_MODULES if name in profile['modules']]
+    if eager:
+        print(f"Imported at startup but should be deferred: {', '.join(eager)}")
+    over = profile['total'] > IMPORT_BUDGET_SECONDS
+    if over:
+        print(f"Over the {IMPORT_BUDGET_SECONDS:.1f}s import budget")
+    sys.exit(1 if eager or over else 0)
@@ -0,0 +1,118 @@
+import csv
+import io
+import zlib
+
+# Size of the byte chunks handed to export sinks
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+# zlib window bits that produce a gzip container instead of a raw zlib stream
+_GZIP_WBITS = 16 + zlib.MAX_WBITS
+
+
+def _cell(row, column):
+    """Returns a CSV cell for a dish, joining ingredient lists."""
+    value = row[column]
+    if isinstance(value, list):
+        value = ', '.join(value)
+    return value
+
+
+def iter_csv_chunks(rows, columns=('item', 'ingredients'), chunk_size=DEFAULT_CHUNK_SIZE, compress=False):
+    """
+    Encodes dishes as UTF-8 CSV (optionally gzip-compressed) and yields it as
+    byte chunks of exactly ``chunk_size`` bytes; only the last chunk may be
+    shorter. Rows are consumed lazily, so memory use does not grow with the
+    size of the menu.
+
+    Args:
+        rows (iterable): Dish mappings, e.g. from ``MenuDatabase.iter_menu()``.
+        columns (sequence): Keys written, in order, after a header row.
+        chunk_size (int): Size of each yielded chunk in bytes.
+        compress (bool): Gzip the output.
+    """
+    text = io.StringIO()
+    writer = csv.writer(text)
+    compressor = zlib.compressobj(wbits=_GZIP_WBITS) if compress else None
+    pending = bytearray()
+
+    def drain():
+        data = text.getvalue().encode('utf-8')
+        text.seek(0)
+        text.truncate(0)
+        return compressor.compress(data) if compressor else data
+
+    writer.writerow(columns)
+    for row in rows:
+        writer.writerow([_cell(row, column) for column in columns])
+        if text.tell() >= chunk_size:
+            pending += drain()
+            while len(pending) >= chunk_size:
+                yield bytes(pending[:chunk_size])
+                del pending[:chunk_size]
+
+    pending += drain()
+    if compressor:
+        pending += compressor.flush()
+    while pending:
+        yield bytes(pending[:chunk_size])
+        del pending[:chunk_size]
+
+
+class FileSink:
+    """Export sink writing to a local file."""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'wb')
+
+    def write(self, chunk):
+        self._file.write(chunk)
+
+    def close(self):
+        self._file.close()
+
+
+class StreamSink:
+    """
+    Export sink writing to any object with ``write()`` and ``close()``, such
+    as an Android ``OutputStream`` from ``ContentResolver.openOutputStream``.
+    """
+
+    def __init__(self, stream, buffer_type=bytes):
+        """
+        Args:
+            stream: Writable stream object.
+            buffer_type: Type each chunk is converted to before writing; use
+                ``bytearray`` for pyjnius ``byte[]`` parameters.
+        """
+        self.stream = stream
+        self.buffer_type = buffer_type
+
+    def write(self, chunk):
+        self.stream.write(self.buffer_type(chunk))
+
+    def close(self):
+        self.stream.close()
+
+
+def export_menu(rows, sink, columns=('item', 'ingredients'), chunk_size=DEFAULT_CHUNK_SIZE, compress=False):
+    """
+    Streams dishes into ``sink`` as CSV and closes the sink.
+
+    Returns:
+        dict with the number of 'rows' exported and 'bytes' written.
+    """
+    stats = {'rows': 0, 'bytes': 0}
+
+    def counted(source):
+        for row in source:
+            stats['rows'] += 1
+            yield row
+
+    try:
+        for chunk in iter_csv_chunks(counted(rows), columns, chunk_size, compress):
+            sink.write(chunk)
+            stats['bytes'] += len(chunk)
+    finally:
+        sink.close()
+    return stats
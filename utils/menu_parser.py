@@ -11,35 +11,54 @@ import sys
 from utils.error_handler import error_handler
 
 @error_handler
-def parse_menu_file(path):
+def parse_menu_file(path, stats=None):
     Logger.info(f"MenuParser: Parsing menu file from path -- {path}")
     with open(path, newline='', encoding='utf-8') as f:
-        return parse_menu_stream(f)
+        return parse_menu_stream(f, stats)
 
 @error_handler
-def parse_menu_stream(stream):
-    Logger.critical("MenuParser: Entered parse_menu_stream")
+def parse_menu_stream(stream, stats=None):
+    """
+    Parses an "item,ingredients" CSV stream into a list of dishes.
 
+    If ``stats`` is a dict, it is filled while parsing with the number of
+    'rows', 'duplicates' (dish names seen earlier in the file) and
+    'empty_ingredients' (dishes without any ingredient).
+    """
     try:
         if hasattr(stream, "seek"):
             stream.seek(0)
-        if hasattr(stream, "getvalue"):
-            Logger.critical(f"MenuParser: Stream content:\n{stream.getvalue()}")
 
         reader = csv.DictReader(stream)
-        Logger.critical(f"MenuParser: Headers: {reader.fieldnames}")
+        Logger.debug(f"MenuParser: Headers: {reader.fieldnames}")
 
         menu_data = []
+        seen = set()
+        duplicates = 0
+        empty_ingredients = 0
         for row in reader:
-            Logger.critical(f"MenuParser: Row: {row}")
             # Process ingredients into a list if they're comma-separated
             ingredients = row['ingredients'].split(',') if isinstance(row['ingredients'], str) else row['ingredients']
             ingredients = [ing.strip() for ing in ingredients]
+            item = row['item'].strip()
             menu_data.append({
-                'item': row['item'].strip(),
+                'item': item,
                 'ingredients': ingredients
             })
 
+            key = item.casefold()
+            if key in seen:
+                duplicates += 1
+            seen.add(key)
+            if not any(ingredients):
+                empty_ingredients += 1
+
+        Logger.info(
+            f"MenuParser: Parsed {len(menu_data)} rows, {duplicates} duplicates, "
+            f"{empty_ingredients} without ingredients"
+        )
+        if stats is not None:
+            stats.update(rows=len(menu_data), duplicates=duplicates, empty_ingredients=empty_ingredients)
         return menu_data
     except Exception as e:
         Logger.critical(f"MenuParser: Exception: {e}")
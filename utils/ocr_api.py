@@ -1,124 +1,313 @@
 import os
-import json
-import requests
+import time
+from functools import partial
 from kivy.storage.jsonstore import JsonStore
 from kivy.logger import Logger
 from utils.feature_flags import OCR_ENABLED
+from utils.ocr_client import OcrClient, OcrCancelled, OcrError
+from utils.ocr_cache import OcrCache, cache_key
+from utils.ocr_backends import create_backend, DEFAULT_BACKEND
+from utils.ocr_limits import (
+    TokenBucket, SingleFlight, OcrUsage, MONTHLY_QUOTA, REQUESTS_PER_MINUTE, BURST
+)
+from utils.image_preprocess import preprocess_image
 
-def get_api_key():
+def get_config_value(key):
     try:
         store_path = os.path.join("app_data", "config.json")
         if os.path.exists(store_path):
             store = JsonStore(store_path)
-            if store.exists("ocr_key"):
-                return store.get("ocr_key")["value"]
+            if store.exists(key):
+                return store.get(key)["value"]
     except Exception as e:
-        Logger.error(f"Error getting OCR API key: {str(e)}")
+        Logger.error(f"Error reading '{key}' from config: {str(e)}")
     return None
 
-def process_image_ocr(image_path):
+def get_api_key():
+    return get_config_value("ocr_key")
+
+# Shared client, so every request reuses the same keep-alive connections
+_client = None
+
+def get_client():
+    """Returns the shared OcrClient, creating it on first use."""
+    global _client
+    if _client is None:
+        _client = OcrClient()
+    return _client
+
+# Results of earlier OCR requests, keyed by image content and OCR options
+_cache = None
+
+def get_cache():
+    """Returns the shared OcrCache, creating it on first use."""
+    global _cache
+    if _cache is None:
+        _cache = OcrCache(os.path.join("app_data", "ocr_cache.db"))
+    return _cache
+
+# Backend chosen in config, or one installed with set_backend
+_backend = None
+
+def get_backend():
+    """
+    Returns the OCR backend selected by the "ocr_backend" config entry
+    ("ocr.space", "tesseract" or "fake"), creating it on first use.
+    """
+    global _backend
+    if _backend is None:
+        name = get_config_value("ocr_backend") or DEFAULT_BACKEND
+        try:
+            _backend = create_backend(name)
+        except ValueError as e:
+            Logger.error(f"OCR: {str(e)}; using {DEFAULT_BACKEND}")
+            _backend = create_backend(DEFAULT_BACKEND)
+        Logger.info(f"OCR: Using the {_backend.name} backend")
+    return _backend
+
+def set_backend(backend):
+    """Use ``backend`` for every following request; None re-reads the config."""
+    global _backend
+    _backend = backend
+
+# Rate limit and usage counter for metered backends, sized from the
+# "ocr_requests_per_minute" and "ocr_monthly_quota" config entries
+_limiter = None
+_usage = None
+
+def get_limiter():
+    """Returns the shared TokenBucket, creating it on first use."""
+    global _limiter
+    if _limiter is None:
+        per_minute = get_config_value("ocr_requests_per_minute") or REQUESTS_PER_MINUTE
+        _limiter = TokenBucket(per_minute / 60.0, BURST)
+    return _limiter
+
+def get_usage():
+    """Returns the shared OcrUsage, creating it on first use."""
+    global _usage
+    if _usage is None:
+        quota = get_config_value("ocr_monthly_quota") or MONTHLY_QUOTA
+        _usage = OcrUsage(os.path.join("app_data", "ocr_usage.json"), quota)
+    return _usage
+
+def quota_warning():
+    """Returns a warning when the monthly OCR quota is nearly used up, else None."""
+    if not get_backend().metered:
+        return None
+    return get_usage().warning()
+
+# Identical images being recognized right now, keyed like the cache
+_in_flight = SingleFlight()
+
+def prepare_image(data, image_path):
     """
-    Process an image through OCR.space API and return the extracted text.
+    Shrink an image for upload with preprocess_image. Falls back to the
+    original data if it can't be decoded.
+
+    Returns:
+        tuple of (image bytes, file name to upload them as)
+    """
+    name = os.path.splitext(os.path.basename(image_path))[0] + ".jpg"
+    try:
+        processed, stats = preprocess_image(data)
+    except Exception as e:
+        Logger.warning(f"OCR: Uploading original image, preprocessing failed: {str(e)}")
+        return data, os.path.basename(image_path)
+    Logger.info(
+        f"OCR: Preprocessed image {stats['bytes_before']} -> {stats['bytes_after']} bytes "
+        f"(saved {stats['bytes_saved']}) at {stats['size'][0]}x{stats['size'][1]} in {stats['seconds']:.2f}s"
+    )
+    if processed is data:
+        return data, os.path.basename(image_path)
+    return processed, name
+
+def process_image_ocr(image_path, cancel=None):
+    """
+    Process an image through the configured OCR backend and return the
+    extracted text.
     
     Args:
         image_path: Local path to the image file
+        cancel: Optional threading.Event that aborts the request when set
         
     Returns:
         Extracted text or None if an error occurred
     """
-    api_key = get_api_key()
-    if not api_key:
-        Logger.error("OCR API key not found. Please set it in Admin Settings.")
-        return None
-    
     try:
         Logger.info(f"OCR: Processing image: {image_path}")
-        url = "https://api.ocr.space/parse/image"
-        
         with open(image_path, 'rb') as image_file:
-            files = {'file': image_file}
-            payload = {
-                "apikey": api_key,
-                "language": "eng",
-                "isTable": True,
-                "detectOrientation": True,
-                "scale": True,
-                "OCREngine": 2
-            }
-            
-            Logger.info("OCR: Sending request to OCR.space API")
-            response = requests.post(url, files=files, data=payload)
-            
-            if response.status_code != 200:
-                Logger.error(f"OCR: API request failed with status code {response.status_code}")
-                return None
-                
-            result = response.json()
-            
-            if result.get("IsErroredOnProcessing", False):
-                error_message = result.get("ErrorMessage", ["Unknown error"])[0]
-                Logger.error(f"OCR: Processing error: {error_message}")
-                return None
-                
-            if result.get("ParsedResults"):
-                extracted_text = result["ParsedResults"][0].get("ParsedText", "")
-                Logger.info(f"OCR: Successfully extracted {len(extracted_text)} characters")
-                return extracted_text
-            
-            Logger.error(f"OCR: No parsed results found in the response")
-            return None
-            
+            data = image_file.read()
+
+        # The same photo processed again is answered from the cache
+        backend = get_backend()
+        key = cache_key(data, backend.cache_params())
+        cached_text = get_cache().get(key)
+        if cached_text is not None:
+            Logger.info(f"OCR: Cache hit, reusing {len(cached_text)} characters")
+            return cached_text
+
+        # A photo already being recognized (e.g. after a double tap) shares
+        # that request's result
+        return _in_flight.do(key, partial(recognize_image, backend, key, data, image_path, cancel), cancel)
+    except OcrCancelled:
+        raise
     except Exception as e:
         Logger.error(f"OCR: Error processing image: {str(e)}")
         return None
 
-def extract_menu_from_image(image_path):
+def recognize_image(backend, key, data, image_path, cancel=None):
+    """
+    Run one image through ``backend`` and cache the text under ``key``.
+    Metered backends wait for the rate limiter and count against the quota.
+
+    Raises:
+        OcrError: when recognition fails or the monthly quota is used up.
+    """
+    if backend.metered:
+        usage = get_usage()
+        if usage.remaining() <= 0:
+            raise OcrError(usage.warning())
+        waited = get_limiter().acquire(cancel)
+        if waited > 0.01:
+            Logger.info(f"OCR: Rate limited, waited {waited:.2f}s")
+        usage.record()
+
+    image_bytes, filename = prepare_image(data, image_path)
+    extracted_text = backend.recognize(image_bytes, filename, cancel)
+    Logger.info(f"OCR: Successfully extracted {len(extracted_text)} characters")
+    if extracted_text:
+        get_cache().put(key, extracted_text)
+    return extracted_text
+
+def text_to_csv(extracted_text):
+    """
+    Convert OCR text with one "item - ingredients" (or "item: ingredients")
+    line per dish to CSV format.
+    """
+    lines = extracted_text.strip().split('\n')
+    processed_lines = []
+    
+    if not "item" in lines[0].lower() and not "ingredients" in lines[0].lower():
+        processed_lines.append("item,ingredients")
+        
+    for line in lines:
+        if not line.strip():
+            continue
+            
+        if '-' in line:
+            parts = line.split('-', 1)
+            if len(parts) == 2:
+                item = parts[0].strip()
+                ingredients = parts[1].strip()
+                processed_lines.append(f'"{item}","{ingredients}"')
+        elif ':' in line:
+            parts = line.split(':', 1)
+            if len(parts) == 2:
+                item = parts[0].strip()
+                ingredients = parts[1].strip()
+                processed_lines.append(f'"{item}","{ingredients}"')
+        else:
+            processed_lines.append(f'"{line.strip()}",""')
+
+    Logger.info(f"OCR: Converted extracted text to {len(processed_lines) - 1} CSV rows")
+    return '\n'.join(processed_lines)
+
+def extract_menu_from_image(image_path, cancel=None):
     """
     Extract menu data from an image and convert it to CSV format.
     
     Args:
         image_path: Path to the image file
+        cancel: Optional threading.Event that aborts the request when set
         
     Returns:
         CSV-formatted string or None if extraction failed
     """
-    extracted_text = process_image_ocr(image_path)
+    extracted_text = process_image_ocr(image_path, cancel)
     if not extracted_text:
         return None
         
     try:
-        lines = extracted_text.strip().split('\n')
-        processed_lines = []
-        
-        if not "item" in lines[0].lower() and not "ingredients" in lines[0].lower():
-            processed_lines.append("item,ingredients")
-            
-        for line in lines:
-            if not line.strip():
-                continue
-                
-            if '-' in line:
-                parts = line.split('-', 1)
-                if len(parts) == 2:
-                    item = parts[0].strip()
-                    ingredients = parts[1].strip()
-                    processed_lines.append(f'"{item}","{ingredients}"')
-            elif ':' in line:
-                parts = line.split(':', 1)
-                if len(parts) == 2:
-                    item = parts[0].strip()
-                    ingredients = parts[1].strip()
-                    processed_lines.append(f'"{item}","{ingredients}"')
-            else:
-                processed_lines.append(f'"{line.strip()}",""')
-                
-        return '\n'.join(processed_lines), print(f"OCR: Successfully converted extracted text to CSV: {processed_lines}")
+        return text_to_csv(extracted_text)
     except Exception as e:
         Logger.error(f"OCR: Error converting extracted text to CSV: {str(e)}")
         return None
 
+def merge_page_csv(page_csvs):
+    """
+    Merge the CSV of several menu pages, in page order, under a single
+    header. Pages that produced no CSV are skipped.
+    """
+    merged = ["item,ingredients"]
+    for csv_text in page_csvs:
+        if csv_text:
+            merged.extend(line for line in csv_text.split('\n')[1:] if line.strip())
+    return '\n'.join(merged)
+
+class MultiPageOcr:
+    """
+    Runs OCR on the pages of a menu concurrently (at most the OCR client's
+    worker count in flight), reports each page as it finishes and merges
+    their CSV in page order once all are done.
+
+    Callbacks are called on the UI thread:
+        on_page(index, page) after each page, where ``page`` holds the
+            page's 'csv', 'seconds' taken and 'error'.
+        on_done(csv_text, pages) once every page has finished.
+    """
+
+    def __init__(self, image_paths, on_page=None, on_done=None, client=None, extract=None):
+        self.image_paths = list(image_paths)
+        self.on_page = on_page
+        self.on_done = on_done
+        self.client = client
+        self.extract = extract
+        self.pages = [None] * len(self.image_paths)
+        self.jobs = []
+
+    def start(self):
+        client = self.client or get_client()
+        for index, image_path in enumerate(self.image_paths):
+            self.jobs.append(client.submit(
+                self._extract_page, image_path, callback=partial(self._page_finished, index)
+            ))
+        return self
+
+    def _extract_page(self, image_path, cancel=None):
+        start = time.perf_counter()
+        extract = self.extract or extract_menu_from_image
+        csv_text = extract(image_path, cancel)
+        return csv_text, time.perf_counter() - start
+
+    def _page_finished(self, index, result, error):
+        csv_text, seconds = result if result else (None, None)
+        self.pages[index] = {'csv': csv_text, 'seconds': seconds, 'error': error}
+        Logger.info(f"OCR: Page {index + 1}/{len(self.pages)} finished in {seconds or 0:.2f}s")
+        if self.on_page:
+            self.on_page(index, self.pages[index])
+        if all(page is not None for page in self.pages) and self.on_done:
+            self.on_done(merge_page_csv(page['csv'] for page in self.pages), self.pages)
+
+    def finished(self):
+        return sum(page is not None for page in self.pages)
+
+    def cancel(self):
+        """Cancel every page still queued or running."""
+        for job in self.jobs:
+            job.cancel()
+
+def extract_menu_pages_async(image_paths, on_page=None, on_done=None):
+    """
+    Run extract_menu_from_image on several pages concurrently.
+
+    Returns:
+        the started MultiPageOcr, which can be cancelled
+    """
+    return MultiPageOcr(image_paths, on_page, on_done).start()
+
 if not OCR_ENABLED:
-    def extract_menu_from_image(image_path):
+    def extract_menu_from_image(image_path, cancel=None):
         """Stub implementation used when OCR is disabled."""
         Logger.warning("OCR feature flag is disabled. 'extract_menu_from_image' will return None.")
         return None
\ No newline at end of file
@@ -0,0 +1,153 @@
+import time
+import shutil
+import threading
+import subprocess
+from utils.ocr_client import OcrError, OcrCancelled, OCR_OPTIONS
+
+# Backend used when none is configured
+DEFAULT_BACKEND = "ocr.space"
+
+# Seconds a local Tesseract run may take before it is killed
+TESSERACT_TIMEOUT = 60
+
+# How often a running Tesseract process checks for cancellation
+CANCEL_POLL_INTERVAL = 0.1
+
+# Text returned by the fake backend unless told otherwise
+FAKE_TEXT = "Hummus - Chickpeas, Tahini, Garlic\nFalafel - Chickpeas, Parsley, Sesame"
+
+
+class OcrBackend:
+    """
+    Turns an encoded image into text. Subclasses implement ``recognize``;
+    ``options`` holds whatever affects the result, so results cached for one
+    backend or configuration are never returned for another. Requests to a
+    ``metered`` backend count against the monthly quota and are rate limited.
+    """
+    name = None
+    metered = False
+
+    def __init__(self, **options):
+        self.options = options
+
+    def cache_params(self):
+        """Returns the parameters the OCR cache key is built from."""
+        return dict(self.options, backend=self.name)
+
+    def recognize(self, image_bytes, filename, cancel=None):
+        """
+        Returns the text found in the image.
+
+        Raises:
+            OcrError: when recognition fails.
+            OcrCancelled: when ``cancel`` (a threading.Event) is set.
+        """
+        raise NotImplementedError
+
+
+class OcrSpaceBackend(OcrBackend):
+    """The OCR.space web API, through the shared pooled OcrClient."""
+    name = "ocr.space"
+    metered = True
+
+    def __init__(self, client=None, api_key=None):
+        super().__init__(**OCR_OPTIONS)
+        self.client = client
+        self.api_key = api_key
+
+    def recognize(self, image_bytes, filename, cancel=None):
+        from utils.ocr_api import get_api_key, get_client
+        api_key = self.api_key or get_api_key()
+        if not api_key:
+            raise OcrError("OCR API key not found. Please set it in Admin Settings.")
+        client = self.client or get_client()
+        return client.recognize_bytes(image_bytes, filename, api_key, cancel)
+
+
+class TesseractBackend(OcrBackend):
+    """
+    A local Tesseract install, run as a subprocess. Needs no network or API
+    key; the image is piped through stdin and the text read from stdout.
+    """
+    name = "tesseract"
+
+    def __init__(self, command="tesseract", language="eng", psm=6, timeout=TESSERACT_TIMEOUT):
+        super().__init__(language=language, psm=psm)
+        self.command = command
+        self.timeout = timeout
+
+    def available(self):
+        """Returns True if the Tesseract executable can be found."""
+        return shutil.which(self.command) is not None
+
+    def recognize(self, image_bytes, filename, cancel=None):
+        cancel = cancel or threading.Event()
+        args = [self.command, "stdin", "stdout",
+                "-l", self.options['language'], "--psm", str(self.options['psm'])]
+        try:
+            process = subprocess.Popen(args, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                       stderr=subprocess.PIPE)
+        except OSError as e:
+            raise OcrError(f"Could not run Tesseract ({self.command}): {e}") from e
+
+        deadline = time.monotonic() + self.timeout
+        data = image_bytes
+        while True:
+            try:
+                stdout, stderr = process.communicate(data, timeout=CANCEL_POLL_INTERVAL)
+                break
+            except subprocess.TimeoutExpired:
+                # Input is only sent once; later calls just keep reading
+                data = None
+                if cancel.is_set() or time.monotonic() > deadline:
+                    process.kill()
+                    process.communicate()
+                    if cancel.is_set():
+                        raise OcrCancelled("OCR request cancelled")
+                    raise OcrError(f"Tesseract did not finish within {self.timeout}s")
+
+        if process.returncode != 0:
+            message = stderr.decode('utf-8', 'replace').strip() or f"exit code {process.returncode}"
+            raise OcrError(f"Tesseract failed: {message}")
+        return stdout.decode('utf-8', 'replace')
+
+
+class FakeOcrBackend(OcrBackend):
+    """
+    Deterministic backend for tests and benchmarks: returns ``text`` for
+    every image after an optional ``delay``, and records each call. Set
+    ``metered`` to exercise the rate limiter and quota.
+    """
+    name = "fake"
+
+    def __init__(self, text=FAKE_TEXT, delay=0, metered=False):
+        super().__init__(text=text)
+        self.delay = delay
+        self.metered = metered
+        self.calls = []
+
+    def recognize(self, image_bytes, filename, cancel=None):
+        cancel = cancel or threading.Event()
+        self.calls.append(filename)
+        if cancel.wait(self.delay) if self.delay else cancel.is_set():
+            raise OcrCancelled("OCR request cancelled")
+        return self.options['text']
+
+
+BACKENDS = {
+    OcrSpaceBackend.name: OcrSpaceBackend,
+    TesseractBackend.name: TesseractBackend,
+    FakeOcrBackend.name: FakeOcrBackend,
+}
+
+
+def create_backend(name, **kwargs):
+    """
+    Creates the backend registered under ``name``.
+
+    Raises:
+        ValueError: if no backend has that name.
+    """
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown OCR backend '{name}'. Choose one of: {', '.join(BACKENDS)}")
+    return BACKENDS[name](**kwargs)
@@ -0,0 +1,90 @@
+import os
+import json
+import time
+import hashlib
+import sqlite3
+import threading
+
+# Upper bound for the text stored in the cache
+DEFAULT_MAX_BYTES = 5 * 1024 * 1024
+
+
+def cache_key(image_bytes, params):
+    """
+    Returns the cache key for an image: a SHA-256 of its content and of the
+    OCR parameters (language, engine, table mode...) that affect the result.
+    """
+    digest = hashlib.sha256(image_bytes)
+    digest.update(b'\0')
+    digest.update(json.dumps(params, sort_keys=True).encode('utf-8'))
+    return digest.hexdigest()
+
+
+class OcrCache:
+    """
+    Persistent cache of OCR results in a small SQLite file, so the same
+    photo is never sent to the OCR service twice. When the stored text
+    exceeds ``max_bytes``, the least recently used entries are evicted.
+
+    Safe to use from the OCR worker threads.
+    """
+
+    def __init__(self, path="app_data/ocr_cache.db", max_bytes=DEFAULT_MAX_BYTES):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        with self.conn:
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS ocr_results (
+                    key TEXT PRIMARY KEY,
+                    text TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    last_used REAL NOT NULL
+                )
+            """)
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_ocr_results_last_used ON ocr_results (last_used)"
+            )
+
+    def get(self, key):
+        """Returns the cached text for ``key`` and marks it as recently used, or None."""
+        with self._lock, self.conn:
+            row = self.conn.execute("SELECT text FROM ocr_results WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self.conn.execute("UPDATE ocr_results SET last_used = ? WHERE key = ?", (time.time(), key))
+            return row[0]
+
+    def put(self, key, text):
+        """Stores a result, then evicts least recently used entries beyond ``max_bytes``."""
+        size = len(text.encode('utf-8'))
+        with self._lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO ocr_results (key, text, size, last_used) VALUES (?, ?, ?, ?)",
+                (key, text, size, time.time())
+            )
+            total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM ocr_results").fetchone()[0]
+            if total <= self.max_bytes:
+                return
+            cursor = self.conn.execute("SELECT key, size FROM ocr_results ORDER BY last_used")
+            evicted = []
+            for old_key, old_size in cursor:
+                if total <= self.max_bytes:
+                    break
+                evicted.append((old_key,))
+                total -= old_size
+            self.conn.executemany("DELETE FROM ocr_results WHERE key = ?", evicted)
+
+    def size(self):
+        """Returns the number of bytes of text stored."""
+        with self._lock:
+            return self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM ocr_results").fetchone()[0]
+
+    def clear(self):
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM ocr_results")
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,203 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from requests.adapters import HTTPAdapter
+
+OCR_SPACE_URL = "https://api.ocr.space/parse/image"
+
+# Seconds to wait for the connection and for the response. OCR of a large
+# photo can take a while, but never hang forever.
+CONNECT_TIMEOUT = 5
+READ_TIMEOUT = 60
+
+# Retries after the first attempt, with exponential backoff between them
+MAX_RETRIES = 3
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 8
+
+# Responses worth retrying: rate limiting and server-side failures
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Requests in flight at once; more pages wait in the queue
+MAX_CONCURRENT_REQUESTS = 3
+
+# OCR.space request parameters, sent with every image
+OCR_OPTIONS = {
+    "language": "eng",
+    "isTable": True,
+    "detectOrientation": True,
+    "scale": True,
+    "OCREngine": 2
+}
+
+
+class OcrError(Exception):
+    """Raised when OCR fails after all retries or the service reports an error."""
+
+
+class OcrCancelled(OcrError):
+    """Raised inside a job that was cancelled."""
+
+
+class OcrJob:
+    """
+    A running OCR request. Wraps the ``concurrent.futures.Future`` of the
+    call and can be cancelled while waiting to run, between retries or
+    while a response is being read (its result is then discarded).
+    """
+
+    def __init__(self):
+        self.future = None
+        self._cancel = threading.Event()
+
+    def cancel(self):
+        """Cancels the job; its callback won't be called."""
+        self._cancel.set()
+        if self.future is not None:
+            self.future.cancel()
+
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def result(self, timeout=None):
+        """Waits for and returns the extracted text, raising OcrError on failure."""
+        return self.future.result(timeout)
+
+
+class OcrClient:
+    """
+    Client for the OCR.space API.
+
+    Requests share one keep-alive ``requests.Session``, use connect/read
+    timeouts and are retried with exponential backoff on connection errors,
+    timeouts and retryable HTTP statuses. ``submit`` runs them on a worker
+    thread so the UI never waits on the network.
+    """
+
+    def __init__(self, url=OCR_SPACE_URL, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT), retries=MAX_RETRIES,
+                 backoff=BACKOFF_BASE, backoff_max=BACKOFF_MAX, max_workers=MAX_CONCURRENT_REQUESTS,
+                 schedule=None):
+        """
+        Args:
+            url (str): OCR endpoint.
+            timeout (tuple): ``(connect, read)`` timeouts in seconds.
+            retries (int): Retries after the first attempt.
+            backoff (float): Delay before the first retry; doubles every retry.
+            backoff_max (float): Upper bound for a single delay.
+            max_workers (int): Concurrent requests (and pooled connections).
+            schedule: ``schedule(func, timeout)`` used to deliver callbacks;
+                defaults to ``Clock.schedule_once``.
+        """
+        self.url = url
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.backoff_max = backoff_max
+        self._schedule = schedule
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ocr")
+
+    def _retry_delay(self, attempt, response=None):
+        """Returns the delay before retry number ``attempt`` (1-based)."""
+        delay = self.backoff * 2 ** (attempt - 1)
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after and retry_after.isdigit():
+            delay = max(delay, int(retry_after))
+        return min(delay, self.backoff_max)
+
+    def post(self, image_bytes, filename, payload, cancel=None):
+        """
+        Posts an image and returns the decoded JSON response, retrying
+        transient failures. Blocks; use ``submit`` from the UI thread.
+
+        Raises:
+            OcrError: when the request keeps failing or gets a non-retryable status.
+            OcrCancelled: when ``cancel`` (a threading.Event) is set.
+        """
+        cancel = cancel or threading.Event()
+        attempt = 0
+        while True:
+            if cancel.is_set():
+                raise OcrCancelled("OCR request cancelled")
+            response = None
+            try:
+                response = self.session.post(
+                    self.url,
+                    files={'file': (filename, image_bytes)},
+                    data=payload,
+                    timeout=self.timeout
+                )
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = e
+            else:
+                if response.status_code == 200:
+                    if cancel.is_set():
+                        raise OcrCancelled("OCR request cancelled")
+                    return response.json()
+                error = OcrError(f"OCR request failed with status code {response.status_code}")
+                if response.status_code not in RETRY_STATUSES:
+                    raise error
+
+            attempt += 1
+            if attempt > self.retries:
+                raise OcrError(f"OCR request failed after {attempt} attempts: {error}") from error
+            if cancel.wait(self._retry_delay(attempt, response)):
+                raise OcrCancelled("OCR request cancelled")
+
+    def recognize(self, image_path, api_key, cancel=None):
+        """
+        Runs OCR on an image file and returns the extracted text.
+
+        Raises:
+            OcrError: when the request fails or the service reports an error.
+        """
+        with open(image_path, 'rb') as image_file:
+            image_bytes = image_file.read()
+        return self.recognize_bytes(image_bytes, os.path.basename(image_path), api_key, cancel)
+
+    def recognize_bytes(self, image_bytes, filename, api_key, cancel=None):
+        """Runs OCR on an encoded image and returns the extracted text."""
+        payload = dict(OCR_OPTIONS, apikey=api_key)
+        result = self.post(image_bytes, filename, payload, cancel)
+
+        if result.get("IsErroredOnProcessing", False):
+            raise OcrError(f"Processing error: {(result.get('ErrorMessage') or ['Unknown error'])[0]}")
+        if not result.get("ParsedResults"):
+            raise OcrError("No parsed results found in the response")
+        return result["ParsedResults"][0].get("ParsedText", "")
+
+    def submit(self, func, *args, callback=None):
+        """
+        Runs ``func(*args, cancel=event)`` on an OCR worker thread and returns
+        an OcrJob. ``callback(result, error)`` is delivered on the UI thread
+        unless the job was cancelled.
+        """
+        job = OcrJob()
+        job.future = self._executor.submit(func, *args, cancel=job._cancel)
+        job.future.add_done_callback(lambda future: self._deliver(job, callback))
+        return job
+
+    def _deliver(self, job, callback):
+        if callback is None:
+            return
+
+        def on_ui_thread(dt):
+            if job.cancelled() or job.future.cancelled():
+                return
+            error = job.future.exception()
+            callback(None if error else job.future.result(), error)
+
+        schedule = self._schedule
+        if schedule is None:
+            from kivy.clock import Clock
+            schedule = Clock.schedule_once
+        schedule(on_ui_thread, 0)
+
+    def close(self):
+        """Cancels queued requests and closes the pooled connections."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self.session.close()
@@ -0,0 +1,168 @@
+import os
+import time
+import threading
+from concurrent.futures import Future
+from kivy.storage.jsonstore import JsonStore
+from utils.ocr_client import OcrCancelled
+
+# OCR.space free tier allowance per month
+MONTHLY_QUOTA = 25000
+
+# Sustained request rate and the burst allowed on top of it
+REQUESTS_PER_MINUTE = 30
+BURST = 5
+
+# Share of the monthly quota after which the app warns
+QUOTA_WARNING_RATIO = 0.9
+
+# How often a waiting caller checks for cancellation
+CANCEL_POLL_INTERVAL = 0.1
+
+
+class TokenBucket:
+    """
+    Token-bucket rate limiter: ``rate`` tokens per second accumulate up to
+    ``capacity``, and each request takes one. Thread-safe.
+    """
+
+    def __init__(self, rate, capacity, clock=time.monotonic):
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._tokens = float(capacity)
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self):
+        """Takes a token if one is available. Returns True on success."""
+        with self._lock:
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+    def acquire(self, cancel=None):
+        """
+        Waits for a token and takes it.
+
+        Returns:
+            float: seconds spent waiting.
+
+        Raises:
+            OcrCancelled: when ``cancel`` (a threading.Event) is set while waiting.
+        """
+        cancel = cancel or threading.Event()
+        start = time.monotonic()
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return time.monotonic() - start
+                delay = (1 - self._tokens) / self.rate
+            if cancel.wait(delay):
+                raise OcrCancelled("OCR request cancelled")
+
+
+class SingleFlight:
+    """
+    Coalesces duplicate work: while ``do(key, func)`` runs for a key, other
+    callers with the same key wait for and share its result instead of
+    calling ``func`` again.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights = {}
+
+    def in_flight(self):
+        with self._lock:
+            return len(self._flights)
+
+    def do(self, key, func, cancel=None):
+        """
+        Returns ``func()``, or the result of the identical call already running.
+
+        A caller that is cancelled stops waiting; if the call it was waiting
+        on was cancelled instead, it runs the work itself.
+        """
+        cancel = cancel or threading.Event()
+        while True:
+            with self._lock:
+                future = self._flights.get(key)
+                leader = future is None
+                if leader:
+                    future = self._flights[key] = Future()
+
+            if leader:
+                try:
+                    result = func()
+                except BaseException as e:
+                    future.set_exception(e)
+                    raise
+                else:
+                    future.set_result(result)
+                    return result
+                finally:
+                    with self._lock:
+                        del self._flights[key]
+
+            while not future.done():
+                if cancel.wait(CANCEL_POLL_INTERVAL):
+                    raise OcrCancelled("OCR request cancelled")
+            error = future.exception()
+            if isinstance(error, OcrCancelled):
+                continue
+            if error is not None:
+                raise error
+            return future.result()
+
+
+class OcrUsage:
+    """
+    Counts OCR requests per calendar month in a small JSON store, so usage
+    survives restarts and the app can warn before the quota runs out.
+    """
+
+    def __init__(self, path=os.path.join("app_data", "ocr_usage.json"), quota=MONTHLY_QUOTA,
+                 now=time.localtime):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.quota = quota
+        self._now = now
+        self._lock = threading.Lock()
+        self.store = JsonStore(path)
+
+    def _month(self):
+        return time.strftime("%Y-%m", self._now())
+
+    def used(self):
+        """Returns the requests made this month."""
+        with self._lock:
+            month = self._month()
+            return self.store.get(month)["requests"] if self.store.exists(month) else 0
+
+    def remaining(self):
+        return max(0, self.quota - self.used())
+
+    def record(self, count=1):
+        """Adds ``count`` requests to this month's total and returns it."""
+        with self._lock:
+            month = self._month()
+            total = (self.store.get(month)["requests"] if self.store.exists(month) else 0) + count
+            self.store.put(month, requests=total)
+            return total
+
+    def warning(self):
+        """Returns a message once usage passes QUOTA_WARNING_RATIO of the quota, else None."""
+        used = self.used()
+        if used < self.quota * QUOTA_WARNING_RATIO:
+            return None
+        if used >= self.quota:
+            return f"Monthly OCR quota used up ({used}/{self.quota} requests)."
+        return f"OCR quota almost used up: {used}/{self.quota} requests this month."